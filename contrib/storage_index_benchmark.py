@@ -0,0 +1,168 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Measures the latency of the storage driver's hot lookups before and after the
+lookup indexes migration (039) is applied.
+
+Usage:
+    python contrib/storage_index_benchmark.py \
+        --connection sqlite:////tmp/designate-bench.sqlite --records 1000000
+"""
+import argparse
+import hashlib
+import logging
+import os
+import random
+import time
+import uuid
+
+import sqlalchemy
+from sqlalchemy.schema import MetaData, Table
+from migrate.versioning import api as versioning_api
+from migrate.versioning import repository
+
+
+logging.basicConfig(level=logging.INFO)
+LOG = logging.getLogger(__name__)
+
+REPOSITORY = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'designate', 'storage',
+    'impl_sqlalchemy', 'migrate_repo'))
+
+BEFORE_VERSION = 38
+AFTER_VERSION = 39
+
+
+def _uuid():
+    return '%.32x' % uuid.uuid4()
+
+
+def seed(engine, domain_count, records_per_domain, batch_size):
+    meta = MetaData(bind=engine)
+    domains = Table('domains', meta, autoload=True)
+    recordsets = Table('recordsets', meta, autoload=True)
+    records = Table('records', meta, autoload=True)
+
+    tenants = [_uuid() for _ in xrange(max(1, domain_count / 10))]
+    samples = []
+
+    for d in xrange(domain_count):
+        tenant_id = random.choice(tenants)
+        domain_id = _uuid()
+
+        engine.execute(domains.insert(), id=domain_id, version=1,
+                       tenant_id=tenant_id, name='d%d.example.com.' % d,
+                       email='admin@example.com', ttl=3600, serial=1,
+                       refresh=3600, retry=600, expire=86400, minimum=3600,
+                       deleted='0')
+
+        rs_rows = []
+        r_rows = []
+
+        for r in xrange(records_per_domain):
+            recordset_id = _uuid()
+            rs_rows.append({
+                'id': recordset_id, 'version': 1, 'tenant_id': tenant_id,
+                'domain_id': domain_id,
+                'name': 'h%d.d%d.example.com.' % (r, d), 'type': 'A'})
+
+            data = '10.%d.%d.%d' % (d % 256, (r / 256) % 256, r % 256)
+            r_rows.append({
+                'id': _uuid(), 'version': 1, 'tenant_id': tenant_id,
+                'domain_id': domain_id, 'recordset_id': recordset_id,
+                'data': data, 'managed': False,
+                'hash': hashlib.md5('%s:%s' % (recordset_id, data))
+                .hexdigest()})
+
+            if len(r_rows) >= batch_size:
+                engine.execute(recordsets.insert(), rs_rows)
+                engine.execute(records.insert(), r_rows)
+                rs_rows, r_rows = [], []
+
+        if r_rows:
+            engine.execute(recordsets.insert(), rs_rows)
+            engine.execute(records.insert(), r_rows)
+
+        samples.append((tenant_id, domain_id, recordset_id))
+
+    return samples
+
+
+def run_queries(engine, samples, iterations):
+    queries = {
+        'records by domain_id+recordset_id': (
+            'SELECT * FROM records WHERE domain_id = :domain_id AND '
+            'recordset_id = :recordset_id'),
+        'records by tenant_id': (
+            'SELECT count(*) FROM records WHERE tenant_id = :tenant_id'),
+        'domains by tenant_id': (
+            "SELECT * FROM domains WHERE tenant_id = :tenant_id AND "
+            "deleted = '0'"),
+        'domains by parent_domain_id': (
+            "SELECT * FROM domains WHERE parent_domain_id = :domain_id AND "
+            "deleted = '0'"),
+    }
+
+    results = {}
+
+    for name, sql in queries.items():
+        query = sqlalchemy.text(sql)
+        start = time.time()
+
+        for _ in xrange(iterations):
+            tenant_id, domain_id, recordset_id = random.choice(samples)
+            engine.execute(query, tenant_id=tenant_id, domain_id=domain_id,
+                           recordset_id=recordset_id).fetchall()
+
+        results[name] = (time.time() - start) / iterations * 1000
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--connection',
+                        default='sqlite:////tmp/designate-bench.sqlite')
+    parser.add_argument('--records', type=int, default=1000000)
+    parser.add_argument('--records-per-domain', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    engine = sqlalchemy.create_engine(args.connection)
+    repo = repository.Repository(REPOSITORY)
+
+    versioning_api.version_control(engine, repository=repo)
+    versioning_api.upgrade(engine, repository=repo, version=BEFORE_VERSION)
+
+    domain_count = args.records / args.records_per_domain
+    LOG.info('Seeding %d domains with %d records each', domain_count,
+             args.records_per_domain)
+    samples = seed(engine, domain_count, args.records_per_domain,
+                   args.batch_size)
+
+    before = run_queries(engine, samples, args.iterations)
+
+    LOG.info('Applying migration %d', AFTER_VERSION)
+    versioning_api.upgrade(engine, repository=repo, version=AFTER_VERSION)
+
+    after = run_queries(engine, samples, args.iterations)
+
+    print('%-40s %12s %12s' % ('query', 'before (ms)', 'after (ms)'))
+    for name in sorted(before):
+        print('%-40s %12.3f %12.3f' % (name, before[name], after[name]))
+
+
+if __name__ == '__main__':
+    main()
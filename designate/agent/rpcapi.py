@@ -27,6 +27,8 @@ class AgentAPI(rpc_proxy.RpcProxy):
     API version history:
 
         1.0 - Initial version
+        1.1 - Add create_records
+        1.2 - Add create_recordsets
     """
     def __init__(self, topic=None):
         topic = topic if topic else cfg.CONF.agent_topic
@@ -81,6 +83,13 @@ class AgentAPI(rpc_proxy.RpcProxy):
         return self.call(context, msg)
 
     # Record Methods
+    def create_recordsets(self, context, domain, recordsets):
+        msg = self.make_msg('create_recordsets',
+                            domain=domain,
+                            recordsets=recordsets)
+
+        return self.call(context, msg, version='1.2')
+
     def update_recordset(self, context, domain, recordset):
         msg = self.make_msg('update_recordset',
                             domain=domain,
@@ -103,6 +112,14 @@ class AgentAPI(rpc_proxy.RpcProxy):
 
         return self.call(context, msg)
 
+    def create_records(self, context, domain, recordset, records):
+        msg = self.make_msg('create_records',
+                            domain=domain,
+                            recordset=recordset,
+                            records=records)
+
+        return self.call(context, msg, version='1.1')
+
     def update_record(self, context, domain, recordset, record):
         msg = self.make_msg('update_record',
                             domain=domain,
@@ -35,4 +35,7 @@ cfg.CONF.register_opts([
                     'keystone'),
     cfg.BoolOpt('enable-api-v1', default=True),
     cfg.BoolOpt('enable-api-v2', default=False),
+    cfg.IntOpt('zonefile-export-page-size', default=1000,
+               help='Number of records fetched from central at a time when '
+                    'exporting a zonefile'),
 ], group='service:api')
@@ -25,10 +25,24 @@ blueprint = flask.Blueprint('sync', __name__)
 @blueprint.route('/domains/sync', methods=['POST'])
 def sync_domains():
     context = flask.request.environ.get('context')
+    values = flask.request.json or {}
 
-    central_api.sync_domains(context)
+    # Passing the marker from a failed sync resumes it
+    status = central_api.sync_domains(context, values.get('marker'))
 
-    return flask.Response(status=200)
+    response = flask.jsonify(status)
+    response.status_code = 202
+
+    return response
+
+
+@blueprint.route('/domains/sync', methods=['GET'])
+def get_domain_sync_status():
+    context = flask.request.environ.get('context')
+
+    status = central_api.get_domain_sync_status(context)
+
+    return flask.jsonify(status)
 
 
 @blueprint.route('/domains/<uuid:domain_id>/sync', methods=['POST'])
@@ -0,0 +1,57 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import pecan
+from designate import utils
+from designate.api.v2.controllers import rest
+from designate.api.v2.views import zone_imports as zone_imports_view
+from designate.central import rpcapi as central_rpcapi
+from designate.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+central_api = central_rpcapi.CentralAPI()
+
+
+class ZoneImportsController(rest.RestController):
+    _view = zone_imports_view.ZoneImportsView()
+    SORT_KEYS = ['created_at', 'id', 'updated_at', 'status']
+
+    @pecan.expose(template='json:', content_type='application/json')
+    @utils.validate_uuid('zone_import_id')
+    def get_one(self, zone_import_id):
+        """ Get Zone Import """
+        request = pecan.request
+        context = request.environ['context']
+
+        zone_import = central_api.get_zone_import(context, zone_import_id)
+
+        return self._view.show(context, request, zone_import)
+
+    @pecan.expose(template='json:', content_type='application/json')
+    def get_all(self, **params):
+        """ List Zone Imports """
+        request = pecan.request
+        context = request.environ['context']
+
+        # Extract the pagination params
+        marker, limit, sort_key, sort_dir = self._get_paging_params(params)
+
+        # Extract any filter params.
+        accepted_filters = ('status', )
+        criterion = dict((k, params[k]) for k in accepted_filters
+                         if k in params)
+
+        zone_imports = central_api.find_zone_imports(
+            context, criterion, marker, limit, sort_key, sort_dir)
+
+        return self._view.list(context, request, zone_imports)
@@ -14,15 +14,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import pecan
-from dns import zone as dnszone
-from dns import rdatatype
-from dns import exception as dnsexception
+from oslo.config import cfg
 from designate import exceptions
 from designate import utils
 from designate import schema
 from designate.api.v2.controllers import rest
 from designate.api.v2.controllers import nameservers
 from designate.api.v2.controllers import recordsets
+from designate.api.v2.controllers import tasks
+from designate.api.v2.views import zone_imports as zone_imports_view
 from designate.api.v2.views import zones as zones_view
 from designate.central import rpcapi as central_rpcapi
 from designate.openstack.common import log as logging
@@ -33,6 +33,7 @@ central_api = central_rpcapi.CentralAPI()
 
 class ZonesController(rest.RestController):
     _view = zones_view.ZonesView()
+    _import_view = zone_imports_view.ZoneImportsView()
     _resource_schema = schema.Schema('v2', 'zone')
     _collection_schema = schema.Schema('v2', 'zones')
     SORT_KEYS = ['created_at', 'id', 'updated_at', 'name', 'tenant_id',
@@ -40,6 +41,7 @@ class ZonesController(rest.RestController):
 
     nameservers = nameservers.NameServersController()
     recordsets = recordsets.RecordSetsController()
+    tasks = tasks.TasksController()
 
     @pecan.expose(template=None, content_type='text/dns')
     @pecan.expose(template='json:', content_type='application/json')
@@ -73,32 +75,40 @@ class ZonesController(rest.RestController):
         servers = central_api.get_domain_servers(context, zone_id)
         domain = central_api.get_domain(context, zone_id)
 
-        criterion = {'domain_id': zone_id}
-        recordsets = central_api.find_recordsets(context, criterion)
+        # NOTE: Stream the zonefile as it's rendered, fetching the records a
+        #       page at a time, so memory use doesn't grow with the zone. The
+        #       first page is fetched before the response is started, so it
+        #       failing is still answered with an error. Later pages failing
+        #       can only cut the response short once output has been sent.
+        limit = cfg.CONF['service:api'].zonefile_export_page_size
+        records = central_api.get_domain_contents(context, zone_id, None,
+                                                  limit)
 
-        records = []
-
-        for recordset in recordsets:
-            criterion = {
-                'domain_id': domain['id'],
-                'recordset_id': recordset['id']
-            }
-
-            raw_records = central_api.find_records(context, criterion)
+        response = pecan.response
+        response.app_iter = utils.render_template_chunks(
+            'bind9-zone.jinja2', servers=servers, domain=domain,
+            records=self._iter_domain_contents(context, zone_id, records,
+                                               limit))
 
-            for record in raw_records:
-                records.append({
-                    'name': recordset['name'],
-                    'type': recordset['type'],
-                    'ttl': recordset['ttl'],
-                    'priority': record['priority'],
-                    'data': record['data'],
-                })
+        return response
 
-        return utils.render_template('bind9-zone.jinja2',
-                                     servers=servers,
-                                     domain=domain,
-                                     records=records)
+    def _iter_domain_contents(self, context, zone_id, records, limit):
+        try:
+            while True:
+                for record in records:
+                    yield record
+
+                if len(records) < limit:
+                    break
+
+                records = central_api.get_domain_contents(
+                    context, zone_id, records[-1]['id'], limit)
+        except Exception:
+            # The response was started already, all that's left is to cut
+            # it short
+            LOG.exception('Failed to export the zonefile of zone %s, the '
+                          'response was cut short' % zone_id)
+            raise
 
     @pecan.expose(template='json:', content_type='application/json')
     def get_all(self, **params):
@@ -161,24 +171,15 @@ class ZonesController(rest.RestController):
 
     def _post_zonefile(self, request, response, context):
         """ Import Zone """
-        dnspython_zone = self._parse_zonefile(request)
-        # TODO(artom) This should probably be handled with transactions
-        zone = self._create_zone(context, dnspython_zone)
+        # NOTE: The zonefile is parsed and imported by central, in the
+        #       background. Return the zone import to follow its progress.
+        zone_import = central_api.create_zone_import(context, request.body)
 
-        try:
-            self._create_records(context, zone['id'], dnspython_zone)
-        except exceptions.Base as e:
-            central_api.delete_domain(context, zone['id'])
-            raise e
-
-        if zone['status'] == 'PENDING':
-            response.status_int = 202
-        else:
-            response.status_int = 201
+        response.status_int = 202
+        response.headers['Location'] = self._import_view._get_resource_href(
+            request, zone_import)
 
-        response.headers['Location'] = self._view._get_resource_href(request,
-                                                                     zone)
-        return self._view.show(context, request, zone)
+        return self._import_view.show(context, request, zone_import)
 
     @pecan.expose(template='json:', content_type='application/json')
     @pecan.expose(template='json:', content_type='application/json-patch+json')
@@ -248,90 +249,3 @@ class ZonesController(rest.RestController):
 
         # NOTE: This is a hack and a half.. But Pecan needs it.
         return ''
-
-    #TODO(artom) Methods below may be useful elsewhere, consider putting them
-    # somewhere reusable.
-
-    def _create_zone(self, context, dnspython_zone):
-        """ Creates the initial zone """
-        # dnspython never builds a zone with more than one SOA, even if we give
-        # it a zonefile that contains more than one
-        soa = dnspython_zone.get_rdataset(dnspython_zone.origin, 'SOA')
-        if soa is None:
-            raise exceptions.BadRequest('An SOA record is required')
-        email = soa[0].rname.to_text().rstrip('.')
-        email = email.replace('.', '@', 1)
-        values = {
-            'name': dnspython_zone.origin.to_text(),
-            'email': email,
-            'ttl': str(soa.ttl)
-        }
-        return central_api.create_domain(context, values)
-
-    def _record2json(self, record_type, rdata):
-        if record_type == 'MX':
-            return {
-                'data': rdata.exchange.to_text(),
-                'priority': str(rdata.preference)
-            }
-        elif record_type == 'SRV':
-            return {
-                'data': '%s %s %s' % (str(rdata.weight), str(rdata.port),
-                                      rdata.target.to_text()),
-                'priority': str(rdata.priority)
-            }
-        else:
-            return {
-                'data': rdata.to_text()
-            }
-
-    def _create_records(self, context, zone_id, dnspython_zone):
-        """ Creates the records """
-        for record_name in dnspython_zone.nodes.keys():
-            for rdataset in dnspython_zone.nodes[record_name]:
-                record_type = rdatatype.to_text(rdataset.rdtype)
-
-                if record_type == 'SOA':
-                    continue
-
-                # Create the recordset
-                values = {
-                    'domain_id': zone_id,
-                    'name': record_name.to_text(),
-                    'type': record_type,
-                }
-
-                recordset = central_api.create_recordset(
-                    context, zone_id, values)
-
-                for rdata in rdataset:
-                    if (record_type == 'NS'
-                            and record_name == dnspython_zone.origin):
-                        # Don't create NS records for the domain, they've been
-                        # taken care of as servers
-                        pass
-                    else:
-                        # Everything else, including delegation NS, gets
-                        # created
-                        values = self._record2json(record_type, rdata)
-
-                        central_api.create_record(
-                            context, zone_id, recordset['id'], values)
-
-    def _parse_zonefile(self, request):
-        """ Parses a POSTed zonefile into a dnspython zone object """
-        try:
-            dnspython_zone = dnszone.from_text(
-                request.body,
-                # Don't relativize, otherwise we end up with '@' record names.
-                relativize=False,
-                # Dont check origin, we allow missing NS records (missing SOA
-                # records are taken care of in _create_zone).
-                check_origin=False)
-        except dnszone.UnknownOrigin:
-            raise exceptions.BadRequest('The $ORIGIN statement is required and'
-                                        ' must be the first statement in the'
-                                        ' zonefile.')
-        except dnsexception.SyntaxError:
-            raise exceptions.BadRequest('Malformed zonefile.')
-        return dnspython_zone
@@ -16,6 +16,7 @@
 import urllib
 from oslo.config import cfg
 from designate import exceptions
+from designate import utils
 from designate.openstack.common import log as logging
 
 
@@ -158,9 +159,22 @@ class BaseView(object):
         return href.rstrip('?')
 
     def _get_next_href(self, request, items, parents=None):
-        # Prepare the extra params
+        params = request.GET
+        sort_key = params.get('sort_key', 'created_at')
+        sort_dir = params.get('sort_dir', 'asc')
+
+        last = items[-1]
+
+        # Prepare the extra params, using a keyset pagination cursor where
+        # the last item carries the sort key, and its ID otherwise.
+        if sort_key in last:
+            marker = utils.encode_cursor(sort_key, sort_dir,
+                                         [last[sort_key], last['id']])
+        else:
+            marker = last['id']
+
         extra_params = {
-            'marker': items[-1]['id']
+            'marker': marker
         }
 
         return self._get_collection_href(request, parents, extra_params)
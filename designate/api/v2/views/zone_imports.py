@@ -0,0 +1,44 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from designate.api.v2.views import base as base_view
+from designate.openstack.common import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ZoneImportsView(base_view.BaseView):
+    """ Model a Zone Import API response as a python dictionary """
+
+    _resource_name = 'zone_import'
+    _collection_name = 'zone_imports'
+
+    def _get_base_href(self, parents=None):
+        href = "%s/v2/zones/tasks/imports" % self.base_uri
+
+        return href.rstrip('?')
+
+    def show_basic(self, context, request, zone_import):
+        """ Basic view of a zone import """
+        return {
+            "id": zone_import['id'],
+            "status": zone_import['status'],
+            "message": zone_import['message'],
+            "zone_id": zone_import['domain_id'],
+            "records_total": zone_import['records_total'],
+            "records_imported": zone_import['records_imported'],
+            "created_at": zone_import['created_at'],
+            "updated_at": zone_import['updated_at'],
+            "links": self._get_resource_links(request, zone_import)
+        }
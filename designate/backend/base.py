@@ -28,6 +28,16 @@ class Backend(DriverPlugin):
     __plugin_type__ = 'backend'
     __plugin_ns__ = 'designate.backend'
 
+    # NOTE: The agent service exposes its backend directly as the RPC
+    #       manager, so this is the version of the agent RPC API. Keep it
+    #       in step with the version history in designate.agent.rpcapi.
+    RPC_API_VERSION = '1.2'
+
+    # Whether sync_domain may run for several domains at once, and be cut
+    # short by a timeout, without breaking state shared between the calls,
+    # such as a database session.
+    concurrent_syncs = False
+
     def __init__(self, central_service):
         super(Backend, self).__init__()
         self.central_service = central_service
@@ -70,6 +80,16 @@ class Backend(DriverPlugin):
     def create_recordset(self, context, domain, recordset):
         """ Create a DNS recordset """
 
+    def create_recordsets(self, context, domain, recordsets):
+        """
+        Create many DNS recordsets in a domain at once.
+
+        This is the default, naive, implementation. Backends able to write
+        several recordsets at once should override it.
+        """
+        for recordset in recordsets:
+            self.create_recordset(context, domain, recordset)
+
     @abc.abstractmethod
     def update_recordset(self, context, domain, recordset):
         """ Update a DNS recordset """
@@ -82,6 +102,16 @@ class Backend(DriverPlugin):
     def create_record(self, context, domain, recordset, record):
         """ Create a DNS record """
 
+    def create_records(self, context, domain, recordset, records):
+        """
+        Create many DNS records in a recordset at once.
+
+        This is the default, naive, implementation. Backends able to write
+        several records at once should override it.
+        """
+        for record in records:
+            self.create_record(context, domain, recordset, record)
+
     @abc.abstractmethod
     def update_record(self, context, domain, recordset, record):
         """ Update a DNS record """
@@ -13,16 +13,31 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import hashlib
+import json
 import os
+import eventlet
+from eventlet import greenpool
 from oslo.config import cfg
 from designate.openstack.common import log as logging
+from designate.openstack.common import loopingcall
+from designate import exceptions
 from designate import utils
 from designate.backend import base
+from designate.backend import rndc
+from designate.central import rpcapi as central_rpcapi
 import glob
 import shutil
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: The flush timer and the background rewrite for server changes run
+#       alongside central's RPC handlers when central loads this backend.
+#       They read through central's RPC API rather than calling central
+#       directly, so they don't share its storage session with those
+#       handlers.
+central_api = central_rpcapi.CentralAPI()
+
 cfg.CONF.register_group(cfg.OptGroup(
     name='backend:bind9', title="Configuration for BIND9 Backend"
 ))
@@ -33,37 +48,126 @@ cfg.CONF.register_opts([
     cfg.StrOpt('rndc-config-file', default=None,
                help='RNDC Config File'),
     cfg.StrOpt('rndc-key-file', default=None, help='RNDC Key File'),
+    cfg.BoolOpt('rndc-native-client', default=True,
+                help='Talk to the rndc control channel directly, rather than '
+                     'running the rndc binary for every command. Requires '
+                     'rndc-key-file'),
+    cfg.IntOpt('rndc-timeout', default=30,
+               help='Timeout in seconds for native rndc commands'),
+    cfg.IntOpt('rndc-max-connections', default=4,
+               help='Maximum number of open native rndc connections'),
     cfg.StrOpt('nzf-path', default='/var/cache/bind',
                help='Path where Bind9 stores the nzf files'),
+    cfg.BoolOpt('startup-global-reload', default=False,
+                help='Issue a single global rndc reload at startup instead '
+                     'of reloading each zone. Only suitable when the zone '
+                     'files on disk are known to be current'),
+    cfg.IntOpt('startup-reload-concurrency', default=16,
+               help='Number of zones reloaded in parallel at startup'),
+    cfg.IntOpt('server-sync-batch-size', default=500,
+               help='Number of zones updated per batch, and checkpointed '
+                    'after, when the list of servers changes'),
+    cfg.FloatOpt('zone-flush-interval', default=1.0,
+                 help='Seconds to collect changes to a zone before '
+                      'rewriting its zone file and reloading it. Set to 0 '
+                      'to rewrite the zone on every change'),
+    cfg.IntOpt('zone-flush-max-retries', default=10,
+               help='Number of consecutive flushes a zone which failed to '
+                    'be written out is retried on before giving up on it'),
 ], group='backend:bind9')
 
 
 class Bind9Backend(base.Backend):
     __plugin_name__ = 'bind9'
 
+    def __init__(self, central_service):
+        super(Bind9Backend, self).__init__(central_service)
+
+        # Domains with changes not yet written out, keyed by domain id. Only
+        # the most recent copy of each domain is kept, so any number of
+        # changes to a zone between two flushes result in a single render
+        # and a single rndc reload.
+        self._dirty_domains = {}
+        self._flush_timer = None
+        # Number of consecutive failed flushes of each domain
+        self._flush_failures = {}
+
+        # Hash of the last zone files written for each domain, keyed by
+        # (domain id, 'header' or 'records'), used to skip rewriting and
+        # reloading unchanged zones.
+        self._zone_hashes = {}
+        self._templates = {}
+
+        # The background rewrite of the zone headers for server changes, and
+        # whether the servers changed again since it started
+        self._server_change_thread = None
+        self._server_change_pending = False
+
+        self._rndc_client = None
+
+        if (cfg.CONF[self.name].rndc_native_client and
+                cfg.CONF[self.name].rndc_key_file):
+            try:
+                self._rndc_client = rndc.RNDCClient(
+                    cfg.CONF[self.name].rndc_host,
+                    cfg.CONF[self.name].rndc_port,
+                    cfg.CONF[self.name].rndc_key_file,
+                    timeout=cfg.CONF[self.name].rndc_timeout,
+                    max_connections=cfg.CONF[self.name].rndc_max_connections)
+            except (IOError, exceptions.ConfigurationError) as e:
+                LOG.warn('Unable to load rndc key file, falling back to the '
+                         'rndc binary: %s' % e)
+
     def start(self):
         super(Bind9Backend, self).start()
 
-        domains = self.central_service.find_domains(self.admin_context)
+        if cfg.CONF[self.name].startup_global_reload:
+            LOG.info('Reloading all zones')
+            self._rndc('reload')
+        else:
+            self._reload_domains()
+
+        interval = cfg.CONF[self.name].zone_flush_interval
+
+        if interval > 0:
+            self._flush_timer = loopingcall.FixedIntervalLoopingCall(
+                self._flush_dirty_domains)
+            self._flush_timer.start(interval=interval, initial_delay=interval)
+
+        if self._load_checkpoint() is not None:
+            # A server change was interrupted, finish it off
+            self._server_changed()
+
+    def stop(self):
+        if self._server_change_thread is not None:
+            # Its checkpoint lets the next start finish it off
+            self._server_change_thread.kill()
 
-        for domain in domains:
-            rndc_op = 'reload'
-            rndc_call = self._rndc_base() + [rndc_op]
-            rndc_call.extend([domain['name']])
-            LOG.debug('Calling RNDC with: %s' % " ".join(rndc_call))
-            utils.execute(*rndc_call)
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+            self._flush_timer = None
+
+        # Write out anything still pending before going away. Central no
+        # longer handles RPC calls by now when it runs the backend, so this
+        # last flush reads from it directly.
+        self._flush_dirty_domains(self.central_service)
+
+        if self._rndc_client is not None:
+            self._rndc_client.close()
+
+        super(Bind9Backend, self).stop()
 
     def create_server(self, context, server):
         LOG.debug('Create Server')
-        self._sync_domains_on_server_change()
+        self._server_changed()
 
     def update_server(self, context, server):
         LOG.debug('Update Server')
-        self._sync_domains_on_server_change()
+        self._server_changed()
 
     def delete_server(self, context, server):
         LOG.debug('Delete Server')
-        self._sync_domains_on_server_change()
+        self._server_changed()
 
     def create_domain(self, context, domain):
         LOG.debug('Create Domain')
@@ -71,31 +175,108 @@ class Bind9Backend(base.Backend):
 
     def update_domain(self, context, domain):
         LOG.debug('Update Domain')
-        self._sync_domain(domain)
+        self._mark_domain_dirty(domain)
 
     def delete_domain(self, context, domain):
         LOG.debug('Delete Domain')
+        self._dirty_domains.pop(domain['id'], None)
+        self._flush_failures.pop(domain['id'], None)
         self._sync_delete_domain(domain)
 
+    def sync_domain(self, context, domain, records):
+        LOG.debug('Sync Domain')
+        self._dirty_domains.pop(domain['id'], None)
+        self._sync_domain(domain, force=True)
+
     def update_recordset(self, context, domain, recordset):
         LOG.debug('Update RecordSet')
-        self._sync_domain(domain)
+        self._mark_domain_dirty(domain)
 
     def delete_recordset(self, context, domain, recordset):
         LOG.debug('Delete RecordSet')
-        self._sync_domain(domain)
+        self._mark_domain_dirty(domain)
 
     def create_record(self, context, domain, recordset, record):
         LOG.debug('Create Record')
-        self._sync_domain(domain)
+        self._mark_domain_dirty(domain)
 
     def update_record(self, context, domain, recordset, record):
         LOG.debug('Update Record')
-        self._sync_domain(domain)
+        self._mark_domain_dirty(domain)
 
     def delete_record(self, context, domain, recordset, record):
         LOG.debug('Delete Record')
-        self._sync_domain(domain)
+        self._mark_domain_dirty(domain)
+
+    def _reload_domains(self):
+        """ Reload every zone, a bounded number of them at a time """
+        domains = self.central_service.find_domains(self.admin_context)
+        total = len(domains)
+
+        LOG.info('Reloading %d zones' % total)
+
+        def reload_domain(domain):
+            try:
+                self._rndc('reload', domain['name'])
+                return True
+            except Exception:
+                LOG.exception('Failed to reload zone %s' % domain['name'])
+                return False
+
+        pool = greenpool.GreenPool(
+            cfg.CONF[self.name].startup_reload_concurrency)
+        progress_step = max(1, total / 10)
+        failed = 0
+
+        for done, result in enumerate(pool.imap(reload_domain, domains), 1):
+            if not result:
+                failed += 1
+
+            if done % progress_step == 0 or done == total:
+                LOG.info('Reloaded %d of %d zones' % (done, total))
+
+        if failed:
+            LOG.warn('%d of %d zones failed to reload' % (failed, total))
+
+    def _mark_domain_dirty(self, domain):
+        """ Queue a domain's zone file to be rewritten on the next flush """
+        if self._flush_timer is None:
+            # Not running in the background, write the zone out right away
+            self._sync_domain(domain)
+        else:
+            self._dirty_domains[domain['id']] = domain
+
+    def _flush_dirty_domains(self, central=None):
+        """ Rewrite and reload every domain changed since the last flush """
+        central = central or central_api
+        dirty_domains, self._dirty_domains = self._dirty_domains, {}
+
+        for domain_id, domain in dirty_domains.items():
+            try:
+                self._sync_domain(domain, central=central)
+            except exceptions.DomainNotFound:
+                # Deleted since it was queued, there's nothing left to write
+                LOG.debug('Domain %s no longer exists, not synchronising it'
+                          % domain_id)
+                self._flush_failures.pop(domain_id, None)
+            except Exception:
+                failures = self._flush_failures.get(domain_id, 0) + 1
+
+                if failures > cfg.CONF[self.name].zone_flush_max_retries:
+                    LOG.exception('Failed to synchronise domain %s, giving '
+                                  'up after %d attempts' %
+                                  (domain_id, failures))
+                    self._flush_failures.pop(domain_id, None)
+                    continue
+
+                LOG.exception('Failed to synchronise domain %s, it will be '
+                              'retried on the next flush' % domain_id)
+                self._flush_failures[domain_id] = failures
+
+                # A newer change may have been queued meanwhile, keep it
+                self._dirty_domains.setdefault(domain_id, domain)
+            else:
+                self._flush_failures.pop(domain_id, None)
 
     def _rndc_base(self):
         rndc_call = [
@@ -112,23 +293,43 @@ class Bind9Backend(base.Backend):
 
         return rndc_call
 
-    def _sync_delete_domain(self, domain, new_domain_flag=False):
-        """ Remove domain zone files and reload bind config """
-        LOG.debug('Delete Domain: %s' % domain['id'])
+    def _rndc(self, *args):
+        """ Run an rndc command, e.g. self._rndc('reload', 'example.com.') """
+        if self._rndc_client is not None:
+            return self._rndc_client.call(*args)
 
+        rndc_call = self._rndc_base() + list(args)
+        LOG.debug('Calling RNDC with: %s' % " ".join(rndc_call))
+        utils.execute(*rndc_call)
+
+    def _zone_paths(self, domain):
+        """
+        Paths of a domain's zone file, holding the SOA and NS records, and of
+        the records file it includes.
+        """
         output_folder = os.path.join(os.path.abspath(cfg.CONF.state_path),
                                      'bind9')
 
-        output_path = os.path.join(output_folder, '%s.zone' %
-                                   "_".join([domain['name'], domain['id']]))
+        base_name = "_".join([domain['name'], domain['id']])
+
+        return (os.path.join(output_folder, '%s.zone' % base_name),
+                os.path.join(output_folder, '%s.records' % base_name))
+
+    def _sync_delete_domain(self, domain, new_domain_flag=False):
+        """ Remove domain zone files and reload bind config """
+        LOG.debug('Delete Domain: %s' % domain['id'])
+
+        output_path, records_path = self._zone_paths(domain)
 
         os.remove(output_path)
 
-        rndc_op = 'delzone'
+        if os.path.exists(records_path):
+            os.remove(records_path)
 
-        rndc_call = self._rndc_base() + [rndc_op, domain['name']]
+        self._zone_hashes.pop((domain['id'], 'header'), None)
+        self._zone_hashes.pop((domain['id'], 'records'), None)
 
-        utils.execute(*rndc_call)
+        self._rndc('delzone', domain['name'])
 
         #This goes and gets the name of the .nzf file that is a mirror of the
         #zones.config file we wish to maintain. The file name can change as it
@@ -136,80 +337,190 @@ class Bind9Backend(base.Backend):
         #name this returns because there is only one .nzf file
         nzf_name = glob.glob('%s/*.nzf' % cfg.CONF[self.name].nzf_path)
 
-        output_file = os.path.join(output_folder, 'zones.config')
+        output_file = os.path.join(os.path.dirname(output_path),
+                                   'zones.config')
 
         shutil.copyfile(nzf_name[0], output_file)
 
-    def _sync_domain(self, domain, new_domain_flag=False):
-        """ Sync a single domain's zone file and reload bind config """
-        LOG.debug('Synchronising Domain: %s' % domain['id'])
+    def _hash_zone(self, content):
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
 
-        servers = self.central_service.find_servers(self.admin_context)
+    def _write_zone_file(self, domain_id, part, output_path, template_name,
+                         force=False, **template_context):
+        """
+        Render and write one part ('header' or 'records') of a zone.
 
-        recordsets = self.central_service.find_recordsets(
-            self.admin_context, {'domain_id': domain['id']})
+        :returns: The hash of the new content, or None if it matched what
+                  was last written and nothing was done.
+        """
+        if template_name not in self._templates:
+            self._templates[template_name] = utils.load_template(
+                template_name)
 
-        records = []
+        content = utils.render_template(self._templates[template_name],
+                                        **template_context)
+        content_hash = self._hash_zone(content)
 
-        for recordset in recordsets:
-            criterion = {
-                'domain_id': domain['id'],
-                'recordset_id': recordset['id']
-            }
+        if (not force and
+                self._zone_hashes.get((domain_id, part)) == content_hash):
+            return None
 
-            raw_records = self.central_service.find_records(
-                self.admin_context, criterion)
+        utils.write_file_atomically(output_path, content)
 
-            for record in raw_records:
-                records.append({
-                    'name': recordset['name'],
-                    'type': recordset['type'],
-                    'ttl': recordset['ttl'],
-                    'priority': record['priority'],
-                    'data': record['data'],
-                })
+        return content_hash
 
-        output_folder = os.path.join(os.path.abspath(cfg.CONF.state_path),
-                                     'bind9')
+    def _sync_domain(self, domain, new_domain_flag=False, force=False,
+                     central=None):
+        """ Sync a single domain's zone file and reload bind config """
+        LOG.debug('Synchronising Domain: %s' % domain['id'])
+
+        central = central or self.central_service
+
+        servers = central.find_servers(self.admin_context)
+
+        records = central.get_domain_contents(self.admin_context,
+                                              domain['id'])
 
-        output_path = os.path.join(output_folder, '%s.zone' %
-                                   "_".join([domain['name'], domain['id']]))
+        output_path, records_path = self._zone_paths(domain)
+        force = force or new_domain_flag
 
-        utils.render_template_to_file('bind9-zone.jinja2',
-                                      output_path,
-                                      servers=servers,
-                                      domain=domain,
-                                      records=records)
+        # The records go first, so the zone file never includes a records
+        # file which doesn't exist yet.
+        records_hash = self._write_zone_file(
+            domain['id'], 'records', records_path, 'bind9-zone-records.jinja2',
+            force=force, domain=domain, records=records)
 
-        rndc_call = self._rndc_base()
+        # NOTE: The header carries the serial, so it is rewritten whenever
+        #       the serial moves, even if none of the records did.
+        header_hash = self._write_zone_file(
+            domain['id'], 'header', output_path, 'bind9-zone-header.jinja2',
+            force=force, servers=servers, domain=domain,
+            records_path=records_path)
+
+        if records_hash is None and header_hash is None:
+            LOG.debug('Domain %s is unchanged, not rewriting its zone file' %
+                      domain['id'])
+            return
 
         if new_domain_flag:
-            rndc_op = [
-                'addzone',
-                '%s { type master; file "%s"; };' % (domain['name'],
-                                                     output_path),
-            ]
-            rndc_call.extend(rndc_op)
+            self._rndc('addzone',
+                       '%s { type master; file "%s"; };' % (domain['name'],
+                                                            output_path))
         else:
-            rndc_op = 'reload'
-            rndc_call.extend([rndc_op])
-            rndc_call.extend([domain['name']])
-
-        LOG.debug('Calling RNDC with: %s' % " ".join(rndc_call))
-        utils.execute(*rndc_call)
+            self._rndc('reload', domain['name'])
 
         nzf_name = glob.glob('%s/*.nzf' % cfg.CONF[self.name].nzf_path)
 
-        output_file = os.path.join(output_folder, 'zones.config')
+        output_file = os.path.join(os.path.dirname(output_path),
+                                   'zones.config')
 
         shutil.copyfile(nzf_name[0], output_file)
 
-    def _sync_domains_on_server_change(self):
-        # TODO(eankutse): Improve this so it scales. Need to design
-        # for it in the new Pool Manager/Agent for the backend that is
-        # being proposed
+        if records_hash is not None:
+            self._zone_hashes[(domain['id'], 'records')] = records_hash
+
+        if header_hash is not None:
+            self._zone_hashes[(domain['id'], 'header')] = header_hash
+
+    def _sync_domain_header(self, domain, servers, central):
+        """ Rewrite only the SOA and NS records of a domain's zone """
+        output_path, records_path = self._zone_paths(domain)
+
+        if not os.path.exists(records_path):
+            # Zone written before its records were split out into their own
+            # file, it needs writing out in full once.
+            self._sync_domain(domain, force=True, central=central)
+            return
+
+        header_hash = self._write_zone_file(
+            domain['id'], 'header', output_path, 'bind9-zone-header.jinja2',
+            servers=servers, domain=domain, records_path=records_path)
+
+        if header_hash is not None:
+            self._rndc('reload', domain['name'])
+            self._zone_hashes[(domain['id'], 'header')] = header_hash
+
+    def _checkpoint_path(self):
+        return os.path.join(os.path.abspath(cfg.CONF.state_path), 'bind9',
+                            'server-sync.checkpoint')
+
+    def _load_checkpoint(self):
+        try:
+            with open(self._checkpoint_path()) as fh:
+                return json.load(fh)
+        except (IOError, ValueError):
+            return None
+
+    def _save_checkpoint(self, server_names, marker):
+        utils.write_file_atomically(
+            self._checkpoint_path(),
+            json.dumps({'servers': server_names, 'marker': marker}))
+
+    def _server_changed(self):
+        """ Rewrite the SOA and NS records of every zone for new servers """
+        if self._flush_timer is None:
+            # Not running in the background, rewrite them right away
+            self._sync_domains_on_server_change(self.central_service)
+            return
+
+        # NOTE: The zones are rewritten in the background, so the server
+        #       change returns straight away. Changes made while a rewrite
+        #       is running start it over, with the new servers, once it's
+        #       done.
+        self._server_change_pending = True
+
+        if self._server_change_thread is None:
+            self._server_change_thread = eventlet.spawn(
+                self._run_server_changes)
+
+    def _run_server_changes(self):
+        try:
+            while self._server_change_pending:
+                self._server_change_pending = False
+
+                try:
+                    self._sync_domains_on_server_change(central_api)
+                except Exception:
+                    LOG.exception('Failed to synchronise domains on server '
+                                  'change, it resumes from its checkpoint '
+                                  'on the next server change or start')
+        finally:
+            self._server_change_thread = None
+
+    def _sync_domains_on_server_change(self, central):
+        """
+        Rewrite the SOA and NS records of every zone, a batch of domains at
+        a time. The last domain of each finished batch is checkpointed, so
+        an interrupted run picks up where it left off, either on the next
+        server change or when the backend is next started.
+        """
         LOG.debug('Synchronising domains on server change')
 
-        domains = self.central_service.find_domains(self.admin_context)
-        for domain in domains:
-            self._sync_domain(domain)
+        servers = central.find_servers(self.admin_context)
+        server_names = [s['name'] for s in servers]
+
+        checkpoint = self._load_checkpoint()
+        marker = None
+
+        if checkpoint is not None and checkpoint['servers'] == server_names:
+            marker = checkpoint['marker']
+            LOG.info('Resuming server change synchronisation after domain %s'
+                     % marker)
+
+        batch_size = cfg.CONF[self.name].server_sync_batch_size
+        self._save_checkpoint(server_names, marker)
+
+        while True:
+            domains = central.find_domains(
+                self.admin_context, marker=marker, limit=batch_size)
+
+            for domain in domains:
+                self._sync_domain_header(domain, servers, central)
+
+            if len(domains) < batch_size:
+                break
+
+            marker = domains[-1]['id']
+            self._save_checkpoint(server_names, marker)
+
+        os.remove(self._checkpoint_path())
@@ -22,6 +22,8 @@ LOG = logging.getLogger(__name__)
 class FakeBackend(base.Backend):
     __plugin_name__ = 'fake'
 
+    concurrent_syncs = True
+
     def __init__(self, *args, **kwargs):
         super(FakeBackend, self).__init__(*args, **kwargs)
 
@@ -116,9 +116,22 @@ class MultiBackend(base.Backend):
             with excutils.save_and_reraise_exception():
                 self.slave.create_domain(context, domain)
 
-                [self.slave.create_record(context, domain, record)
-                 for record in self.central.find_records(
-                     context, {'domain_id': full_domain['id']})]
+                # Page through the records, rather than loading all of them
+                page_size = cfg.CONF['service:central'].iter_chunk_size
+                marker = None
+
+                while True:
+                    records = self.central.find_records(
+                        context, {'domain_id': full_domain['id']},
+                        marker=marker, limit=page_size)
+
+                    for record in records:
+                        self.slave.create_record(context, domain, record)
+
+                    if len(records) < page_size:
+                        break
+
+                    marker = records[-1]['id']
 
     def create_server(self, context, server):
         self.master.create_server(context, server)
@@ -142,6 +155,9 @@ class MultiBackend(base.Backend):
     def create_recordset(self, context, domain, recordset):
         self.master.create_recordset(context, domain, recordset)
 
+    def create_recordsets(self, context, domain, recordsets):
+        self.master.create_recordsets(context, domain, recordsets)
+
     def update_recordset(self, context, domain, recordset):
         self.master.update_recordset(context, domain, recordset)
 
@@ -151,6 +167,9 @@ class MultiBackend(base.Backend):
     def create_record(self, context, domain, recordset, record):
         self.master.create_record(context, domain, recordset, record)
 
+    def create_records(self, context, domain, recordset, records):
+        self.master.create_records(context, domain, recordset, records)
+
     def update_record(self, context, domain, recordset, record):
         self.master.update_record(context, domain, recordset, record)
 
@@ -16,6 +16,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import base64
+import time
 from sqlalchemy import func
 from sqlalchemy.sql import select
 from sqlalchemy.sql.expression import and_
@@ -41,6 +42,12 @@ cfg.CONF.register_opts([
     cfg.StrOpt('domain-type', default='NATIVE', help='PowerDNS Domain Type'),
     cfg.ListOpt('also-notify', default=[], help='List of additional IPs to '
                                                 'send NOTIFYs to'),
+    cfg.IntOpt('servers-cache-ttl', default=300,
+               help='Seconds to cache the list of servers fetched from '
+                    'central. The cache is also cleared whenever this '
+                    'backend is told of a server change'),
+    cfg.IntOpt('domain-ids-cache-ttl', default=300,
+               help='Seconds to cache the PowerDNS id of a domain for'),
 ] + SQLOPTS, group='backend:powerdns')
 
 # Overide the default DB connection registered above, to avoid name conflicts
@@ -53,6 +60,19 @@ cfg.CONF.set_default('database_connection',
 class PowerDNSBackend(base.Backend):
     __plugin_name__ = 'powerdns'
 
+    def __init__(self, central_service):
+        super(PowerDNSBackend, self).__init__(central_service)
+
+        self._servers = None
+        self._servers_expiry = 0
+        self._servers_cache_hits = 0
+        self._servers_cache_misses = 0
+
+        # Maps designate domain ids to PowerDNS domain ids, along with when
+        # they expire. A domain deleted and created again, e.g. by another
+        # process, gets a new PowerDNS id, so they are not kept forever.
+        self._domain_ids = {}
+
     def start(self):
         super(PowerDNSBackend, self).start()
 
@@ -140,19 +160,22 @@ class PowerDNSBackend(base.Backend):
 
     def create_server(self, context, server):
         LOG.debug('Create Server')
+        self._invalidate_servers()
         self._update_domains_on_server_create(server)
 
     def update_server(self, context, server):
         LOG.debug('Update Server')
+        self._invalidate_servers()
         self._update_domains_on_server_update(server)
 
     def delete_server(self, context, server):
         LOG.debug('Delete Server')
+        self._invalidate_servers()
         self._update_domains_on_server_delete(server)
 
     # Domain Methods
     def create_domain(self, context, domain):
-        servers = self.central_service.find_servers(self.admin_context)
+        servers = self._get_servers()
 
         domain_m = models.Domain()
         domain_m.update({
@@ -163,6 +186,7 @@ class PowerDNSBackend(base.Backend):
             'account': context.tenant_id
         })
         domain_m.save(self.session)
+        self._cache_domain_id(domain['id'], domain_m.id)
 
         for server in servers:
             record_m = models.Record()
@@ -203,7 +227,7 @@ class PowerDNSBackend(base.Backend):
     def update_domain(self, context, domain):
         # TODO(kiall): Sync Server List
 
-        domain_m = self._get_domain(domain['id'])
+        domain_id = self._get_domain_id(domain['id'])
 
         try:
             self.session.begin()
@@ -213,7 +237,7 @@ class PowerDNSBackend(base.Backend):
 
             # Update the Records TTLs where necessary
             self.session.query(models.Record)\
-                        .filter_by(domain_id=domain_m.id, inherit_ttl=True)\
+                        .filter_by(domain_id=domain_id, inherit_ttl=True)\
                         .update({'ttl': domain['ttl']})
 
         except Exception:
@@ -232,6 +256,7 @@ class PowerDNSBackend(base.Backend):
                          'in the backend. ID: %s', domain['id'])
             return
 
+        self._domain_ids.pop(domain['id'], None)
         domain_m.delete(self.session)
 
         # Ensure the records are deleted
@@ -261,28 +286,43 @@ class PowerDNSBackend(base.Backend):
 
     # Record Methods
     def create_record(self, context, domain, recordset, record):
-        domain_m = self._get_domain(domain['id'])
-        record_m = models.Record()
+        self.create_records(context, domain, recordset, [record])
+
+    def create_records(self, context, domain, recordset, records):
+        """
+        Create many records in one transaction, with a single multi-row
+        INSERT and a single SOA update.
+        """
+        domain_id = self._get_domain_id(domain['id'])
 
-        content = self._sanitize_content(recordset['type'], record['data'])
         ttl = domain['ttl'] if recordset['ttl'] is None else recordset['ttl']
 
-        record_m.update({
+        values = [{
             'designate_id': record['id'],
             'designate_recordset_id': record['recordset_id'],
-            'domain_id': domain_m.id,
+            'domain_id': domain_id,
             'name': recordset['name'].rstrip('.'),
             'type': recordset['type'],
-            'content': content,
+            'content': self._sanitize_content(recordset['type'],
+                                              record['data']),
             'ttl': ttl,
             'inherit_ttl': True if recordset['ttl'] is None else False,
             'prio': record['priority'],
             'auth': self._is_authoritative(domain, recordset, record)
-        })
+        } for record in records]
 
-        record_m.save(self.session)
+        try:
+            self.session.begin()
 
-        self._update_soa(domain)
+            if values:
+                self.session.execute(models.Record.__table__.insert(), values)
+
+            self._update_soa(domain)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.session.rollback()
+        else:
+            self.session.commit()
 
     def update_record(self, context, domain, recordset, record):
         record_m = self._get_record(record['id'])
@@ -315,11 +355,47 @@ class PowerDNSBackend(base.Backend):
 
         self._update_soa(domain)
 
+    def ping(self, context):
+        status = super(PowerDNSBackend, self).ping(context)
+
+        status['servers_cache'] = {
+            'hits': self._servers_cache_hits,
+            'misses': self._servers_cache_misses,
+        }
+
+        return status
+
     # Internal Methods
+    def _get_servers(self):
+        """
+        Fetch the list of servers from central, cached for up to
+        servers-cache-ttl seconds.
+        """
+        if self._servers is None or time.time() >= self._servers_expiry:
+            self._servers_cache_misses += 1
+            self._servers = self.central_service.find_servers(
+                self.admin_context)
+            self._servers_expiry = (time.time() +
+                                    cfg.CONF[self.name].servers_cache_ttl)
+        else:
+            self._servers_cache_hits += 1
+
+        return self._servers
+
+    def _invalidate_servers(self):
+        self._servers = None
+
     def _update_soa(self, domain):
-        servers = self.central_service.find_servers(self.admin_context)
-        domain_m = self._get_domain(domain['id'])
-        record_m = self._get_record(domain=domain_m, type='SOA')
+        servers = self._get_servers()
+        domain_id = self._get_domain_id(domain['id'])
+
+        try:
+            record_m = self._get_record(domain_id=domain_id, type='SOA')
+        except exceptions.RecordNotFound:
+            # NOTE: The cached PowerDNS id may be stale, look it up afresh
+            #       next time. The failed change is rolled back.
+            self._domain_ids.pop(domain['id'], None)
+            raise
 
         record_m.update({
             'content': self._build_soa_content(domain, servers),
@@ -405,9 +481,23 @@ class PowerDNSBackend(base.Backend):
         except sqlalchemy_exceptions.MultipleResultsFound:
             raise exceptions.DomainNotFound('Too many domains found')
         else:
+            self._cache_domain_id(domain_id, domain.id)
             return domain
 
-    def _get_record(self, record_id=None, domain=None, type=None):
+    def _cache_domain_id(self, domain_id, pdns_domain_id):
+        expiry = time.time() + cfg.CONF[self.name].domain_ids_cache_ttl
+        self._domain_ids[domain_id] = (pdns_domain_id, expiry)
+
+    def _get_domain_id(self, domain_id):
+        """ Map a designate domain id to its PowerDNS domain id """
+        pdns_domain_id, expiry = self._domain_ids.get(domain_id, (None, 0))
+
+        if time.time() >= expiry:
+            return self._get_domain(domain_id).id
+
+        return pdns_domain_id
+
+    def _get_record(self, record_id=None, domain_id=None, type=None):
         query = self.session.query(models.Record)
 
         if record_id:
@@ -416,8 +506,8 @@ class PowerDNSBackend(base.Backend):
         if type:
             query = query.filter_by(type=type)
 
-        if domain:
-            query = query.filter_by(domain_id=domain.id)
+        if domain_id:
+            query = query.filter_by(domain_id=domain_id)
 
         try:
             record = query.one()
@@ -551,7 +641,7 @@ class PowerDNSBackend(base.Backend):
 
         # find a replacement server
         replacement_server_name = None
-        servers = self.central_service.find_servers(self.admin_context)
+        servers = self._get_servers()
 
         for replacement in servers:
             if replacement['id'] != server['id']:
@@ -0,0 +1,49 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from sqlalchemy import MetaData, Table, Index
+
+meta = MetaData()
+
+
+def _indexes():
+    # NOTE: records(name, type) and records(domain_id), which PowerDNS
+    #       itself queries by, are already indexed by the initial schema.
+    records_table = Table('records', meta, autoload=True)
+    domains_table = Table('domains', meta, autoload=True)
+    domainmetadata_table = Table('domainmetadata', meta, autoload=True)
+
+    return [
+        Index('records_designate_id', records_table.c.designate_id),
+        Index('records_designate_recordset_id',
+              records_table.c.designate_recordset_id),
+        Index('records_domain_id_type', records_table.c.domain_id,
+              records_table.c.type),
+        Index('domains_designate_id', domains_table.c.designate_id),
+        Index('domainmetadata_domain_id_kind',
+              domainmetadata_table.c.domain_id, domainmetadata_table.c.kind),
+    ]
+
+
+def upgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    for index in _indexes():
+        index.create(migrate_engine)
+
+
+def downgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    for index in _indexes():
+        index.drop(migrate_engine)
@@ -15,7 +15,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-from sqlalchemy import Column, String, Text, Integer, Boolean
+from sqlalchemy import Column, String, Text, Integer, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from designate.sqlalchemy.models import Base as CommonBase
 from designate.sqlalchemy.types import UUID
@@ -40,6 +40,9 @@ class TsigKey(Base):
 
 class DomainMetadata(Base):
     __tablename__ = 'domainmetadata'
+    __table_args__ = (
+        Index('domainmetadata_domain_id_kind', 'domain_id', 'kind'),
+    )
 
     domain_id = Column(Integer(), nullable=False)
     kind = Column(String(16), default=None, nullable=True)
@@ -48,6 +51,9 @@ class DomainMetadata(Base):
 
 class Domain(Base):
     __tablename__ = 'domains'
+    __table_args__ = (
+        Index('domains_designate_id', 'designate_id'),
+    )
 
     designate_id = Column(UUID, nullable=False)
 
@@ -61,6 +67,11 @@ class Domain(Base):
 
 class Record(Base):
     __tablename__ = 'records'
+    __table_args__ = (
+        Index('records_designate_id', 'designate_id'),
+        Index('records_designate_recordset_id', 'designate_recordset_id'),
+        Index('records_domain_id_type', 'domain_id', 'type'),
+    )
 
     designate_id = Column(UUID, nullable=False)
     designate_recordset_id = Column(UUID, default=None, nullable=True)
@@ -20,6 +20,9 @@ agent_api = agent_rpcapi.AgentAPI()
 
 
 class RPCBackend(base.Backend):
+    # Every call is a separate RPC call to the agent
+    concurrent_syncs = True
+
     def create_tsigkey(self, context, tsigkey):
         return agent_api.create_tsigkey(context, tsigkey)
 
@@ -47,6 +50,9 @@ class RPCBackend(base.Backend):
     def delete_domain(self, context, domain):
         return agent_api.delete_domain(context, domain)
 
+    def create_recordsets(self, context, domain, recordsets):
+        return agent_api.create_recordsets(context, domain, recordsets)
+
     def update_recordset(self, context, domain, recordset):
         return agent_api.update_recordset(context, domain, recordset)
 
@@ -56,6 +62,9 @@ class RPCBackend(base.Backend):
     def create_record(self, context, domain, recordset, record):
         return agent_api.create_record(context, domain, recordset, record)
 
+    def create_records(self, context, domain, recordset, records):
+        return agent_api.create_records(context, domain, recordset, records)
+
     def update_record(self, context, domain, recordset, record):
         return agent_api.update_record(context, domain, recordset, record)
 
@@ -63,7 +72,7 @@ class RPCBackend(base.Backend):
         return agent_api.delete_record(context, domain, recordset, record)
 
     def sync_domain(self, context, domain, records):
-        return agent_api.sync_domain(context, domain, records)
+        return agent_api.sync_domain(context, domain, list(records))
 
     def sync_record(self, context, domain, record):
         return agent_api.sync_record(context, domain, record)
@@ -0,0 +1,381 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+A native client for the BIND control channel (the protocol spoken by rndc).
+
+Commands are sent over long lived, HMAC authenticated connections, so a
+backend can issue many of them without forking the rndc binary each time.
+"""
+import base64
+import hashlib
+import hmac
+import random
+import re
+import select
+import socket
+import struct
+import time
+
+from eventlet import semaphore
+
+from designate import exceptions
+from designate.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+
+# Wire types of the values in a control channel message
+TYPE_STRING = 0x00
+TYPE_BINARY = 0x01
+TYPE_TABLE = 0x02
+TYPE_LIST = 0x03
+
+# Supported key algorithms, mapped to their hash function and the number BIND
+# identifies them by in the 'hsha' authenticator. hmac-md5 predates the
+# 'hsha' authenticator and is sent as 'hmd5' instead.
+ALGORITHMS = {
+    'hmac-md5': (hashlib.md5, None),
+    'hmac-sha1': (hashlib.sha1, 161),
+    'hmac-sha224': (hashlib.sha224, 162),
+    'hmac-sha256': (hashlib.sha256, 163),
+    'hmac-sha384': (hashlib.sha384, 164),
+    'hmac-sha512': (hashlib.sha512, 165),
+}
+
+HMD5_LENGTH = 22
+HSHA_LENGTH = 88
+
+KEY_RE = re.compile(r'key\s+"?([^"\s{]+)"?\s*{(.*?)}\s*;', re.S)
+ALGORITHM_RE = re.compile(r'algorithm\s+"?([\w-]+)"?\s*;')
+SECRET_RE = re.compile(r'secret\s+"([^"]+)"\s*;')
+
+
+class SendError(socket.error):
+    """ A command could not be sent, so named never received it """
+
+
+def parse_key_file(path):
+    """
+    Read the first key from a BIND key file, e.g. /etc/rndc.key
+
+    :returns: A (name, algorithm, secret) tuple, with the secret decoded.
+    """
+    with open(path) as fh:
+        content = fh.read()
+
+    match = KEY_RE.search(content)
+
+    if match is None:
+        raise exceptions.ConfigurationError('No key found in %s' % path)
+
+    name, body = match.groups()
+
+    algorithm = ALGORITHM_RE.search(body)
+    secret = SECRET_RE.search(body)
+
+    if algorithm is None or secret is None:
+        raise exceptions.ConfigurationError(
+            'Key %s in %s is missing an algorithm or secret' % (name, path))
+
+    algorithm = algorithm.group(1).lower()
+
+    if algorithm not in ALGORITHMS:
+        raise exceptions.ConfigurationError(
+            'Unsupported rndc key algorithm: %s' % algorithm)
+
+    return name, algorithm, base64.b64decode(secret.group(1))
+
+
+def serialize(items):
+    """
+    Serialize a sequence of (key, value) pairs into a control channel table.
+
+    Values are either strings, or a further sequence of pairs which is
+    serialized as a nested table.
+    """
+    output = []
+
+    for key, value in items:
+        if isinstance(value, (list, tuple)):
+            value_type, value = TYPE_TABLE, serialize(value)
+        else:
+            value_type = TYPE_BINARY
+
+        output.append(struct.pack('>B', len(key)) + key)
+        output.append(struct.pack('>BI', value_type, len(value)) + value)
+
+    return ''.join(output)
+
+
+def _parse_value(data, offset):
+    value_type, length = struct.unpack_from('>BI', data, offset)
+    offset += 5
+
+    value = data[offset:offset + length]
+
+    if value_type == TYPE_TABLE:
+        value = parse(value)
+    elif value_type == TYPE_LIST:
+        value = _parse_list(value)
+    elif value_type not in (TYPE_STRING, TYPE_BINARY):
+        raise exceptions.RNDCError('Unknown rndc value type: %d' % value_type)
+
+    return value, offset + length
+
+
+def _parse_list(data):
+    values = []
+    offset = 0
+
+    while offset < len(data):
+        value, offset = _parse_value(data, offset)
+        values.append(value)
+
+    return values
+
+
+def parse(data):
+    """ Parse a serialized control channel table into a dict """
+    table = {}
+    offset = 0
+
+    while offset < len(data):
+        key_length, = struct.unpack_from('>B', data, offset)
+        key = data[offset + 1:offset + 1 + key_length]
+
+        table[key], offset = _parse_value(data, offset + 1 + key_length)
+
+    return table
+
+
+def split_auth(data):
+    """
+    Split a serialized message into its authenticator and the signed rest.
+
+    BIND signs everything following the leading '_auth' table, so the
+    signature is checked against the raw bytes rather than a re-serialized
+    copy of the message.
+    """
+    key_length, = struct.unpack_from('>B', data, 0)
+
+    if data[1:1 + key_length] != '_auth':
+        return {}, data
+
+    auth, offset = _parse_value(data, 1 + key_length)
+
+    return auth, data[offset:]
+
+
+def sign(algorithm, secret, data):
+    """ Build the '_auth' table entry authenticating data """
+    hash_function, algorithm_number = ALGORITHMS[algorithm]
+
+    digest = base64.b64encode(hmac.new(secret, data, hash_function).digest())
+
+    if algorithm_number is None:
+        return 'hmd5', digest[:HMD5_LENGTH]
+
+    return 'hsha', (struct.pack('>B', algorithm_number) +
+                    digest.ljust(HSHA_LENGTH, '\0'))
+
+
+class RNDCConnection(object):
+    """ A single authenticated connection to a BIND control channel """
+
+    def __init__(self, host, port, algorithm, secret, timeout=None):
+        self.host = host
+        self.port = port
+        self.algorithm = algorithm
+        self.secret = secret
+        self.timeout = timeout
+
+        self._socket = None
+        self._nonce = None
+        self._serial = random.randint(0, 1 << 24)
+
+    def connect(self):
+        self._socket = socket.create_connection((self.host, self.port),
+                                                self.timeout)
+
+        # named hands out the nonce every later message on this connection
+        # has to carry in response to an initial 'null' command.
+        self._nonce = None
+        response = self._send([('type', 'null')])
+        self._nonce = response['_ctrl'].get('_nonce')
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def is_alive(self):
+        """ Check an idle connection has not been closed by named """
+        if self._socket is None:
+            return False
+
+        try:
+            readable, _, _ = select.select([self._socket], [], [], 0)
+        except (select.error, socket.error, ValueError):
+            return False
+
+        # named sends nothing between commands, so a readable connection
+        # has either been closed or is out of step with it.
+        return not readable
+
+    def command(self, command):
+        """ Run a command, returning the '_data' table of the response """
+        if self._socket is None:
+            self.connect()
+
+        return self._send([('type', command)])['_data']
+
+    def _send(self, data):
+        self._serial += 1
+        serial = str(self._serial)
+        now = int(time.time())
+
+        ctrl = [('_ser', serial), ('_tim', str(now)), ('_exp', str(now + 60))]
+
+        if self._nonce is not None:
+            ctrl.append(('_nonce', self._nonce))
+
+        body = serialize([('_ctrl', ctrl), ('_data', data)])
+        message = serialize([
+            ('_auth', [sign(self.algorithm, self.secret, body)])]) + body
+
+        try:
+            self._socket.sendall(struct.pack('>II', len(message) + 4,
+                                             PROTOCOL_VERSION) + message)
+        except socket.error as e:
+            raise SendError(*e.args)
+
+        length, version = struct.unpack('>II', self._recv(8))
+
+        if version != PROTOCOL_VERSION:
+            raise exceptions.RNDCError(
+                'Unsupported rndc protocol version: %d' % version)
+
+        auth, body = split_auth(self._recv(length - 4))
+        label, expected = sign(self.algorithm, self.secret, body)
+
+        if auth.get(label) != expected:
+            raise exceptions.RNDCError(
+                'Bad rndc response signature from %s' % self.host)
+
+        response = parse(body)
+        ctrl = response.get('_ctrl', {})
+
+        if ctrl.get('_ser') != serial:
+            raise exceptions.RNDCError(
+                'Unexpected rndc response serial from %s' % self.host)
+
+        if self._nonce is not None and ctrl.get('_nonce') != self._nonce:
+            raise exceptions.RNDCError(
+                'Unexpected rndc response nonce from %s' % self.host)
+
+        return response
+
+    def _recv(self, length):
+        chunks = []
+
+        while length > 0:
+            chunk = self._socket.recv(length)
+
+            if not chunk:
+                raise socket.error('Connection closed by %s' % self.host)
+
+            chunks.append(chunk)
+            length -= len(chunk)
+
+        return ''.join(chunks)
+
+
+class RNDCClient(object):
+    """
+    Runs rndc commands over a small pool of persistent connections.
+
+    Connections are opened on demand, up to max_connections at a time, and
+    kept open for subsequent commands.
+    """
+
+    def __init__(self, host, port, key_file, timeout=None, max_connections=1):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        _, self.algorithm, self.secret = parse_key_file(key_file)
+
+        self._idle = []
+        self._semaphore = semaphore.Semaphore(max_connections)
+
+    def call(self, *args):
+        """
+        Run a command, given in the same form as the rndc command line
+        arguments, e.g. call('reload', 'example.com.')
+
+        :returns: The text output of the command, if any.
+        """
+        command = ' '.join(args)
+        LOG.debug('Sending rndc command: %s' % command)
+
+        with self._semaphore:
+            try:
+                connection, data = self._command(command)
+            except (socket.error, IOError) as e:
+                raise exceptions.RNDCError(
+                    'rndc command "%s" failed: %s' % (command, e))
+
+            self._idle.append(connection)
+
+        if data.get('result', '0') != '0':
+            raise exceptions.RNDCError(
+                'rndc command "%s" failed: %s' % (command, data.get('err')))
+
+        return data.get('text')
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+    def _command(self, command):
+        while self._idle:
+            connection = self._idle.pop()
+
+            if not connection.is_alive():
+                # named dropped the connection while it sat idle
+                connection.close()
+                continue
+
+            try:
+                return connection, self._run(connection, command)
+            except SendError:
+                # NOTE: Only retried when named can't have seen the command.
+                #       Once it has been sent, retrying could run a command
+                #       like addzone twice.
+                LOG.debug('Idle rndc connection to %s lost, reconnecting' %
+                          self.host)
+                break
+
+        connection = RNDCConnection(self.host, self.port, self.algorithm,
+                                    self.secret, self.timeout)
+
+        return connection, self._run(connection, command)
+
+    def _run(self, connection, command):
+        try:
+            return connection.command(command)
+        except Exception:
+            connection.close()
+            raise
@@ -36,5 +36,19 @@ cfg.CONF.register_opts([
     cfg.StrOpt('managed_resource_email', default='email@example.io',
                help='E-Mail for Managed resources'),
     cfg.StrOpt('managed_resource_tenant_id',
-               help="The Tenant ID that will own any managed resources.")
+               help="The Tenant ID that will own any managed resources."),
+    cfg.IntOpt('iter-chunk-size', default=1000,
+               help='Number of rows fetched from storage at a time when '
+                    'iterating over large result sets'),
+    cfg.IntOpt('sync-concurrency', default=10,
+               help='Number of domains synchronised with the backend in '
+                    'parallel when syncing all domains'),
+    cfg.IntOpt('sync-timeout', default=300,
+               help='Timeout in seconds for synchronising a single domain'),
+    cfg.IntOpt('zone-import-batch-size', default=100,
+               help='Number of recordsets stored at a time when importing a '
+                    'zonefile'),
+    cfg.IntOpt('zone-import-timeout', default=600,
+               help='Seconds after which a zone import still running is '
+                    'failed as abandoned'),
 ], group='service:central')
@@ -36,6 +36,13 @@ class CentralAPI(rpc_proxy.RpcProxy):
         3.1 - Add floating ip ptr methods
         3.2 - TLD Api changes
         3.3 - Add methods for blacklisted domains
+        3.4 - Add get_domain_contents
+        3.5 - Add create_recordsets_bulk and create_records_bulk
+        3.6 - Add zone import methods
+        3.7 - Add paging to get_domain_contents
+        3.8 - Make sync_domains resumable, add get_domain_sync_status
+        3.9 - Add invalidate_floatingips
+        3.10 - Import zones from a zonefile, parsed by central
     """
     def __init__(self, topic=None):
         topic = topic if topic else cfg.CONF.central_topic
@@ -182,6 +189,14 @@ class CentralAPI(rpc_proxy.RpcProxy):
 
         return self.call(context, msg)
 
+    def get_domain_contents(self, context, domain_id, marker=None,
+                            limit=None):
+        LOG.info("get_domain_contents: Calling central's get_domain_contents.")
+        msg = self.make_msg('get_domain_contents', domain_id=domain_id,
+                            marker=marker, limit=limit)
+
+        return self.call(context, msg, version='3.7')
+
     def find_domains(self, context, criterion=None, marker=None, limit=None,
                      sort_key=None, sort_dir=None):
         LOG.info("find_domains: Calling central's find_domains.")
@@ -256,6 +271,28 @@ class CentralAPI(rpc_proxy.RpcProxy):
 
         return self.call(context, msg, version='3.2')
 
+    # Zone Import Methods
+    def create_zone_import(self, context, zonefile):
+        LOG.info("create_zone_import: Calling central's create_zone_import.")
+        msg = self.make_msg('create_zone_import', zonefile=zonefile)
+
+        return self.call(context, msg, version='3.10')
+
+    def get_zone_import(self, context, zone_import_id):
+        LOG.info("get_zone_import: Calling central's get_zone_import.")
+        msg = self.make_msg('get_zone_import', zone_import_id=zone_import_id)
+
+        return self.call(context, msg, version='3.6')
+
+    def find_zone_imports(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        LOG.info("find_zone_imports: Calling central's find_zone_imports.")
+        msg = self.make_msg('find_zone_imports', criterion=criterion,
+                            marker=marker, limit=limit, sort_key=sort_key,
+                            sort_dir=sort_dir)
+
+        return self.call(context, msg, version='3.6')
+
     # RecordSet Methods
     def create_recordset(self, context, domain_id, values):
         LOG.info("create_recordset: Calling central's create_recordset.")
@@ -265,6 +302,15 @@ class CentralAPI(rpc_proxy.RpcProxy):
 
         return self.call(context, msg)
 
+    def create_recordsets_bulk(self, context, domain_id, values_list):
+        LOG.info("create_recordsets_bulk: Calling central's "
+                 "create_recordsets_bulk.")
+        msg = self.make_msg('create_recordsets_bulk',
+                            domain_id=domain_id,
+                            values_list=values_list)
+
+        return self.call(context, msg, version='3.5')
+
     def get_recordset(self, context, domain_id, recordset_id):
         LOG.info("get_recordset: Calling central's get_recordset.")
         msg = self.make_msg('get_recordset',
@@ -327,6 +373,18 @@ class CentralAPI(rpc_proxy.RpcProxy):
 
         return self.call(context, msg)
 
+    def create_records_bulk(self, context, domain_id, recordset_id,
+                            values_list, increment_serial=True):
+        LOG.info("create_records_bulk: Calling central's "
+                 "create_records_bulk.")
+        msg = self.make_msg('create_records_bulk',
+                            domain_id=domain_id,
+                            recordset_id=recordset_id,
+                            values_list=values_list,
+                            increment_serial=increment_serial)
+
+        return self.call(context, msg, version='3.5')
+
     def get_record(self, context, domain_id, recordset_id, record_id):
         LOG.info("get_record: Calling central's get_record.")
         msg = self.make_msg('get_record',
@@ -380,11 +438,18 @@ class CentralAPI(rpc_proxy.RpcProxy):
         return self.call(context, msg)
 
     # Sync Methods
-    def sync_domains(self, context):
+    def sync_domains(self, context, marker=None):
         LOG.info("sync_domains: Calling central's sync_domains.")
-        msg = self.make_msg('sync_domains')
+        msg = self.make_msg('sync_domains', marker=marker)
 
-        return self.call(context, msg)
+        return self.call(context, msg, version='3.8')
+
+    def get_domain_sync_status(self, context):
+        LOG.info("get_domain_sync_status: Calling central's "
+                 "get_domain_sync_status.")
+        msg = self.make_msg('get_domain_sync_status')
+
+        return self.call(context, msg, version='3.8')
 
     def sync_domain(self, context, domain_id):
         LOG.info("sync_domain: Calling central's sync_domains.")
@@ -415,6 +480,16 @@ class CentralAPI(rpc_proxy.RpcProxy):
                             floatingip_id=floatingip_id, values=values)
         return self.call(context, msg)
 
+    def invalidate_floatingips(self, context, tenant_id=None,
+                               floatingip_id=None):
+        LOG.info("invalidate_floatingips: Casting to every central's "
+                 "invalidate_floatingips.")
+        msg = self.make_msg('invalidate_floatingips', tenant_id=tenant_id,
+                            floatingip_id=floatingip_id)
+
+        # Every central process caches floating ips separately
+        self.fanout_cast(context, msg, version='3.9')
+
     # Blacklisted Domain Methods
     def create_blacklist(self, context, values):
         LOG.info("create_blacklist: Calling central's create_blacklist")
@@ -15,21 +15,33 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import re
+import collections
 import contextlib
+import functools
+import threading
+import eventlet
+from eventlet import greenpool
 from oslo.config import cfg
+from designate.openstack.common import excutils
 from designate.openstack.common import log as logging
+from designate.openstack.common import strutils
+from designate.openstack.common import timeutils
 from designate.openstack.common.rpc import service as rpc_service
 from designate.openstack.common.notifier import proxy as notifier
 from designate import backend
+from designate import dnsutils
 from designate import exceptions
 from designate import policy
 from designate import quota
 from designate import utils
+from designate.context import DesignateContext
 from designate.storage import api as storage_api
 from designate import network_api
 
 LOG = logging.getLogger(__name__)
 
+INLINE_FLAGS_RE = re.compile(r'\(\?[iLmsux]+\)')
+
 
 @contextlib.contextmanager
 def wrap_backend_call():
@@ -44,8 +56,69 @@ def wrap_backend_call():
         raise exceptions.Backend('Unknown backend failure: %r' % exc)
 
 
+def failure_message(exc):
+    """
+    The message of an exception, as unicode, to be stored as the reason for
+    a failure. Falls back to the exception's class name when it has none.
+    """
+    try:
+        message = unicode(exc)
+    except UnicodeDecodeError:
+        # A byte string message, which isn't ASCII
+        message = strutils.safe_decode(str(exc), 'utf-8', errors='replace')
+
+    return message or exc.__class__.__name__
+
+
+def coalesce_serial_increments(f):
+    """
+    Defers the domain serial increments made by a Service method, and any
+    methods it calls, until it returns. Each touched domain then has its
+    serial incremented, and the backend updated, only once.
+    """
+    @functools.wraps(f)
+    def wrapper(self, *args, **kwargs):
+        with self._serial_unit_of_work():
+            return f(self, *args, **kwargs)
+
+    return wrapper
+
+
+class BlacklistMatcher(object):
+    """
+    Matches domain names against a set of blacklist patterns, each compiled
+    only once.
+
+    Patterns without groups or inline flags are joined into a single regex,
+    checking a name against all of them in one pass. The others are kept as
+    separate regexes, as joining them could change what they match.
+    """
+    def __init__(self, patterns):
+        combinable = []
+        self.regexes = []
+
+        for pattern in patterns:
+            regex = re.compile(pattern)
+
+            if regex.groups or INLINE_FLAGS_RE.search(pattern):
+                self.regexes.append(regex)
+            else:
+                combinable.append(pattern)
+
+        if combinable:
+            self.regexes.insert(0, re.compile(
+                '|'.join('(?:%s)' % pattern for pattern in combinable)))
+
+    def match(self, domain_name):
+        for regex in self.regexes:
+            if regex.search(domain_name):
+                return True
+
+        return False
+
+
 class Service(rpc_service.Service):
-    RPC_API_VERSION = '3.3'
+    RPC_API_VERSION = '3.10'
 
     def __init__(self, *args, **kwargs):
         backend_driver = cfg.CONF['service:central'].backend_driver
@@ -70,20 +143,38 @@ class Service(rpc_service.Service):
 
         self.network_api = network_api.get_network_api(cfg.CONF.network_api)
 
+        # Compiled blacklist, along with the storage cache version it was
+        # built from
+        self._blacklist_matcher = None
+        self._blacklist_version = None
+
+        # Names of all TLDs, along with the storage cache version they were
+        # loaded from
+        self._tlds = None
+        self._tlds_version = None
+
+        # Per greenthread state of the current serial increment unit of work
+        self._unit_of_work = threading.local()
+
     def start(self):
-        # Check to see if there are any TLDs in the database
-        tlds = self.storage_api.find_tlds({})
-        if tlds:
-            self.check_for_tlds = True
+        # Load the TLDs, validation is skipped if there are none
+        if self._get_tlds({}):
             LOG.info("Checking for TLDs")
         else:
-            self.check_for_tlds = False
             LOG.info("NOT checking for TLDs")
 
         self.backend.start()
 
         super(Service, self).start()
 
+        # Clean up after the zone imports which were interrupted, e.g. by a
+        # restart, now and from time to time.
+        self._fail_abandoned_zone_imports()
+
+        interval = cfg.CONF['service:central'].zone_import_timeout
+        self.tg.add_timer(interval, self._fail_abandoned_zone_imports,
+                          initial_delay=interval)
+
     def stop(self):
         super(Service, self).stop()
 
@@ -103,21 +194,19 @@ class Service(rpc_service.Service):
                                                'required')
 
         # Check the TLD for validity if there are entries in the database
-        if self.check_for_tlds:
-            try:
-                self.storage_api.find_tld(context, {'name': domain_labels[-1]})
-            except exceptions.TLDNotFound:
+        tlds = self._get_tlds(context)
+
+        if tlds:
+            # TLDs may have more than one label, e.g. co.uk, so every parent
+            # name is a candidate
+            parent_names = ['.'.join(domain_labels[i:]).lower()
+                            for i in range(1, len(domain_labels))]
+
+            if not tlds.intersection(parent_names):
                 raise exceptions.InvalidDomainName('Invalid TLD')
 
             # Now check that the domain name is not the same as a TLD
-            try:
-                stripped_domain_name = domain_name.strip('.').lower()
-                self.storage_api.find_tld(
-                    context,
-                    {'name': stripped_domain_name})
-            except exceptions.TLDNotFound:
-                pass
-            else:
+            if domain_name.strip('.').lower() in tlds:
                 raise exceptions.InvalidDomainName(
                     'Domain name cannot be the same as a TLD')
 
@@ -168,6 +257,28 @@ class Service(rpc_service.Service):
 
         return True
 
+    def _is_valid_recordsets_placement(self, context, domain, values_list):
+        """
+        Check the placement of several new recordsets against each other,
+        _is_valid_recordset_placement checks them against the existing ones.
+        """
+        types = {}
+
+        for values in values_list:
+            # CNAME's must not be created at the zone apex.
+            if values['type'] == 'CNAME' and values['name'] == domain['name']:
+                raise exceptions.InvalidRecordSetLocation(
+                    'CNAME recordsets may not be created at the zone apex')
+
+            types.setdefault(values['name'], []).append(values['type'])
+
+        # CNAME's must not share a name with other recordsets
+        for name, name_types in types.items():
+            if 'CNAME' in name_types and len(name_types) > 1:
+                raise exceptions.InvalidRecordSetLocation(
+                    'CNAME recordsets may not share a name with any other '
+                    'recordset')
+
     def _is_valid_recordset_placement_subdomain(self, context, domain,
                                                 recordset_name,
                                                 criterion=None):
@@ -203,14 +314,43 @@ class Service(rpc_service.Service):
         """
         Ensures the provided domain_name is not blacklisted.
         """
+        return self._get_blacklist_matcher(context).match(domain_name)
 
-        blacklists = self.storage_api.find_blacklists(context)
+    def _get_blacklist_matcher(self, context):
+        """
+        Get the compiled blacklist, rebuilding it whenever the blacklists
+        have been changed since, by this or any other central worker.
+        """
+        version = self.storage_api.get_cache_version(context, 'blacklists')
 
-        for blacklist in blacklists:
-            if bool(re.search(blacklist["pattern"], domain_name)):
-                return True
+        if self._blacklist_matcher is None or \
+                version != self._blacklist_version:
+            LOG.debug('Compiling blacklist version %d' % version)
 
-        return False
+            blacklists = self.storage_api.find_blacklists(context)
+
+            self._blacklist_matcher = BlacklistMatcher(
+                [b['pattern'] for b in blacklists])
+            self._blacklist_version = version
+
+        return self._blacklist_matcher
+
+    def _get_tlds(self, context):
+        """
+        Get the set of TLD names, reloading it whenever the TLDs have been
+        changed since, by this or any other central worker.
+        """
+        version = self.storage_api.get_cache_version(context, 'tlds')
+
+        if self._tlds is None or version != self._tlds_version:
+            LOG.debug('Loading TLDs version %d' % version)
+
+            tlds = self.storage_api.find_tlds(context)
+
+            self._tlds = frozenset(t['name'].lower() for t in tlds)
+            self._tlds_version = version
+
+        return self._tlds
 
     def _is_subdomain(self, context, domain_name):
         context = context.elevated()
@@ -219,22 +359,64 @@ class Service(rpc_service.Service):
         # Break the name up into it's component labels
         labels = domain_name.split(".")
 
-        i = 1
+        # Starting with label #2, every parent name is a candidate. Fetch the
+        # closest matching domain in the database with a single query.
+        names = ['.'.join(labels[i:]) for i in range(1, len(labels) - 1)]
 
-        # Starting with label #2, search for matching domain's in the database
-        while (i < len(labels)):
-            name = '.'.join(labels[i:])
+        try:
+            return self.storage_api.find_closest_domain(context, names)
+        except exceptions.DomainNotFound:
+            return False
 
-            try:
-                domain = self.storage_api.find_domain(context, {'name': name})
-            except exceptions.DomainNotFound:
-                i += 1
-            else:
-                return domain
+    @contextlib.contextmanager
+    def _serial_unit_of_work(self):
+        """
+        Collects the domains whose serial needs incrementing, and increments
+        them when the outermost unit of work ends. This happens even if it
+        fails, as the changes made before the failure are already stored. A
+        failed increment is then only logged, so the original failure is
+        what the caller sees.
+        """
+        if getattr(self._unit_of_work, 'pending', None) is not None:
+            # Nested, the outermost unit of work applies the increments
+            yield
+            return
 
-        return False
+        pending = self._unit_of_work.pending = {}
+
+        try:
+            yield
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self._unit_of_work.pending = None
+
+                for domain_id, context in pending.items():
+                    try:
+                        self._apply_domain_serial_increment(context,
+                                                            domain_id)
+                    except Exception:
+                        LOG.exception('Failed to increment the serial of '
+                                      'domain %s' % domain_id)
+        else:
+            self._unit_of_work.pending = None
+
+            for domain_id, context in pending.items():
+                self._apply_domain_serial_increment(context, domain_id)
 
     def _increment_domain_serial(self, context, domain_id):
+        """
+        Increment a domain's serial, or defer it until the end of the
+        current unit of work, if any.
+        """
+        pending = getattr(self._unit_of_work, 'pending', None)
+
+        if pending is None:
+            return self._apply_domain_serial_increment(context, domain_id)
+
+        LOG.debug('Deferring serial increment of domain %s' % domain_id)
+        pending[domain_id] = context
+
+    def _apply_domain_serial_increment(self, context, domain_id):
         domain = self.storage_api.get_domain(context, domain_id)
 
         # Increment the serial number
@@ -258,13 +440,15 @@ class Service(rpc_service.Service):
         # TODO(kiall): Enforce RRSet Quotas
         pass
 
-    def _enforce_record_quota(self, context, domain, recordset):
+    def _enforce_record_quota(self, context, domain, recordset, count=1):
         # Ensure the records per domain quota is OK
-        criterion = {'domain_id': domain['id']}
-        count = self.storage_api.count_records(context, criterion)
+        existing = self.storage_api.count_domain_records(context,
+                                                         domain['id'])
 
+        # NOTE: limit_check verifies there is room for one more item beyond
+        #       the value given, so account for the rest of the new ones.
         self.quota.limit_check(context, domain['tenant_id'],
-                               domain_records=count)
+                               domain_records=existing + count - 1)
 
         # TODO(kiall): Enforce Records per RRSet Quotas
 
@@ -366,8 +550,6 @@ class Service(rpc_service.Service):
             pass
         self.notifier.info(context, 'dns.tld.create', tld)
 
-        # Set check for tlds to be true
-        self.check_for_tlds = True
         return tld
 
     def find_tlds(self, context, criterion=None, marker=None, limit=None,
@@ -393,11 +575,6 @@ class Service(rpc_service.Service):
         return tld
 
     def delete_tld(self, context, tld_id):
-        # Known issue - self.check_for_tld is not reset here.  So if the last
-        # TLD happens to be deleted, then we would incorrectly do the TLD
-        # validations.
-        # This decision was influenced by weighing the (ultra low) probability
-        # of hitting this issue vs doing the checks for every delete.
         policy.check('delete_tld', context, {'tld_id': tld_id})
 
         with self.storage_api.delete_tld(context, tld_id) as tld:
@@ -476,6 +653,21 @@ class Service(rpc_service.Service):
         if 'tenant_id' not in values:
             values['tenant_id'] = context.tenant_id
 
+        self._prepare_domain_values(context, values)
+
+        with self.storage_api.create_domain(context, values) as domain:
+            with wrap_backend_call():
+                self.backend.create_domain(context, domain)
+
+        self.notifier.info(context, 'dns.domain.create', domain)
+
+        return domain
+
+    def _prepare_domain_values(self, context, values):
+        """
+        Validate the values of a new domain, and fill in the parent domain
+        and serial.
+        """
         target = {
             'tenant_id': values['tenant_id'],
             'domain_name': values['name']
@@ -515,14 +707,6 @@ class Service(rpc_service.Service):
         # Set the serial number
         values['serial'] = utils.increment_serial()
 
-        with self.storage_api.create_domain(context, values) as domain:
-            with wrap_backend_call():
-                self.backend.create_domain(context, domain)
-
-        self.notifier.info(context, 'dns.domain.create', domain)
-
-        return domain
-
     def get_domain(self, context, domain_id):
         domain = self.storage_api.get_domain(context, domain_id)
 
@@ -550,6 +734,21 @@ class Service(rpc_service.Service):
         #              pools, return the filtered list here.
         return self.storage_api.find_servers(context, criterion)
 
+    def get_domain_contents(self, context, domain_id, marker=None,
+                            limit=None):
+        domain = self.storage_api.get_domain(context, domain_id)
+
+        target = {
+            'domain_id': domain_id,
+            'domain_name': domain['name'],
+            'tenant_id': domain['tenant_id']
+        }
+
+        policy.check('get_domain_contents', context, target)
+
+        return self.storage_api.get_domain_contents(context, domain_id,
+                                                    marker, limit)
+
     def find_domains(self, context, criterion=None, marker=None, limit=None,
                      sort_key=None, sort_dir=None):
         target = {'tenant_id': context.tenant_id}
@@ -651,12 +850,253 @@ class Service(rpc_service.Service):
 
         policy.check('touch_domain', context, target)
 
-        domain = self._increment_domain_serial(context, domain_id)
+        domain = self._apply_domain_serial_increment(context, domain_id)
 
         self.notifier.info(context, 'dns.domain.touch', domain)
 
         return domain
 
+    # Zone Import Methods
+    def create_zone_import(self, context, zonefile):
+        """
+        Import a zonefile as a new Domain, in the background.
+
+        The zone is created PENDING, and its records are stored a batch at
+        a time. Only once all of them are stored is the zone made ACTIVE
+        and provisioned on the backend. If the import fails, the zone is
+        deleted again.
+
+        :param zonefile: Text of the zonefile to import.
+        :returns: The zone import, to follow the progress of the import with.
+        """
+        target = {'tenant_id': context.tenant_id}
+        policy.check('create_zone_import', context, target)
+
+        with self.storage_api.create_zone_import(
+                context, {'tenant_id': context.tenant_id}) as zone_import:
+            pass
+
+        self.tg.add_thread(self._import_zone, context, zone_import, zonefile)
+
+        return zone_import
+
+    def get_zone_import(self, context, zone_import_id):
+        zone_import = self.storage_api.get_zone_import(context,
+                                                       zone_import_id)
+
+        target = {
+            'zone_import_id': zone_import_id,
+            'tenant_id': zone_import['tenant_id']
+        }
+
+        policy.check('get_zone_import', context, target)
+
+        return zone_import
+
+    def find_zone_imports(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        target = {'tenant_id': context.tenant_id}
+        policy.check('find_zone_imports', context, target)
+
+        return self.storage_api.find_zone_imports(
+            context, criterion, marker, limit, sort_key, sort_dir)
+
+    def _is_zone_import_abandoned(self, zone_import):
+        """
+        Whether an unfinished zone import has stopped making progress, e.g.
+        because the central worker running it went away.
+        """
+        if zone_import['status'] not in ('PENDING', 'RUNNING'):
+            return False
+
+        last_progress = zone_import['updated_at'] or \
+            zone_import['created_at']
+
+        # NOTE: Nothing of an import is stored until it completes, so this
+        #       is the time since it started running. An import cut short
+        #       by its worker going away was rolled back along with its
+        #       transaction.
+        return timeutils.is_older_than(
+            last_progress, cfg.CONF['service:central'].zone_import_timeout)
+
+    def _fail_abandoned_zone_imports(self):
+        """ Fail the zone imports which stopped running """
+        context = DesignateContext.get_admin_context(all_tenants=True)
+        storage = storage_api.StorageAPI()
+
+        try:
+            for status in ('PENDING', 'RUNNING'):
+                zone_imports = storage.find_zone_imports(
+                    context, {'status': status})
+
+                for zone_import in zone_imports:
+                    if self._is_zone_import_abandoned(zone_import):
+                        LOG.warn('Zone import %s stopped making progress, '
+                                 'failing it' % zone_import['id'])
+
+                        self._fail_zone_import(
+                            storage, context, zone_import,
+                            u'The import stopped making progress')
+        except Exception:
+            LOG.exception('Failed to fail the abandoned zone imports')
+
+    def _update_zone_import(self, storage, context, zone_import, values):
+        with storage.update_zone_import(
+                context, zone_import['id'], values) as zone_import:
+            pass
+
+        return zone_import
+
+    def _import_zone(self, context, zone_import, zonefile):
+        """
+        Parse a zonefile and import it into a new domain, a batch of
+        recordsets at a time. The domain is then made ACTIVE and provisioned
+        on the backend.
+
+        The whole import is a single storage transaction, so a failed import
+        leaves nothing of the domain behind.
+        """
+        # NOTE: The import runs in the background, on a storage session of
+        #       its own, so its transactions don't take in the storage calls
+        #       of the RPC handlers running meanwhile.
+        storage = storage_api.StorageAPI()
+
+        LOG.info('Running zone import %s' % zone_import['id'])
+
+        try:
+            zone_import = self._update_zone_import(
+                storage, context, zone_import, {'status': 'RUNNING'})
+
+            dnspython_zone = dnsutils.parse_zonefile(zonefile)
+
+            values = dnsutils.get_zone_values(dnspython_zone)
+            recordsets = dnsutils.get_recordsets_values(dnspython_zone)
+
+            values['tenant_id'] = zone_import['tenant_id']
+            values['status'] = 'PENDING'
+
+            self._prepare_domain_values(context, values)
+
+            # Ensure the recordset names and placements are valid. There are
+            # no other recordsets in a new domain to check them against.
+            for recordset_values, _ in recordsets:
+                self._is_valid_recordset_name(context, values,
+                                              recordset_values['name'])
+
+            self._is_valid_recordsets_placement(
+                context, values, [r for r, _ in recordsets])
+
+            records_total = sum(len(r) for _, r in recordsets)
+
+            if records_total:
+                # NOTE: limit_check verifies there is room for one more item
+                #       beyond the value given, see _enforce_record_quota.
+                self.quota.limit_check(context, values['tenant_id'],
+                                       domain_records=records_total - 1)
+
+            zone_import = self._update_zone_import(
+                storage, context, zone_import,
+                {'records_total': records_total})
+
+            created = []
+            batch_size = cfg.CONF['service:central'].zone_import_batch_size
+
+            with storage.transaction():
+                with storage.create_domain(context, values) as domain:
+                    pass
+
+                for i in range(0, len(recordsets), batch_size):
+                    self._store_zone_import_batch(
+                        storage, context, domain,
+                        recordsets[i:i + batch_size], created)
+
+                domain = self._activate_imported_domain(storage, context,
+                                                        domain, created)
+
+                zone_import = self._update_zone_import(
+                    storage, context, zone_import,
+                    {'status': 'COMPLETE',
+                     'domain_id': domain['id'],
+                     'records_imported': records_total})
+        except Exception as e:
+            LOG.warn('Zone import %s failed: %s' % (zone_import['id'], e))
+
+            self._fail_zone_import(storage, context, zone_import,
+                                   failure_message(e))
+            return
+
+        self.notifier.info(context, 'dns.domain.create', domain)
+
+        for recordset, records in created:
+            self.notifier.info(context, 'dns.recordset.create', recordset)
+
+            for record in records:
+                self.notifier.info(context, 'dns.record.create', record)
+
+        LOG.info('Zone import %s complete' % zone_import['id'])
+
+    def _store_zone_import_batch(self, storage, context, domain, recordsets,
+                                 created):
+        """ Store a batch of recordsets, and their records """
+        for recordset_values, records_values in recordsets:
+            with storage.create_recordset(
+                    context, domain['id'], recordset_values) as recordset:
+                pass
+
+            records = []
+
+            if records_values:
+                with storage.create_records(
+                        context, domain['id'], recordset['id'],
+                        records_values) as records:
+                    pass
+
+            created.append((recordset, records))
+
+    def _activate_imported_domain(self, storage, context, domain, created):
+        """
+        Make an imported domain ACTIVE, and provision it on the backend. If
+        the backend fails, the domain is removed from it again and the error
+        raised, rolling back the import.
+        """
+        with storage.update_domain(
+                context, domain['id'], {'status': 'ACTIVE'}) as domain:
+            with wrap_backend_call():
+                self.backend.create_domain(context, domain)
+
+                try:
+                    self.backend.create_recordsets(
+                        context, domain, [r for r, _ in created])
+
+                    for recordset, records in created:
+                        if records:
+                            self.backend.create_records(
+                                context, domain, recordset, records)
+                except Exception:
+                    with excutils.save_and_reraise_exception():
+                        self._delete_domain_from_backend(context, domain)
+
+        return domain
+
+    def _delete_domain_from_backend(self, context, domain):
+        try:
+            with wrap_backend_call():
+                self.backend.delete_domain(context, domain)
+        except Exception:
+            LOG.exception('Failed to delete domain %s from the backend' %
+                          domain['id'])
+
+    def _fail_zone_import(self, storage, context, zone_import, message):
+        """ Mark a zone import as failed """
+        try:
+            self._update_zone_import(storage, context, zone_import, {
+                'status': 'ERROR',
+                'message': message[:255],
+            })
+        except Exception:
+            LOG.exception('Failed to store the failure of zone import %s' %
+                          zone_import['id'])
+
     # RecordSet Methods
     def create_recordset(self, context, domain_id, values):
         domain = self.storage_api.get_domain(context, domain_id)
@@ -690,6 +1130,55 @@ class Service(rpc_service.Service):
 
         return recordset
 
+    def create_recordsets_bulk(self, context, domain_id, values_list):
+        """
+        Create several recordsets in a domain, in a single transaction, with
+        a single backend call.
+
+        This is all-or-nothing. If any recordset fails validation, storage
+        or the backend call, none of them are created and the error is
+        raised.
+
+        :returns: A result per item of values_list, in the same order: the
+                  recordset created from it.
+        """
+        domain = self.storage_api.get_domain(context, domain_id)
+
+        for values in values_list:
+            target = {
+                'domain_id': domain_id,
+                'domain_name': domain['name'],
+                'recordset_name': values['name'],
+                'tenant_id': domain['tenant_id'],
+            }
+
+            policy.check('create_recordset', context, target)
+
+        # Ensure the tenant has enough quota to continue
+        self._enforce_recordset_quota(context, domain)
+
+        # Ensure the recordset names and placements are valid, both against
+        # the existing recordsets and each other
+        for values in values_list:
+            self._is_valid_recordset_name(context, domain, values['name'])
+            self._is_valid_recordset_placement(context, domain,
+                                               values['name'], values['type'])
+            self._is_valid_recordset_placement_subdomain(
+                context, domain, values['name'])
+
+        self._is_valid_recordsets_placement(context, domain, values_list)
+
+        with self.storage_api.create_recordsets(
+                context, domain_id, values_list) as recordsets:
+            with wrap_backend_call():
+                self.backend.create_recordsets(context, domain, recordsets)
+
+        # Send RecordSet creation notifications
+        for recordset in recordsets:
+            self.notifier.info(context, 'dns.recordset.create', recordset)
+
+        return recordsets
+
     def get_recordset(self, context, domain_id, recordset_id):
         domain = self.storage_api.get_domain(context, domain_id)
         recordset = self.storage_api.get_recordset(context, recordset_id)
@@ -842,6 +1331,55 @@ class Service(rpc_service.Service):
 
         return record
 
+    def create_records_bulk(self, context, domain_id, recordset_id,
+                            values_list, increment_serial=True):
+        """
+        Create several records in a recordset, in a single transaction, with
+        a single backend call and serial increment.
+
+        This is all-or-nothing. If any record fails the quota check, storage
+        or the backend call, none of them are created and the error is
+        raised.
+
+        :returns: A result per item of values_list, in the same order: the
+                  record created from it.
+        """
+        domain = self.storage_api.get_domain(context, domain_id)
+        recordset = self.storage_api.get_recordset(context, recordset_id)
+
+        # Ensure the domain_id matches the recordset's domain_id
+        if domain['id'] != recordset['domain_id']:
+            raise exceptions.RecordSetNotFound()
+
+        target = {
+            'domain_id': domain_id,
+            'domain_name': domain['name'],
+            'recordset_id': recordset_id,
+            'recordset_name': recordset['name'],
+            'tenant_id': domain['tenant_id']
+        }
+
+        policy.check('create_record', context, target)
+
+        # Ensure the tenant has enough quota for all of the records
+        self._enforce_record_quota(context, domain, recordset,
+                                   len(values_list))
+
+        with self.storage_api.create_records(
+                context, domain_id, recordset_id, values_list) as records:
+            with wrap_backend_call():
+                self.backend.create_records(context, domain, recordset,
+                                            records)
+
+            if increment_serial:
+                self._increment_domain_serial(context, domain_id)
+
+        # Send Record creation notifications
+        for record in records:
+            self.notifier.info(context, 'dns.record.create', record)
+
+        return records
+
     def get_record(self, context, domain_id, recordset_id, record_id):
         domain = self.storage_api.get_domain(context, domain_id)
         recordset = self.storage_api.get_recordset(context, recordset_id)
@@ -970,23 +1508,205 @@ class Service(rpc_service.Service):
         return self.storage_api.count_records(context, criterion)
 
     # Diagnostics Methods
-    def sync_domains(self, context):
+    def sync_domains(self, context, marker=None):
+        """
+        Start synchronising every domain with the backend, which completes
+        in the background.
+
+        :param marker: ID of the domain after which to start, used to resume
+                       a sync which failed part way through.
+        :returns: The sync's progress, as get_domain_sync_status.
+        """
         policy.check('diagnostics_sync_domains', context)
 
-        domains = self.storage_api.find_domains(context)
-        results = {}
+        # NOTE: The progress is kept in storage, so every central worker
+        #       sees a sync started by any of them.
+        running = self.storage_api.find_domain_syncs(
+            context, {'status': 'RUNNING'})
+
+        if any(not self._is_domain_sync_abandoned(s) for s in running):
+            raise exceptions.DomainSyncInProgress(
+                'A sync of all domains is already running')
+
+        values = {
+            'status': 'RUNNING',
+            'total': self.storage_api.count_domains(context),
+            'synced': 0,
+            'failed': [],
+            'marker': marker,
+        }
 
-        for domain in domains:
-            criterion = {'domain_id': domain['id']}
-            records = self.storage_api.find_records(
-                context, criterion=criterion)
+        with self.storage_api.create_domain_sync(
+                context, values) as domain_sync:
+            pass
 
-            with wrap_backend_call():
-                results[domain['id']] = self.backend.sync_domain(context,
-                                                                 domain,
-                                                                 records)
+        self.tg.add_thread(self._sync_domains, context, domain_sync)
+
+        return self._format_domain_sync(domain_sync)
+
+    def get_domain_sync_status(self, context):
+        """
+        Get the progress of the last sync of all domains.
+
+        Every domain up to and including 'marker' has been synchronised, or
+        is listed in 'failed'. A sync which stopped with an ERROR can be
+        resumed by passing that marker to sync_domains.
+        """
+        policy.check('diagnostics_sync_domains', context)
+
+        domain_syncs = self.storage_api.find_domain_syncs(
+            context, limit=1, sort_key='created_at', sort_dir='desc')
+
+        if not domain_syncs:
+            raise exceptions.NotFound('No sync of all domains has been run')
+
+        return self._format_domain_sync(domain_syncs[0])
+
+    def _is_domain_sync_abandoned(self, domain_sync):
+        """
+        Whether a RUNNING sync has stopped making progress, e.g. because
+        the central worker running it went away.
+        """
+        last_progress = domain_sync['updated_at'] or \
+            domain_sync['created_at']
+
+        # NOTE: Progress is stored after every domain, each of which is
+        #       given at most sync_timeout seconds.
+        return timeutils.is_older_than(
+            last_progress, 2 * cfg.CONF['service:central'].sync_timeout)
+
+    def _format_domain_sync(self, domain_sync):
+        status = domain_sync['status']
+        message = domain_sync['message']
+
+        if status == 'RUNNING' and self._is_domain_sync_abandoned(
+                domain_sync):
+            status = 'ERROR'
+            message = 'The sync stopped making progress'
+
+        return {
+            'status': status,
+            'message': message,
+            'total': domain_sync['total'],
+            'synced': domain_sync['synced'],
+            'failed': domain_sync['failed'],
+            'marker': domain_sync['marker'],
+        }
+
+    def _update_domain_sync(self, context, domain_sync_id, values):
+        with self.storage_api.update_domain_sync(
+                context, domain_sync_id, values):
+            pass
+
+    def _sync_domains(self, context, domain_sync):
+        """
+        Synchronise every domain, a page at a time.
+
+        Only the backend calls run in the green pool. Storage, both to load
+        the records of each domain and to store the progress, is only used
+        from this thread, as the storage session can't be shared between
+        threads. Backends which can't run several syncs at once get a pool
+        of one.
+        """
+        batch_size = cfg.CONF['service:central'].iter_chunk_size
+        marker = domain_sync['marker']
+        progress = {'synced': 0, 'failed': []}
 
-        return results
+        if self.backend.concurrent_syncs:
+            concurrency = cfg.CONF['service:central'].sync_concurrency
+        else:
+            concurrency = 1
+
+        pool = greenpool.GreenPool(concurrency)
+        running = collections.deque()
+
+        def record_progress(wait):
+            # NOTE: Syncs are recorded in the order they were started, so
+            #       every domain up to the marker has finished.
+            while running and (wait or running[0][1].dead):
+                domain, thread = running.popleft()
+
+                if thread.wait():
+                    progress['synced'] += 1
+                else:
+                    progress['failed'].append(domain['id'])
+
+                self._update_domain_sync(context, domain_sync['id'], {
+                    'synced': progress['synced'],
+                    'failed': progress['failed'],
+                    'marker': domain['id'],
+                })
+
+        LOG.info('Synchronising %d domains' % domain_sync['total'])
+
+        try:
+            while True:
+                domains = self.storage_api.find_domains(
+                    context, marker=marker, limit=batch_size)
+
+                for domain in domains:
+                    records = self.storage_api.find_records(
+                        context, criterion={'domain_id': domain['id']})
+
+                    # Blocks until there is room in the pool
+                    thread = pool.spawn(self._sync_domain_in_pool, context,
+                                        domain, records)
+                    running.append((domain, thread))
+
+                    record_progress(wait=False)
+
+                record_progress(wait=True)
+
+                LOG.info('Synchronised %d of %d domains, %d failed' %
+                         (progress['synced'] + len(progress['failed']),
+                          domain_sync['total'], len(progress['failed'])))
+
+                if len(domains) < batch_size:
+                    break
+
+                marker = domains[-1]['id']
+        except Exception as e:
+            LOG.exception('Sync of all domains failed, it can be resumed '
+                          'from its last marker')
+
+            pool.waitall()
+
+            try:
+                self._update_domain_sync(context, domain_sync['id'], {
+                    'status': 'ERROR',
+                    'message': failure_message(e)[:255],
+                })
+            except Exception:
+                LOG.exception('Failed to store the sync of all domains\' '
+                              'failure')
+
+            return
+
+        self._update_domain_sync(context, domain_sync['id'],
+                                 {'status': 'COMPLETE'})
+
+    def _sync_domain_in_pool(self, context, domain, records):
+        """ Sync a single domain, returning whether it succeeded """
+        try:
+            # NOTE: Only backends which can be interrupted are given a
+            #       timeout, it could otherwise leave them half way through
+            #       a database transaction.
+            timeout = None
+
+            if self.backend.concurrent_syncs:
+                timeout = cfg.CONF['service:central'].sync_timeout
+
+            with eventlet.Timeout(timeout):
+                with wrap_backend_call():
+                    self.backend.sync_domain(context, domain, records)
+        except eventlet.Timeout:
+            LOG.warn('Timed out synchronising domain %s' % domain['id'])
+            return False
+        except Exception:
+            LOG.exception('Failed to synchronise domain %s' % domain['id'])
+            return False
+
+        return True
 
     def sync_domain(self, context, domain_id):
         domain = self.storage_api.get_domain(context, domain_id)
@@ -999,6 +1719,8 @@ class Service(rpc_service.Service):
 
         policy.check('diagnostics_sync_domain', context, target)
 
+        # NOTE: The records are loaded up front, rather than streamed, so
+        #       the backend never holds the storage session open.
         records = self.storage_api.find_records(
             context, criterion={'domain_id': domain_id})
 
@@ -1047,7 +1769,8 @@ class Service(rpc_service.Service):
             'host': cfg.CONF.host,
             'status': status,
             'backend': backend_status,
-            'storage': storage_status
+            'storage': storage_status,
+            'network_api': self.network_api.get_metrics()
         }
 
     def _determine_floatingips(self, context, fips, records=None,
@@ -1064,12 +1787,10 @@ class Service(rpc_service.Service):
         elevated_context = context.elevated()
         elevated_context.all_tenants = True
 
-        criterion = {
-            'managed': True,
-            'managed_resource_type': 'ptr:floatingip',
-        }
+        addresses = [f['address'] for f in fips.values()]
 
-        records = self.find_records(elevated_context, criterion)
+        records = self.storage_api.find_floatingip_records(elevated_context,
+                                                           addresses)
         records = dict([(r['managed_extra'], r) for r in records])
 
         invalid = []
@@ -1097,6 +1818,7 @@ class Service(rpc_service.Service):
 
         return data, invalid
 
+    @coalesce_serial_increments
     def _invalidate_floatingips(self, context, records):
         """
         Utility method to delete a list of records.
@@ -1132,7 +1854,11 @@ class Service(rpc_service.Service):
 
             # TTL population requires a present record in order to find the
             # RS or Zone
-            if value[1]:
+            if value[1] and 'ttl' in value[1]:
+                # Records found with find_floatingip_records carry their TTL
+                fip_ptr['ttl'] = value[1]['ttl']
+                fip_ptr['ptrdname'] = value[1]['data']
+            elif value[1]:
                 # We can have a recordset dict passed in
                 if (recordsets is not None and
                         value[1]['recordset_id'] in recordsets):
@@ -1157,8 +1883,9 @@ class Service(rpc_service.Service):
             fips[key] = fip_ptr
         return fips
 
-    def _list_floatingips(self, context, region=None):
-        data = self.network_api.list_floatingips(context, region=region)
+    def _list_floatingips(self, context, region=None, cached=False):
+        data = self.network_api.list_floatingips(context, region=region,
+                                                 cached=cached)
         return self._list_to_dict(data, keys=['region', 'id'])
 
     def _list_to_dict(self, data, keys=['id']):
@@ -1187,7 +1914,9 @@ class Service(rpc_service.Service):
         elevated_context = context.elevated()
         elevated_context.all_tenants = True
 
-        tenant_fips = self._list_floatingips(context)
+        # NOTE: Only listing uses cached floating ips. Getting or setting a
+        #       floating ip's PTR checks it against the current allocations.
+        tenant_fips = self._list_floatingips(context, cached=True)
 
         valid, invalid = self._determine_floatingips(
             elevated_context, tenant_fips)
@@ -1215,6 +1944,7 @@ class Service(rpc_service.Service):
         mangled = self._format_floatingips(context, valid)
         return mangled[region, floatingip_id]
 
+    @coalesce_serial_increments
     def _set_floatingip_reverse(self, context, region, floatingip_id, values):
         """
         Set the FloatingIP's PTR record based on values.
@@ -1301,6 +2031,7 @@ class Service(rpc_service.Service):
 
         return mangled[region, floatingip_id]
 
+    @coalesce_serial_increments
     def _unset_floatingip_reverse(self, context, region, floatingip_id):
         """
         Unset the FloatingIP PTR record based on the
@@ -1342,6 +2073,16 @@ class Service(rpc_service.Service):
             return self._set_floatingip_reverse(
                 context, region, floatingip_id, values)
 
+    def invalidate_floatingips(self, context, tenant_id=None,
+                               floatingip_id=None):
+        """
+        Forget the cached floating ips of a tenant, or those cached along
+        with a floating ip, after they change.
+        """
+        policy.check('invalidate_floatingips', context)
+
+        self.network_api.invalidate_floatingips(tenant_id, floatingip_id)
+
     # Blacklisted Domains
     def create_blacklist(self, context, values):
         policy.check('create_blacklist', context)
@@ -0,0 +1,106 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from dns import zone as dnszone
+from dns import rdatatype
+from dns import exception as dnsexception
+from designate import exceptions
+
+
+def parse_zonefile(zonefile):
+    """ Parses a zonefile into a dnspython zone object """
+    try:
+        return dnszone.from_text(
+            zonefile,
+            # Don't relativize, otherwise we end up with '@' record names.
+            relativize=False,
+            # Dont check origin, we allow missing NS records (missing SOA
+            # records are taken care of in get_zone_values).
+            check_origin=False)
+    except dnszone.UnknownOrigin:
+        raise exceptions.BadRequest('The $ORIGIN statement is required and'
+                                    ' must be the first statement in the'
+                                    ' zonefile.')
+    except dnsexception.SyntaxError:
+        raise exceptions.BadRequest('Malformed zonefile.')
+
+
+def get_zone_values(dnspython_zone):
+    """ Extracts the values of the zone """
+    # dnspython never builds a zone with more than one SOA, even if we give
+    # it a zonefile that contains more than one
+    soa = dnspython_zone.get_rdataset(dnspython_zone.origin, 'SOA')
+    if soa is None:
+        raise exceptions.BadRequest('An SOA record is required')
+    email = soa[0].rname.to_text().rstrip('.')
+    email = email.replace('.', '@', 1)
+    values = {
+        'name': dnspython_zone.origin.to_text(),
+        'email': email,
+        'ttl': str(soa.ttl)
+    }
+    return values
+
+
+def _record2json(record_type, rdata):
+    if record_type == 'MX':
+        return {
+            'data': rdata.exchange.to_text(),
+            'priority': str(rdata.preference)
+        }
+    elif record_type == 'SRV':
+        return {
+            'data': '%s %s %s' % (str(rdata.weight), str(rdata.port),
+                                  rdata.target.to_text()),
+            'priority': str(rdata.priority)
+        }
+    else:
+        return {
+            'data': rdata.to_text()
+        }
+
+
+def get_recordsets_values(dnspython_zone):
+    """
+    Extracts the recordsets, as a list of (recordset values, list of record
+    values) pairs
+    """
+    recordsets = []
+
+    for record_name in dnspython_zone.nodes.keys():
+        for rdataset in dnspython_zone.nodes[record_name]:
+            record_type = rdatatype.to_text(rdataset.rdtype)
+
+            if record_type == 'SOA':
+                continue
+
+            values = {
+                'name': record_name.to_text(),
+                'type': record_type,
+            }
+
+            records = []
+
+            for rdata in rdataset:
+                if (record_type == 'NS'
+                        and record_name == dnspython_zone.origin):
+                    # Don't create NS records for the domain, they've been
+                    # taken care of as servers
+                    pass
+                else:
+                    # Everything else, including delegation NS, gets created
+                    records.append(_record2json(record_type, rdata))
+
+            recordsets.append((values, records))
+
+    return recordsets
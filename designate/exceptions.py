@@ -38,6 +38,10 @@ class NSD4SlaveBackendError(Backend):
     pass
 
 
+class RNDCError(Backend):
+    pass
+
+
 class NotImplemented(Base, NotImplementedError):
     pass
 
@@ -164,6 +168,11 @@ class Duplicate(Base):
     error_type = 'duplicate'
 
 
+class DomainSyncInProgress(Base):
+    error_code = 409
+    error_type = 'domain_sync_in_progress'
+
+
 class DuplicateQuota(Duplicate):
     error_type = 'duplicate_quota'
 
@@ -233,6 +242,14 @@ class RecordNotFound(NotFound):
     error_type = 'record_not_found'
 
 
+class ZoneImportNotFound(NotFound):
+    error_type = 'zone_import_not_found'
+
+
+class DomainSyncNotFound(NotFound):
+    error_type = 'domain_sync_not_found'
+
+
 class LastServerDeleteNotAllowed(BadRequest):
     error_type = 'last_server_delete_not_allowed'
 
@@ -78,10 +78,14 @@ class NetworkAPI(DriverPlugin):
             raise exceptions.NetworkEndpointNotFound
         return urls
 
-    def list_floatingips(self, context, region=None):
+    def list_floatingips(self, context, region=None, cached=False):
         """
         List Floating IPs.
 
+        Implementations may cache floating ips, in which case they're only
+        returned from the cache when cached is True. Callers acting on a
+        floating ip, rather than listing them, should leave it False.
+
         Should return something like:
 
         [{
@@ -92,6 +96,19 @@ class NetworkAPI(DriverPlugin):
         """
         raise NotImplementedError
 
+    def invalidate_floatingips(self, tenant_id=None, floatingip_id=None):
+        """
+        Forget any cached floating ips of a tenant, or cached along with a
+        floating ip.
+        """
+
+    def get_metrics(self):
+        """
+        Get statistics about the calls made to the network service, by
+        region.
+        """
+        return {}
+
     @staticmethod
     def address_zone(address):
         """
@@ -69,7 +69,7 @@ def reset_floatingips():
 class FakeNetworkAPI(NetworkAPI):
     __plugin_name__ = 'fake'
 
-    def list_floatingips(self, context, region=None):
+    def list_floatingips(self, context, region=None, cached=False):
         if context.is_admin:
             data = []
             for tenant_id, allocated in ALLOCATIONS.items():
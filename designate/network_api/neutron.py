@@ -17,6 +17,10 @@
 #
 # Copied partially from nova
 
+import contextlib
+import time
+
+from eventlet import greenpool
 from neutronclient.v2_0 import client as clientv20
 from neutronclient.common import exceptions as neutron_exceptions
 from oslo.config import cfg
@@ -24,7 +28,6 @@ from oslo.config import cfg
 from designate import exceptions
 
 from designate.openstack.common import log as logging
-from designate.openstack.common import threadgroup
 from designate.network_api.base import NetworkAPI
 
 
@@ -60,10 +63,17 @@ neutron_opts = [
     cfg.StrOpt('ca_certificates_file',
                help='Location of ca certificates file to use for '
                     'neutron client requests.'),
+    cfg.IntOpt('cache_ttl',
+               default=30,
+               help='Seconds a tenant\'s floating ips are cached for when '
+                    'listing their PTR records, 0 disables caching'),
 ]
 
 cfg.CONF.register_opts(neutron_opts, group='network_api:neutron')
 
+# Most (endpoint, token) pairs idle clients are kept for at once
+MAX_IDLE_CLIENT_KEYS = 100
+
 
 def get_client(context, endpoint):
     params = {
@@ -91,10 +101,35 @@ class NeutronNetworkAPI(NetworkAPI):
     """
     __plugin_name__ = 'neutron'
 
-    def list_floatingips(self, context, region=None):
+    def __init__(self):
+        super(NeutronNetworkAPI, self).__init__()
+
+        self._pool = greenpool.GreenPool()
+
+        # Idle clients by endpoint and token, reused so their HTTP
+        # connections are kept alive between requests with the same token
+        self._idle_clients = {}
+
+        # Floating ips by (tenant id, region), along with when they expire
+        self._cache = {}
+
+        # Latency of the calls made to each region's endpoint
+        self._metrics = {}
+
+    def list_floatingips(self, context, region=None, cached=False):
         """
         Get floating ips based on the current context from Neutron
         """
+        cache_key = (context.tenant_id, region)
+
+        if cached:
+            entry = self._cache.get(cache_key)
+
+            if entry is not None and entry[0] > time.time():
+                LOG.debug("Returning cached FloatingIPs for %s",
+                          context.tenant_id)
+                return list(entry[1])
+
         endpoints = self._endpoints(
             service_catalog=context.service_catalog,
             service_type='network',
@@ -102,17 +137,21 @@ class NeutronNetworkAPI(NetworkAPI):
             config_section='network_api:neutron',
             region=region)
 
-        tg = threadgroup.ThreadGroup()
-
         failed = []
         data = []
 
-        def _call(endpoint, region, *args, **kw):
-            client = get_client(context, endpoint=endpoint)
+        def _call(endpoint_region):
+            endpoint, region = endpoint_region
             LOG.debug("Attempting to fetch FloatingIPs from %s @ %s",
                       endpoint, region)
+            start = time.time()
+            succeeded = False
+
             try:
-                fips = client.list_floatingips(*args, **kw)
+                with self._client(context, endpoint) as client:
+                    fips = client.list_floatingips(
+                        tenant_id=context.tenant_id)
+                succeeded = True
             except neutron_exceptions.Unauthorized as e:
                 # NOTE: 401 might be that the user doesn't have neutron
                 # activated in a particular region, we'll just log the failure
@@ -126,6 +165,8 @@ class NeutronNetworkAPI(NetworkAPI):
                 LOG.exception(e)
                 failed.append((e, endpoint, region))
                 return
+            finally:
+                self._record_call(region, time.time() - start, succeeded)
 
             for fip in fips['floatingips']:
                 data.append({
@@ -137,14 +178,87 @@ class NeutronNetworkAPI(NetworkAPI):
             LOG.debug("Added %i FloatingIPs from %s @ %s", len(data),
                       endpoint, region)
 
-        for endpoint, region in endpoints:
-            tg.add_thread(_call, endpoint, region,
-                          tenant_id=context.tenant_id)
-        tg.wait()
+        # Query every region at once
+        for _ in self._pool.imap(_call, endpoints):
+            pass
 
-        # NOTE: Sadly tg code doesn't give us a good way to handle failures.
         if failed:
             msg = 'Failed retrieving FLoatingIPs from Neutron in %s' % \
                 ", ".join(['%s - %s' % (i[1], i[2]) for i in failed])
             raise exceptions.NeutronCommunicationFailure(msg)
+
+        cache_ttl = CONF['network_api:neutron'].cache_ttl
+
+        if cache_ttl > 0:
+            now = time.time()
+
+            # Drop expired entries, so tenants which have gone quiet don't
+            # linger in the cache
+            self._cache = dict([(k, v) for k, v in self._cache.items()
+                                if v[0] > now])
+            self._cache[cache_key] = (now + cache_ttl, list(data))
+
         return data
+
+    def invalidate_floatingips(self, tenant_id=None, floatingip_id=None):
+        for key, (_, data) in self._cache.items():
+            if key[0] == tenant_id or \
+                    any(f['id'] == floatingip_id for f in data):
+                del self._cache[key]
+
+    def get_metrics(self):
+        metrics = {}
+
+        for region, m in self._metrics.items():
+            metrics[region] = {
+                'calls': m['calls'],
+                'failures': m['failures'],
+                'average_time': m['total_time'] / m['calls'],
+                'max_time': m['max_time'],
+            }
+
+        return metrics
+
+    @contextlib.contextmanager
+    def _client(self, context, endpoint):
+        """
+        Borrow an idle client for the endpoint and the request's token, or
+        create one. Clients are only returned to the pool when they're used
+        successfully.
+        """
+        key = (endpoint, context.auth_token)
+        idle = self._idle_clients.get(key)
+
+        if idle:
+            client = idle.pop()
+        else:
+            client = get_client(context, endpoint=endpoint)
+
+        yield client
+
+        if key not in self._idle_clients:
+            # NOTE: Tokens come and go, don't keep clients for every token
+            #       ever seen.
+            while len(self._idle_clients) >= MAX_IDLE_CLIENT_KEYS:
+                self._idle_clients.popitem()
+
+            self._idle_clients[key] = []
+
+        self._idle_clients[key].append(client)
+
+    def _record_call(self, region, duration, succeeded):
+        metrics = self._metrics.setdefault(region, {
+            'calls': 0,
+            'failures': 0,
+            'total_time': 0.0,
+            'max_time': 0.0,
+        })
+
+        metrics['calls'] += 1
+        metrics['total_time'] += duration
+        metrics['max_time'] = max(metrics['max_time'], duration)
+
+        if not succeeded:
+            metrics['failures'] += 1
+
+        LOG.debug("Neutron call to %s took %.3fs", region, duration)
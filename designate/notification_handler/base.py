@@ -119,6 +119,11 @@ class BaseAddressHandler(NotificationHandler):
 
         context = DesignateContext.get_admin_context(all_tenants=True)
 
+        # Group the records by recordset, so each recordset's records are
+        # created with a single central call
+        recordsets = []
+        records_values = {}
+
         for addr in addresses:
             event_data = data.copy()
             event_data.update(get_ip_data(addr))
@@ -142,10 +147,19 @@ class BaseAddressHandler(NotificationHandler):
                     'managed_resource_type': resource_type,
                     'managed_resource_id': resource_id})
 
-            LOG.debug('Creating record in %s / %s with values %r',
-                      domain['id'], recordset['id'], record_values)
-            central_api.create_record(context, domain['id'], recordset['id'],
-                                      record_values)
+            if recordset['id'] not in records_values:
+                recordsets.append(recordset)
+                records_values[recordset['id']] = []
+
+            records_values[recordset['id']].append(record_values)
+
+        for recordset in recordsets:
+            LOG.debug('Creating records in %s / %s with values %r',
+                      domain['id'], recordset['id'],
+                      records_values[recordset['id']])
+            central_api.create_records_bulk(context, domain['id'],
+                                            recordset['id'],
+                                            records_values[recordset['id']])
 
     def _delete(self, managed=True, resource_id=None, resource_type='instance',
                 criterion={}):
@@ -15,9 +15,12 @@
 # under the License.
 from oslo.config import cfg
 from designate.openstack.common import log as logging
+from designate.central import rpcapi as central_rpcapi
+from designate.context import DesignateContext
 from designate.notification_handler.base import BaseAddressHandler
 
 LOG = logging.getLogger(__name__)
+central_api = central_rpcapi.CentralAPI()
 
 cfg.CONF.register_group(cfg.OptGroup(
     name='handler:neutron_floatingip',
@@ -62,9 +65,14 @@ class NeutronFloatingHandler(BaseAddressHandler):
             raise ValueError(msg)
 
         if event_type.startswith('floatingip.delete'):
+            self._invalidate_floatingips(payload['floatingip_id'])
             self._delete(resource_id=payload['floatingip_id'],
                          resource_type='floatingip')
         elif event_type.startswith('floatingip.update'):
+            self._invalidate_floatingips(
+                payload['floatingip']['id'],
+                payload['floatingip'].get('tenant_id'))
+
             if payload['floatingip']['fixed_ip_address']:
                 address = {
                     'version': 4,
@@ -75,3 +83,10 @@ class NeutronFloatingHandler(BaseAddressHandler):
             elif not payload['floatingip']['fixed_ip_address']:
                 self._delete(resource_id=payload['floatingip']['id'],
                              resource_type='floatingip')
+
+    def _invalidate_floatingips(self, floatingip_id, tenant_id=None):
+        """ Drop central's cached floating ips made stale by a change """
+        context = DesignateContext.get_admin_context(all_tenants=True)
+
+        central_api.invalidate_floatingips(context, tenant_id=tenant_id,
+                                           floatingip_id=floatingip_id)
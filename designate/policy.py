@@ -13,6 +13,8 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import re
+
 from oslo.config import cfg
 from designate.openstack.common import log as logging
 from designate.openstack.common import policy
@@ -24,8 +26,167 @@ LOG = logging.getLogger(__name__)
 cfg.CONF.register_opts([
     cfg.StrOpt('policy-file', default='policy.json'),
     cfg.StrOpt('policy-default-rule', default='default'),
+    cfg.IntOpt('policy-cache-size', default=1024,
+               help='Maximum number of policy decisions to cache, 0 '
+                    'disables the cache'),
+    cfg.IntOpt('policy-audit-sample-rate', default=1,
+               help='Audit log 1 in every N successful policy checks, '
+                    'failed checks are always logged'),
 ])
 
+# Matches the target substitutions a check, e.g. "tenant:%(tenant_id)s",
+# formats its match with
+TARGET_KEY_RE = re.compile(r'%\((\w+)\)s')
+
+# Stands in for credentials or target fields which are absent
+_MISSING = object()
+
+
+_cache = utils.LRUCache(0)
+_cache_rules = None
+_rule_fields = {}
+_audit_count = 0
+
+
+def _flush_cache():
+    global _cache, _cache_rules
+
+    _cache = utils.LRUCache(cfg.CONF.policy_cache_size)
+    _cache_rules = policy._rules
+    _rule_fields.clear()
+
+
+def _collect_fields(check, cred_kinds, target_keys, seen):
+    """
+    Gather the credentials and target fields a check tree depends on.
+
+    :returns: False if the result may depend on anything else, e.g. an http
+              check, in which case it can not be cached.
+    """
+    if isinstance(check, (policy.TrueCheck, policy.FalseCheck)):
+        return True
+
+    elif isinstance(check, policy.NotCheck):
+        return _collect_fields(check.rule, cred_kinds, target_keys, seen)
+
+    elif isinstance(check, (policy.AndCheck, policy.OrCheck)):
+        return all(_collect_fields(c, cred_kinds, target_keys, seen)
+                   for c in check.rules)
+
+    elif isinstance(check, policy.RuleCheck):
+        if check.match in seen:
+            return True
+
+        seen.add(check.match)
+
+        try:
+            rule = policy._rules[check.match]
+        except KeyError:
+            # Unknown rules always fail closed
+            return True
+
+        return _collect_fields(rule, cred_kinds, target_keys, seen)
+
+    elif isinstance(check, (policy.RoleCheck, policy.GenericCheck)):
+        # Any substitution other than a named %(key)s one may format the
+        # whole target into the match.
+        if '%' in TARGET_KEY_RE.sub('', check.match):
+            return False
+
+        if isinstance(check, policy.RoleCheck):
+            cred_kinds.add('roles')
+        else:
+            cred_kinds.add(check.kind)
+
+        target_keys.update(TARGET_KEY_RE.findall(check.match))
+        return True
+
+    return False
+
+
+def _get_rule_fields(rule):
+    """
+    Return the sorted credentials and target fields a rule depends on, or
+    None when its decisions can not be cached.
+    """
+    if rule in _rule_fields:
+        return _rule_fields[rule]
+
+    cred_kinds, target_keys = set(), set()
+
+    if not policy._rules:
+        fields = ((), ())
+    else:
+        try:
+            check = policy._rules[rule]
+        except KeyError:
+            check = policy.FalseCheck()
+
+        if _collect_fields(check, cred_kinds, target_keys, set([rule])):
+            fields = (tuple(sorted(cred_kinds)), tuple(sorted(target_keys)))
+        else:
+            fields = None
+
+    _rule_fields[rule] = fields
+
+    return fields
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    elif isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+
+    return value
+
+
+def _cache_key(rule, target, ctxt):
+    fields = _get_rule_fields(rule)
+
+    if fields is None:
+        return None
+
+    cred_kinds, target_keys = fields
+
+    # NOTE: The credentials are read from the context's attributes, rather
+    #       than from its dict, which is only built when the decision isn't
+    #       cached.
+    try:
+        creds = tuple(_freeze(getattr(ctxt, k)) for k in cred_kinds)
+    except AttributeError:
+        # Only found in the context's dict, e.g. user_identity
+        return None
+
+    key = (rule, creds,
+           tuple(_freeze(target.get(k, _MISSING)) for k in target_keys))
+
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+def _check(rule, target, ctxt):
+    if policy._rules is not _cache_rules:
+        # The rules were replaced without init_policy, e.g. by policy.reset
+        _flush_cache()
+
+    key = _cache_key(rule, target, ctxt)
+
+    if key is None:
+        return policy.check(rule, target, ctxt.to_dict())
+
+    result = _cache.get(key, _MISSING)
+
+    if result is _MISSING:
+        result = policy.check(rule, target, ctxt.to_dict())
+        _cache.set(key, result)
+
+    return result
+
 
 def init_policy():
     LOG.info('Initializing Policy')
@@ -44,24 +205,31 @@ def init_policy():
     rules = policy.Rules.load_json(policy_json, cfg.CONF.policy_default_rule)
 
     policy.set_rules(rules)
+    _flush_cache()
 
 
 def check(rule, ctxt, target={}, exc=exceptions.Forbidden):
-    creds = ctxt.to_dict()
+    global _audit_count
 
     try:
-        result = policy.check(rule, target, creds, exc)
+        result = _check(rule, target, ctxt)
     except Exception:
         result = False
         raise
-    else:
-        return result
     finally:
         extra = {'policy': {'rule': rule, 'target': target}}
 
-        if result:
-            LOG.audit("Policy check succeeded for rule '%s' on target %s",
-                      rule, repr(target), extra=extra)
-        else:
+        if not result:
             LOG.audit("Policy check failed for rule '%s' on target: %s",
                       rule, repr(target), extra=extra)
+        else:
+            _audit_count += 1
+
+            if _audit_count % max(cfg.CONF.policy_audit_sample_rate, 1) == 0:
+                LOG.audit("Policy check succeeded for rule '%s' on target %s",
+                          rule, repr(target), extra=extra)
+
+    if exc and result is False:
+        raise exc()
+
+    return result
@@ -21,6 +21,9 @@ LOG = logging.getLogger(__name__)
 
 cfg.CONF.register_opts([
     cfg.StrOpt('quota-driver', default='storage', help='Quota driver to use'),
+    cfg.IntOpt('quota-cache-size', default=1024,
+               help='Maximum number of tenants whose quotas are cached, 0 '
+                    'disables the cache'),
 
     cfg.IntOpt('quota-domains', default=10,
                help='Number of domains allowed per tenant'),
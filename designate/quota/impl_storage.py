@@ -13,7 +13,9 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from oslo.config import cfg
 from designate import exceptions
+from designate import utils
 from designate.openstack.common import log as logging
 from designate.quota.base import Quota
 from designate.storage import api as sapi
@@ -32,12 +34,37 @@ class StorageQuota(Quota):
 
         self.storage_api = storage_api
 
+        # Quotas of the most recently used tenants, along with the storage
+        # cache version they were loaded from
+        self._quotas = utils.LRUCache(cfg.CONF.quota_cache_size)
+        self._quotas_version = None
+
     def _get_quotas(self, context, tenant_id):
-        quotas = self.storage_api.find_quotas(context, {
-            'tenant_id': tenant_id,
-        })
+        """
+        Get a tenant's quotas, which are cached until the quotas have been
+        changed, by this or any other process.
+        """
+        version = self.storage_api.get_cache_version(context, 'quotas')
+
+        if version != self._quotas_version:
+            self._quotas.clear()
+            self._quotas_version = version
+
+        quotas = self._quotas.get(tenant_id)
+
+        if quotas is None:
+            context = context.deepcopy()
+            context.all_tenants = True
+
+            quotas = dict(
+                (q['resource'], q['hard_limit'])
+                for q in self.storage_api.find_quotas(context, {
+                    'tenant_id': tenant_id,
+                }))
+
+            self._quotas.set(tenant_id, quotas)
 
-        return dict((q['resource'], q['hard_limit']) for q in quotas)
+        return dict(quotas)
 
     def get_quota(self, context, tenant_id, resource):
         context = context.deepcopy()
@@ -15,7 +15,7 @@
 # under the License.
 from sqlalchemy import Column, DateTime
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import object_mapper
+from sqlalchemy.orm import class_mapper
 from sqlalchemy.types import CHAR
 from designate.openstack.common import timeutils
 from designate import exceptions
@@ -56,19 +56,25 @@ class Base(object):
     def __getitem__(self, key):
         return getattr(self, key)
 
+    @classmethod
+    def _column_names(cls):
+        # NOTE: Resolving the mapper's columns is comparatively expensive, and
+        #       storage converts every row it returns into a dict, so the
+        #       names are worked out once per mapped class.
+        if '_column_names_cache' not in cls.__dict__:
+            cls._column_names_cache = tuple(class_mapper(cls).columns.keys())
+
+        return cls._column_names_cache
+
     def __iter__(self):
-        columns = dict(object_mapper(self).columns).keys()
+        columns = self._column_names()
         # NOTE(russellb): Allow models to specify other keys that can be looked
         # up, beyond the actual db columns.  An example would be the 'name'
         # property for an Instance.
         if hasattr(self, '_extra_keys'):
-            columns.extend(self._extra_keys())
-        self._i = iter(columns)
-        return self
+            columns = columns + tuple(self._extra_keys())
 
-    def next(self):
-        n = self._i.next()
-        return n, getattr(self, n)
+        return ((n, getattr(self, n)) for n in columns)
 
     def update(self, values):
         """ Make the model object behave like a dict """
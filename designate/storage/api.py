@@ -447,6 +447,15 @@ class StorageAPI(object):
         """
         return self.storage.find_domain(context, criterion)
 
+    def find_closest_domain(self, context, names):
+        """
+        Find the Domain with the longest name out of a list of names.
+
+        :param context: RPC Context.
+        :param names: Candidate Domain names.
+        """
+        return self.storage.find_closest_domain(context, names)
+
     @contextlib.contextmanager
     def update_domain(self, context, domain_id, values):
         """
@@ -516,6 +525,28 @@ class StorageAPI(object):
         else:
             self.storage.commit()
 
+    @contextlib.contextmanager
+    def create_recordsets(self, context, domain_id, values_list):
+        """
+        Create several recordsets on a given Domain ID, in a single
+        transaction
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to create the recordsets in.
+        :param values_list: List of Values to create the new RecordSets from.
+        """
+        self.storage.begin()
+
+        try:
+            recordsets = [self.storage.create_recordset(
+                context, domain_id, values) for values in values_list]
+            yield recordsets
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.storage.rollback()
+        else:
+            self.storage.commit()
+
     def get_recordset(self, context, recordset_id):
         """
         Get a recordset via ID
@@ -536,6 +567,16 @@ class StorageAPI(object):
         return self.storage.find_recordsets(
             context, criterion, marker, limit, sort_key, sort_dir)
 
+    def iter_recordsets(self, context, criterion=None, chunk_size=1000):
+        """
+        Iterate over RecordSets, fetching them from the database in chunks.
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        :param chunk_size: Number of RecordSets to fetch at a time.
+        """
+        return self.storage.iter_recordsets(context, criterion, chunk_size)
+
     def find_recordset(self, context, criterion=None):
         """
         Find a single RecordSet.
@@ -615,6 +656,29 @@ class StorageAPI(object):
         else:
             self.storage.commit()
 
+    @contextlib.contextmanager
+    def create_records(self, context, domain_id, recordset_id, values_list):
+        """
+        Create several records on a given Domain ID, in a single transaction
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to create the records in.
+        :param recordset_id: RecordSet ID to create the records in.
+        :param values_list: List of Values to create the new Records from.
+        """
+        self.storage.begin()
+
+        try:
+            records = [self.storage.create_record(
+                context, domain_id, recordset_id, values)
+                for values in values_list]
+            yield records
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.storage.rollback()
+        else:
+            self.storage.commit()
+
     def get_record(self, context, record_id):
         """
         Get a record via ID
@@ -635,6 +699,16 @@ class StorageAPI(object):
         return self.storage.find_records(
             context, criterion, marker, limit, sort_key, sort_dir)
 
+    def iter_records(self, context, criterion=None, chunk_size=1000):
+        """
+        Iterate over Records, fetching them from the database in chunks.
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        :param chunk_size: Number of Records to fetch at a time.
+        """
+        return self.storage.iter_records(context, criterion, chunk_size)
+
     def find_record(self, context, criterion=None):
         """
         Find a single Record.
@@ -691,6 +765,39 @@ class StorageAPI(object):
         """
         return self.storage.count_records(context, criterion)
 
+    def count_domain_records(self, context, domain_id):
+        """
+        Count the records in a domain, from its record counter rather than
+        the records table.
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to count the records of.
+        """
+        return self.storage.count_domain_records(context, domain_id)
+
+    def get_domain_contents(self, context, domain_id, marker=None,
+                            limit=None):
+        """
+        Get every record in a domain, joined with its recordset.
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to fetch the contents of.
+        :param marker: Record ID after which the requested page will start
+        :param limit: Integer limit of records in the page
+        """
+        return self.storage.get_domain_contents(context, domain_id, marker,
+                                                limit)
+
+    def find_floatingip_records(self, context, addresses):
+        """
+        Find the managed PTR records of floating IPs, by address, each with
+        the TTL it's served with.
+
+        :param context: RPC Context.
+        :param addresses: Floating IP addresses to find the records of.
+        """
+        return self.storage.find_floatingip_records(context, addresses)
+
     @contextlib.contextmanager
     def create_blacklist(self, context, values):
         """
@@ -780,6 +887,142 @@ class StorageAPI(object):
         else:
             self.storage.commit()
 
+    @contextlib.contextmanager
+    def create_zone_import(self, context, values):
+        """
+        Create a Zone Import.
+
+        :param context: RPC Context.
+        :param values: Values to create the new Zone Import from.
+        """
+        self.storage.begin()
+
+        try:
+            zone_import = self.storage.create_zone_import(context, values)
+            yield zone_import
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.storage.rollback()
+        else:
+            self.storage.commit()
+
+    def get_zone_import(self, context, zone_import_id):
+        """
+        Get a Zone Import via its ID.
+
+        :param context: RPC Context.
+        :param zone_import_id: ID of the Zone Import.
+        """
+        return self.storage.get_zone_import(context, zone_import_id)
+
+    def find_zone_imports(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        """
+        Find Zone Imports
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        """
+        return self.storage.find_zone_imports(
+            context, criterion, marker, limit, sort_key, sort_dir)
+
+    @contextlib.contextmanager
+    def update_zone_import(self, context, zone_import_id, values):
+        """
+        Update a Zone Import via ID.
+
+        :param context: RPC Context.
+        :param zone_import_id: Zone Import ID to update.
+        :param values: Values to update the Zone Import from.
+        """
+        self.storage.begin()
+
+        try:
+            zone_import = self.storage.update_zone_import(
+                context, zone_import_id, values)
+            yield zone_import
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.storage.rollback()
+        else:
+            self.storage.commit()
+
+    @contextlib.contextmanager
+    def create_domain_sync(self, context, values):
+        """
+        Create a Domain Sync.
+
+        :param context: RPC Context.
+        :param values: Values to create the new Domain Sync from.
+        """
+        self.storage.begin()
+
+        try:
+            domain_sync = self.storage.create_domain_sync(context, values)
+            yield domain_sync
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.storage.rollback()
+        else:
+            self.storage.commit()
+
+    def find_domain_syncs(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        """
+        Find Domain Syncs
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        """
+        return self.storage.find_domain_syncs(
+            context, criterion, marker, limit, sort_key, sort_dir)
+
+    @contextlib.contextmanager
+    def update_domain_sync(self, context, domain_sync_id, values):
+        """
+        Update a Domain Sync via ID.
+
+        :param context: RPC Context.
+        :param domain_sync_id: Domain Sync ID to update.
+        :param values: Values to update the Domain Sync from.
+        """
+        self.storage.begin()
+
+        try:
+            domain_sync = self.storage.update_domain_sync(
+                context, domain_sync_id, values)
+            yield domain_sync
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.storage.rollback()
+        else:
+            self.storage.commit()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Group the storage calls made within, including those made through
+        the other context managers, into a single transaction.
+        """
+        self.storage.begin()
+
+        try:
+            yield
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.storage.rollback()
+        else:
+            self.storage.commit()
+
+    def get_cache_version(self, context, name):
+        """
+        Get the version of a cached set of resources
+
+        :param context: RPC Context.
+        :param name: Name of the cached set, e.g. 'blacklists'.
+        """
+        return self.storage.get_cache_version(context, name)
+
     def ping(self, context):
         """ Ping the Storage connection """
         return self.storage.ping(context)
@@ -327,6 +327,16 @@ class Storage(DriverPlugin):
         :param criterion: Criteria to filter by.
         """
 
+    @abc.abstractmethod
+    def find_closest_domain(self, context, names):
+        """
+        Find the Domain with the longest name out of a list of names, in a
+        single query.
+
+        :param context: RPC Context.
+        :param names: Candidate Domain names, e.g. all parents of a name.
+        """
+
     @abc.abstractmethod
     def update_domain(self, context, domain_id, values):
         """
@@ -391,6 +401,16 @@ class Storage(DriverPlugin):
         :param sort_dir: Direction to sort after using sort_key.
         """
 
+    @abc.abstractmethod
+    def iter_recordsets(self, context, criterion=None, chunk_size=1000):
+        """
+        Iterate over RecordSets, fetching them from the database in chunks.
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        :param chunk_size: Number of RecordSets to fetch at a time.
+        """
+
     @abc.abstractmethod
     def find_recordset(self, context, criterion):
         """
@@ -463,6 +483,16 @@ class Storage(DriverPlugin):
         :param sort_dir: Direction to sort after using sort_key.
         """
 
+    @abc.abstractmethod
+    def iter_records(self, context, criterion=None, chunk_size=1000):
+        """
+        Iterate over Records, fetching them from the database in chunks.
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        :param chunk_size: Number of Records to fetch at a time.
+        """
+
     @abc.abstractmethod
     def find_record(self, context, criterion):
         """
@@ -499,6 +529,38 @@ class Storage(DriverPlugin):
         :param criterion: Criteria to filter by.
         """
 
+    @abc.abstractmethod
+    def count_domain_records(self, context, domain_id):
+        """
+        Count the records in a domain, from its record counter rather than
+        the records table.
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to count the records of.
+        """
+
+    @abc.abstractmethod
+    def get_domain_contents(self, context, domain_id, marker=None,
+                            limit=None):
+        """
+        Get every record in a domain, joined with its recordset.
+
+        :param context: RPC Context.
+        :param domain_id: Domain ID to fetch the contents of.
+        :param marker: Record ID after which the requested page will start
+        :param limit: Integer limit of records in the page
+        """
+
+    @abc.abstractmethod
+    def find_floatingip_records(self, context, addresses):
+        """
+        Find the managed PTR records of floating IPs, by address, each with
+        the TTL it's served with.
+
+        :param context: RPC Context.
+        :param addresses: Floating IP addresses to find the records of.
+        """
+
     @abc.abstractmethod
     def create_blacklist(self, context, values):
         """
@@ -561,6 +623,95 @@ class Storage(DriverPlugin):
         :param blacklist_id: Delete a Blacklist via ID
         """
 
+    @abc.abstractmethod
+    def create_zone_import(self, context, values):
+        """
+        Create a Zone Import.
+
+        :param context: RPC Context.
+        :param values: Values to create the new Zone Import from.
+        """
+
+    @abc.abstractmethod
+    def get_zone_import(self, context, zone_import_id):
+        """
+        Get a Zone Import via ID.
+
+        :param context: RPC Context.
+        :param zone_import_id: Zone Import ID to get.
+        """
+
+    @abc.abstractmethod
+    def find_zone_imports(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        """
+        Find Zone Imports
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        :param marker: Resource ID from which after the requested page will
+                       start after
+        :param limit: Integer limit of objects of the page size after the
+                      marker
+        :param sort_key: Key from which to sort after.
+        :param sort_dir: Direction to sort after using sort_key.
+        """
+
+    @abc.abstractmethod
+    def update_zone_import(self, context, zone_import_id, values):
+        """
+        Update a Zone Import via ID
+
+        :param context: RPC Context.
+        :param zone_import_id: Zone Import ID to update.
+        :param values: Values to update the Zone Import from
+        """
+
+    @abc.abstractmethod
+    def create_domain_sync(self, context, values):
+        """
+        Create a Domain Sync, the progress of a sync of all domains.
+
+        :param context: RPC Context.
+        :param values: Values to create the new Domain Sync from.
+        """
+
+    @abc.abstractmethod
+    def find_domain_syncs(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        """
+        Find Domain Syncs
+
+        :param context: RPC Context.
+        :param criterion: Criteria to filter by.
+        :param marker: Resource ID from which after the requested page will
+                       start after
+        :param limit: Integer limit of objects of the page size after the
+                      marker
+        :param sort_key: Key from which to sort after.
+        :param sort_dir: Direction to sort after using sort_key.
+        """
+
+    @abc.abstractmethod
+    def update_domain_sync(self, context, domain_sync_id, values):
+        """
+        Update a Domain Sync via ID
+
+        :param context: RPC Context.
+        :param domain_sync_id: Domain Sync ID to update.
+        :param values: Values to update the Domain Sync from
+        """
+
+    @abc.abstractmethod
+    def get_cache_version(self, context, name):
+        """
+        Get the version of a set of resources cached by services, which is
+        bumped on every change made to them. 0 if nothing has been changed.
+
+        :param context: RPC Context.
+        :param name: Name of the cached set, e.g. 'blacklists'.
+        """
+
     def ping(self, context):
         """ Ping the Storage connection """
         return {
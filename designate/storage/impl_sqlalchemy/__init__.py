@@ -16,12 +16,15 @@
 import time
 from sqlalchemy.orm import exc
 from sqlalchemy import exc as sqlalchemy_exc
-from sqlalchemy import distinct, func
+from sqlalchemy import and_, or_, distinct, func, DateTime
 from oslo.config import cfg
+from designate.openstack.common import jsonutils
 from designate.openstack.common import log as logging
+from designate.openstack.common import timeutils
 from designate.openstack.common.db.sqlalchemy.utils import paginate_query
 from designate.openstack.common.db.sqlalchemy.utils import InvalidSortKey
 from designate import exceptions
+from designate import utils
 from designate.storage import base
 from designate.storage.impl_sqlalchemy import models
 from designate.sqlalchemy.models import SoftDeleteMixin
@@ -39,6 +42,10 @@ cfg.CONF.register_group(cfg.OptGroup(
 cfg.CONF.register_opts(SQLOPTS, group='storage:sqlalchemy')
 
 
+class _Cursor(object):
+    """ Holds the sort values decoded from a keyset pagination cursor """
+
+
 class SQLAlchemyStorage(base.Storage):
     """ SQLAlchemy connection """
     __plugin_name__ = 'sqlalchemy'
@@ -117,25 +124,38 @@ class SQLAlchemyStorage(base.Storage):
             except (exc.NoResultFound, exc.MultipleResultsFound):
                 raise exceptions.NotFound()
         else:
+            sort_key = sort_key or 'created_at'
+            sort_dir = sort_dir or 'asc'
+            sort_keys = [sort_key, 'id', 'created_at']
+
             # If marker is not none and basestring we query it.
             # Otherwise, return all matching records
             if marker is not None:
-                try:
-                    marker = self._find(model, context, {'id': marker},
-                                        one=True)
-                except exceptions.NotFound:
-                    raise exceptions.MarkerNotFound(
-                        'Marker %s could not be found' % marker)
-                # Malformed UUIDs return StatementError
-                except sqlalchemy_exc.StatementError as statement_error:
-                    raise exceptions.InvalidMarker(statement_error.message)
-            sort_key = sort_key or 'created_at'
-            sort_dir = sort_dir or 'asc'
+                cursor = self._decode_cursor(model, marker, sort_key,
+                                             sort_dir)
+
+                if cursor is not None:
+                    # NOTE: Keyset pagination, the cursor carries the sort
+                    #       values of the last item on the previous page, so
+                    #       there is no need to fetch the marker row first.
+                    marker = cursor
+                    sort_keys = [sort_key] if sort_key == 'id' \
+                        else [sort_key, 'id']
+                else:
+                    try:
+                        marker = self._find(model, context, {'id': marker},
+                                            one=True)
+                    except exceptions.NotFound:
+                        raise exceptions.MarkerNotFound(
+                            'Marker %s could not be found' % marker)
+                    # Malformed UUIDs return StatementError
+                    except sqlalchemy_exc.StatementError as statement_error:
+                        raise exceptions.InvalidMarker(
+                            statement_error.message)
 
             try:
                 query = paginate_query(
-                    query, model, limit,
-                    [sort_key, 'id', 'created_at'], marker=marker,
+                    query, model, limit, sort_keys, marker=marker,
                     sort_dir=sort_dir)
 
                 return query.all()
@@ -148,6 +168,82 @@ class SQLAlchemyStorage(base.Storage):
             except ValueError as value_error:
                 raise exceptions.ValueError(value_error.message)
 
+    def _iter(self, model, context, criterion, chunk_size):
+        """
+        Base "iterator" method
+
+        Like _find(), but rows are fetched from the database chunk_size at
+        a time rather than loaded all at once.
+        """
+        query = self.session.query(model)
+        query = self._apply_criterion(model, query, criterion)
+        query = self._apply_tenant_criteria(context, model, query)
+        query = self._apply_deleted_criteria(context, model, query)
+
+        query = query.order_by(model.id)
+
+        # NOTE: Fetch each chunk with its own keyset paged query. yield_per
+        #       streams from a single query, which drivers with buffered
+        #       cursors, like MySQLdb, read into memory in full anyway.
+        last_id = None
+
+        while True:
+            page = query
+
+            if last_id is not None:
+                page = page.filter(model.id > last_id)
+
+            rows = page.limit(chunk_size).all()
+
+            for row in rows:
+                yield dict(row)
+
+            if len(rows) < chunk_size:
+                break
+
+            last_id = rows[-1].id
+
+    def _decode_cursor(self, model, marker, sort_key, sort_dir):
+        """
+        Decode a keyset pagination cursor into a marker suitable for
+        paginate_query.
+
+        Returns None when the marker is a plain resource ID.
+        """
+        if utils.is_uuid_like(marker):
+            return None
+
+        try:
+            cursor_key, cursor_dir, values = utils.decode_cursor(marker)
+        except exceptions.InvalidMarker:
+            # Let the ID based lookup report the failure
+            return None
+
+        if (cursor_key, cursor_dir) != (sort_key, sort_dir) or \
+                len(values) != 2:
+            raise exceptions.InvalidMarker(
+                'Marker %s does not match the requested sort' % marker)
+
+        cursor = _Cursor()
+
+        for key, value in zip((sort_key, 'id'), values):
+            try:
+                column = getattr(model, key)
+            except AttributeError:
+                raise exceptions.InvalidSortKey('Invalid sort key %s' % key)
+
+            if value is not None and \
+                    isinstance(column.property.columns[0].type, DateTime):
+                try:
+                    value = timeutils.parse_strtime(value)
+                except (TypeError, ValueError):
+                    raise exceptions.InvalidMarker(
+                        'Invalid marker %s' % marker)
+
+            setattr(cursor, key, value)
+
+        return cursor
+
     ## CRUD for our resources (quota, server, tsigkey, tenant, domain & record)
     ## R - get_*, find_*s
     ##
@@ -178,6 +274,8 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateQuota()
 
+        self._increment_cache_version('quotas')
+
         return dict(quota)
 
     def get_quota(self, context, quota_id):
@@ -208,6 +306,8 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateQuota()
 
+        self._increment_cache_version('quotas')
+
         return dict(quota)
 
     def delete_quota(self, context, quota_id):
@@ -215,6 +315,8 @@ class SQLAlchemyStorage(base.Storage):
 
         quota.delete(self.session)
 
+        self._increment_cache_version('quotas')
+
     # Server Methods
     def _find_servers(self, context, criterion, one=False,
                       marker=None, limit=None, sort_key=None, sort_dir=None):
@@ -284,6 +386,8 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateTLD()
 
+        self._increment_cache_version('tlds')
+
         return dict(tld)
 
     def find_tlds(self, context, criterion=None,
@@ -309,12 +413,16 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateTLD()
 
+        self._increment_cache_version('tlds')
+
         return dict(tld)
 
     def delete_tld(self, context, tld_id):
         tld = self._find_tlds(context, {'id': tld_id}, one=True)
         tld.delete(self.session)
 
+        self._increment_cache_version('tlds')
+
     # TSIG Key Methods
     def _find_tsigkeys(self, context, criterion, one=False,
                        marker=None, limit=None, sort_key=None, sort_dir=None):
@@ -407,6 +515,15 @@ class SQLAlchemyStorage(base.Storage):
     ##
     ## Domain Methods
     ##
+    def _domain_dict(self, domain):
+        domain = dict(domain)
+
+        # NOTE: The record count is only kept to enforce quotas, see
+        #       count_domain_records, it's not part of the domain.
+        domain.pop('record_count', None)
+
+        return domain
+
     def _find_domains(self, context, criterion, one=False,
                       marker=None, limit=None, sort_key=None, sort_dir=None):
         try:
@@ -426,12 +543,12 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateDomain()
 
-        return dict(domain)
+        return self._domain_dict(domain)
 
     def get_domain(self, context, domain_id):
         domain = self._find_domains(context, {'id': domain_id}, one=True)
 
-        return dict(domain)
+        return self._domain_dict(domain)
 
     def find_domains(self, context, criterion=None,
                      marker=None, limit=None, sort_key=None, sort_dir=None):
@@ -439,11 +556,28 @@ class SQLAlchemyStorage(base.Storage):
                                      limit=limit, sort_key=sort_key,
                                      sort_dir=sort_dir)
 
-        return [dict(d) for d in domains]
+        return [self._domain_dict(d) for d in domains]
 
     def find_domain(self, context, criterion):
         domain = self._find_domains(context, criterion, one=True)
-        return dict(domain)
+        return self._domain_dict(domain)
+
+    def find_closest_domain(self, context, names):
+        if not names:
+            raise exceptions.DomainNotFound()
+
+        query = self.session.query(models.Domain)\
+            .filter(models.Domain.name.in_(names))
+        query = self._apply_tenant_criteria(context, models.Domain, query)
+        query = self._apply_deleted_criteria(context, models.Domain, query)
+
+        domain = query.order_by(func.length(models.Domain.name).desc())\
+            .first()
+
+        if domain is None:
+            raise exceptions.DomainNotFound()
+
+        return self._domain_dict(domain)
 
     def update_domain(self, context, domain_id, values):
         domain = self._find_domains(context, {'id': domain_id}, one=True)
@@ -455,14 +589,14 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateDomain()
 
-        return dict(domain)
+        return self._domain_dict(domain)
 
     def delete_domain(self, context, domain_id):
         domain = self._find_domains(context, {'id': domain_id}, one=True)
 
         domain.soft_delete(self.session)
 
-        return dict(domain)
+        return self._domain_dict(domain)
 
     def count_domains(self, context, criterion=None):
         query = self.session.query(models.Domain)
@@ -514,6 +648,9 @@ class SQLAlchemyStorage(base.Storage):
 
         return [dict(r) for r in recordsets]
 
+    def iter_recordsets(self, context, criterion=None, chunk_size=1000):
+        return self._iter(models.RecordSet, context, criterion, chunk_size)
+
     def find_recordset(self, context, criterion):
         recordset = self._find_recordsets(context, criterion, one=True)
 
@@ -536,8 +673,18 @@ class SQLAlchemyStorage(base.Storage):
         recordset = self._find_recordsets(context, {'id': recordset_id},
                                           one=True)
 
+        # NOTE: Delete the records ourselves, rather than through the
+        #       cascade, and take the count from the rows actually deleted.
+        #       A separate count could miss a record created in between.
+        record_count = self.session.query(models.Record)\
+            .filter_by(recordset_id=recordset_id)\
+            .delete()
+
+        self.session.expire(recordset, ['records'])
         recordset.delete(self.session)
 
+        self._update_record_count(recordset.domain_id, -record_count)
+
         return dict(recordset)
 
     def count_recordsets(self, context, criterion=None):
@@ -575,6 +722,8 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateRecord()
 
+        self._update_record_count(domain_id, 1)
+
         return dict(record)
 
     def find_records(self, context, criterion=None,
@@ -585,6 +734,9 @@ class SQLAlchemyStorage(base.Storage):
 
         return [dict(r) for r in records]
 
+    def iter_records(self, context, criterion=None, chunk_size=1000):
+        return self._iter(models.Record, context, criterion, chunk_size)
+
     def get_record(self, context, record_id):
         record = self._find_records(context, {'id': record_id}, one=True)
 
@@ -612,6 +764,8 @@ class SQLAlchemyStorage(base.Storage):
 
         record.delete(self.session)
 
+        self._update_record_count(record.domain_id, -1)
+
         return dict(record)
 
     def count_records(self, context, criterion=None):
@@ -620,6 +774,103 @@ class SQLAlchemyStorage(base.Storage):
         query = self._apply_criterion(models.Record, query, criterion)
         return query.count()
 
+    def count_domain_records(self, context, domain_id):
+        # NOTE: Query the column rather than the model, it's updated behind
+        #       the ORM's back so a cached instance would be stale.
+        query = self.session.query(models.Domain.record_count)
+        query = query.filter(models.Domain.id == domain_id)
+        query = self._apply_tenant_criteria(context, models.Domain, query)
+
+        count = query.scalar()
+
+        if count is None:
+            raise exceptions.DomainNotFound()
+
+        return count
+
+    def _update_record_count(self, domain_id, change):
+        self.session.query(models.Domain)\
+            .filter_by(id=domain_id)\
+            .update({'record_count': models.Domain.record_count + change},
+                    synchronize_session=False)
+
+    def get_domain_contents(self, context, domain_id, marker=None,
+                            limit=None):
+        # NOTE: Fetch every recordset joined with its records in a single
+        #       query, rather than one find_records call per recordset.
+        query = self.session.query(
+            models.RecordSet.id.label('recordset_id'),
+            models.RecordSet.name,
+            models.RecordSet.type,
+            models.RecordSet.ttl,
+            models.Record.id,
+            models.Record.priority,
+            models.Record.data)
+        query = query.join(models.Record,
+                           models.Record.recordset_id == models.RecordSet.id)
+        query = query.filter(models.RecordSet.domain_id == domain_id)
+        query = self._apply_tenant_criteria(context, models.RecordSet, query)
+
+        sort_columns = [models.RecordSet.created_at, models.RecordSet.id,
+                        models.Record.created_at, models.Record.id]
+
+        if marker is not None:
+            # NOTE: Seek past the marker record by its sort values, rather
+            #       than using an OFFSET, which gets slower with every page.
+            marker_values = self.session.query(*sort_columns)\
+                .join(models.Record,
+                      models.Record.recordset_id == models.RecordSet.id)\
+                .filter(models.RecordSet.domain_id == domain_id)\
+                .filter(models.Record.id == marker)\
+                .first()
+
+            if marker_values is None:
+                raise exceptions.MarkerNotFound(
+                    'Marker %s could not be found' % marker)
+
+            query = query.filter(or_(*[
+                and_(*([column == value for column, value
+                        in zip(sort_columns[:i], marker_values[:i])] +
+                       [sort_columns[i] > marker_values[i]]))
+                for i in range(len(sort_columns))]))
+
+        query = query.order_by(*sort_columns)
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        return [dict(zip(r.keys(), r)) for r in query.all()]
+
+    def find_floatingip_records(self, context, addresses):
+        # The record's TTL falls back to the domain's, as it's served with
+        ttl = func.coalesce(models.RecordSet.ttl, models.Domain.ttl)
+
+        query = self.session.query(models.Record, ttl)
+        query = query.join(models.RecordSet,
+                           models.Record.recordset_id == models.RecordSet.id)
+        query = query.join(models.Domain,
+                           models.Record.domain_id == models.Domain.id)
+        query = self._apply_criterion(models.Record, query, {
+            'managed': True,
+            'managed_resource_type': 'ptr:floatingip',
+        })
+        query = self._apply_tenant_criteria(context, models.Record, query)
+        query = self._apply_deleted_criteria(context, models.Domain, query)
+
+        records = []
+
+        # NOTE: Keep the IN clauses to a size every database accepts
+        for chunk in utils.chunks(addresses, 500):
+            chunk_query = query.filter(
+                models.Record.managed_extra.in_(chunk))
+
+            for record, record_ttl in chunk_query.all():
+                record = dict(record)
+                record['ttl'] = record_ttl
+                records.append(record)
+
+        return records
+
     #
     # Blacklist Methods
     #
@@ -642,6 +893,8 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateBlacklist()
 
+        self._increment_cache_version('blacklists')
+
         return dict(blacklist)
 
     def find_blacklists(self, context, criterion=None,
@@ -674,6 +927,8 @@ class SQLAlchemyStorage(base.Storage):
         except exceptions.Duplicate:
             raise exceptions.DuplicateBlacklist()
 
+        self._increment_cache_version('blacklists')
+
         return dict(blacklist)
 
     def delete_blacklist(self, context, blacklist_id):
@@ -683,6 +938,127 @@ class SQLAlchemyStorage(base.Storage):
 
         blacklist.delete(self.session)
 
+        self._increment_cache_version('blacklists')
+
+    # Zone Import Methods
+    def _find_zone_imports(self, context, criterion, one=False, marker=None,
+                           limit=None, sort_key=None, sort_dir=None):
+        try:
+            return self._find(models.ZoneImport, context, criterion, one=one,
+                              marker=marker, limit=limit, sort_key=sort_key,
+                              sort_dir=sort_dir)
+        except exceptions.NotFound:
+            raise exceptions.ZoneImportNotFound()
+
+    def create_zone_import(self, context, values):
+        zone_import = models.ZoneImport()
+
+        zone_import.update(values)
+        zone_import.save(self.session)
+
+        return dict(zone_import)
+
+    def get_zone_import(self, context, zone_import_id):
+        zone_import = self._find_zone_imports(
+            context, {'id': zone_import_id}, one=True)
+
+        return dict(zone_import)
+
+    def find_zone_imports(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        zone_imports = self._find_zone_imports(
+            context, criterion, marker=marker, limit=limit,
+            sort_key=sort_key, sort_dir=sort_dir)
+
+        return [dict(z) for z in zone_imports]
+
+    def update_zone_import(self, context, zone_import_id, values):
+        zone_import = self._find_zone_imports(
+            context, {'id': zone_import_id}, one=True)
+
+        zone_import.update(values)
+        zone_import.save(self.session)
+
+        return dict(zone_import)
+
+    # Domain Sync Methods
+    def _find_domain_syncs(self, context, criterion, one=False, marker=None,
+                           limit=None, sort_key=None, sort_dir=None):
+        try:
+            return self._find(models.DomainSync, context, criterion, one=one,
+                              marker=marker, limit=limit, sort_key=sort_key,
+                              sort_dir=sort_dir)
+        except exceptions.NotFound:
+            raise exceptions.DomainSyncNotFound()
+
+    def _domain_sync_values(self, values):
+        if 'failed' in values:
+            values = dict(values, failed=jsonutils.dumps(values['failed']))
+
+        return values
+
+    def _domain_sync_dict(self, domain_sync):
+        domain_sync = dict(domain_sync)
+        domain_sync['failed'] = jsonutils.loads(domain_sync['failed'] or '[]')
+
+        return domain_sync
+
+    def create_domain_sync(self, context, values):
+        domain_sync = models.DomainSync()
+
+        domain_sync.update(self._domain_sync_values(values))
+        domain_sync.save(self.session)
+
+        return self._domain_sync_dict(domain_sync)
+
+    def find_domain_syncs(self, context, criterion=None, marker=None,
+                          limit=None, sort_key=None, sort_dir=None):
+        domain_syncs = self._find_domain_syncs(
+            context, criterion, marker=marker, limit=limit,
+            sort_key=sort_key, sort_dir=sort_dir)
+
+        return [self._domain_sync_dict(d) for d in domain_syncs]
+
+    def update_domain_sync(self, context, domain_sync_id, values):
+        domain_sync = self._find_domain_syncs(
+            context, {'id': domain_sync_id}, one=True)
+
+        domain_sync.update(self._domain_sync_values(values))
+        domain_sync.save(self.session)
+
+        return self._domain_sync_dict(domain_sync)
+
+    # Cache versions
+    def get_cache_version(self, context, name):
+        # NOTE: Query the column rather than the model, the row is updated
+        #       behind the ORM's back and by other processes, so a cached
+        #       instance in the session's identity map would be stale.
+        version = self.session.query(models.CacheVersion.version)\
+            .filter_by(name=name).scalar()
+
+        return version or 0
+
+    def _update_cache_version(self, name):
+        return self.session.query(models.CacheVersion)\
+            .filter_by(name=name)\
+            .update({'version': models.CacheVersion.version + 1},
+                    synchronize_session=False)
+
+    def _increment_cache_version(self, name):
+        # NOTE: The rows are created by the migrations, so this is a single
+        #       UPDATE unless the schema was created some other way.
+        if self._update_cache_version(name):
+            return
+
+        # NOTE: A plain INSERT rather than saving a model, a failed flush
+        #       would roll back the caller's transaction along with it.
+        try:
+            self.session.execute(
+                models.CacheVersion.__table__.insert().values(name=name))
+        except sqlalchemy_exc.IntegrityError:
+            # Another process created the row meanwhile, so bump it instead
+            self._update_cache_version(name)
+
     # diagnostics
     def ping(self, context):
         start_time = time.time()
@@ -0,0 +1,71 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from sqlalchemy import MetaData, Table, Index
+from designate.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+meta = MetaData()
+
+# NOTE: Each entry is (table, index name, columns). The columns are
+#       ordered to match the criteria central and the storage driver
+#       actually filter by, e.g. find_records with a domain_id and
+#       recordset_id, or find_domains with the soft-delete filter
+#       always applied.
+INDEXES = [
+    ('domains', 'domains_tenant_id_deleted', ('tenant_id', 'deleted')),
+    ('domains', 'domains_parent_domain_id_deleted',
+     ('parent_domain_id', 'deleted')),
+    ('recordsets', 'recordsets_tenant_id', ('tenant_id',)),
+    ('recordsets', 'recordsets_name_type', ('name', 'type')),
+    ('records', 'records_domain_id_recordset_id',
+     ('domain_id', 'recordset_id')),
+    ('records', 'records_recordset_id', ('recordset_id',)),
+    ('records', 'records_tenant_id', ('tenant_id',)),
+    ('records', 'records_managed_resource_id',
+     ('managed_resource_id', 'managed_tenant_id')),
+    ('records', 'records_managed_resource_type',
+     ('managed_resource_type', 'managed_tenant_id')),
+]
+
+
+def _build_indexes():
+    tables = {}
+    indexes = []
+
+    for table_name, index_name, column_names in INDEXES:
+        if table_name not in tables:
+            tables[table_name] = Table(table_name, meta, autoload=True)
+
+        table = tables[table_name]
+        columns = [getattr(table.c, c) for c in column_names]
+
+        indexes.append(Index(index_name, *columns))
+
+    return indexes
+
+
+def upgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    for index in _build_indexes():
+        LOG.debug('Creating index %s' % index.name)
+        index.create(migrate_engine)
+
+
+def downgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    for index in reversed(_build_indexes()):
+        LOG.debug('Dropping index %s' % index.name)
+        index.drop(migrate_engine)
@@ -0,0 +1,60 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.schema import Table, Column, MetaData
+from designate.openstack.common import timeutils
+from designate import utils
+from designate.sqlalchemy.types import UUID
+
+meta = MetaData()
+
+# The cached sets, their rows are created up front so incrementing a
+# version is always a single UPDATE
+CACHE_NAMES = ['blacklists', 'tlds']
+
+cache_versions = Table(
+    'cache_versions',
+    meta,
+    Column('id', UUID(), default=utils.generate_uuid,
+           primary_key=True),
+    Column('created_at', DateTime(),
+           default=timeutils.utcnow),
+    Column('updated_at', DateTime(),
+           onupdate=timeutils.utcnow),
+    Column('version', Integer(), default=1,
+           nullable=False),
+    Column('name', String(64), nullable=False,
+           unique=True),
+
+    mysql_engine='INNODB',
+    mysql_charset='utf8')
+
+
+def upgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    cache_versions.create()
+
+    for name in CACHE_NAMES:
+        cache_versions.insert().execute(
+            id=utils.generate_uuid(),
+            created_at=timeutils.utcnow(),
+            version=0,
+            name=name)
+
+
+def downgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    cache_versions.drop()
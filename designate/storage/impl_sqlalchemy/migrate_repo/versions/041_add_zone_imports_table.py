@@ -0,0 +1,58 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from sqlalchemy import Integer, String, DateTime, Enum, Unicode
+from sqlalchemy.schema import Table, Column, MetaData
+from designate.openstack.common import timeutils
+from designate import utils
+from designate.sqlalchemy.types import UUID
+
+ZONE_IMPORT_STATUSES = ['PENDING', 'RUNNING', 'COMPLETE', 'ERROR']
+
+meta = MetaData()
+
+zone_imports = Table(
+    'zone_imports',
+    meta,
+    Column('id', UUID(), default=utils.generate_uuid,
+           primary_key=True),
+    Column('created_at', DateTime(),
+           default=timeutils.utcnow),
+    Column('updated_at', DateTime(),
+           onupdate=timeutils.utcnow),
+    Column('version', Integer(), default=1,
+           nullable=False),
+    Column('tenant_id', String(36), default=None,
+           nullable=True),
+    Column('status', Enum(name='zone_import_statuses',
+                          *ZONE_IMPORT_STATUSES),
+           nullable=False, server_default='PENDING', default='PENDING'),
+    Column('message', Unicode(255), nullable=True),
+    Column('domain_id', UUID(), nullable=True),
+    Column('records_total', Integer(), default=0,
+           nullable=False),
+
+    mysql_engine='INNODB',
+    mysql_charset='utf8')
+
+
+def upgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    zone_imports.create()
+
+
+def downgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    zone_imports.drop()
@@ -0,0 +1,56 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from sqlalchemy import MetaData, Table, Column, Integer, select, func
+from designate.openstack.common import timeutils
+from designate import utils
+
+meta = MetaData()
+
+
+def upgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    domains_table = Table('domains', meta, autoload=True)
+    records_table = Table('records', meta, autoload=True)
+
+    record_count = Column('record_count', Integer(), default=0,
+                          nullable=False, server_default='0')
+    record_count.create(domains_table, populate_default=True)
+
+    # Count the records of existing domains
+    count = select([func.count(records_table.c.id)])\
+        .where(records_table.c.domain_id == domains_table.c.id)\
+        .as_scalar()
+
+    domains_table.update().values(record_count=count).execute()
+
+    # The quotas are cached as well now, create their cache version row
+    cache_versions_table = Table('cache_versions', meta, autoload=True)
+    cache_versions_table.insert().execute(
+        id=utils.generate_uuid(),
+        created_at=timeutils.utcnow(),
+        version=0,
+        name='quotas')
+
+
+def downgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    domains_table = Table('domains', meta, autoload=True)
+    domains_table.c.record_count.drop()
+
+    cache_versions_table = Table('cache_versions', meta, autoload=True)
+    cache_versions_table.delete()\
+        .where(cache_versions_table.c.name == 'quotas')\
+        .execute()
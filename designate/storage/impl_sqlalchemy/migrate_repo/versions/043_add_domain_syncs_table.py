@@ -0,0 +1,57 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from sqlalchemy import Integer, DateTime, Enum, Text, Unicode
+from sqlalchemy.schema import Table, Column, MetaData
+from designate.openstack.common import timeutils
+from designate import utils
+from designate.sqlalchemy.types import UUID
+
+DOMAIN_SYNC_STATUSES = ['RUNNING', 'COMPLETE', 'ERROR']
+
+meta = MetaData()
+
+domain_syncs = Table(
+    'domain_syncs',
+    meta,
+    Column('id', UUID(), default=utils.generate_uuid,
+           primary_key=True),
+    Column('created_at', DateTime(),
+           default=timeutils.utcnow),
+    Column('updated_at', DateTime(),
+           onupdate=timeutils.utcnow),
+    Column('version', Integer(), default=1,
+           nullable=False),
+    Column('status', Enum(name='domain_sync_statuses',
+                          *DOMAIN_SYNC_STATUSES),
+           nullable=False, server_default='RUNNING', default='RUNNING'),
+    Column('message', Unicode(255), nullable=True),
+    Column('total', Integer(), default=0, nullable=False),
+    Column('synced', Integer(), default=0, nullable=False),
+    Column('failed', Text(), nullable=True),
+    Column('marker', UUID(), nullable=True),
+
+    mysql_engine='INNODB',
+    mysql_charset='utf8')
+
+
+def upgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    domain_syncs.create()
+
+
+def downgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    domain_syncs.drop()
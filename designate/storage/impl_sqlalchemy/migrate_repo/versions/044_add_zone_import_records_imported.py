@@ -0,0 +1,35 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from sqlalchemy import Integer
+from sqlalchemy.schema import Table, Column, MetaData
+
+meta = MetaData()
+
+
+def upgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    zone_imports_table = Table('zone_imports', meta, autoload=True)
+
+    records_imported = Column('records_imported', Integer(), default=0,
+                              nullable=False, server_default='0')
+    records_imported.create(zone_imports_table, populate_default=True)
+
+
+def downgrade(migrate_engine):
+    meta.bind = migrate_engine
+
+    zone_imports_table = Table('zone_imports', meta, autoload=True)
+
+    zone_imports_table.c.records_imported.drop()
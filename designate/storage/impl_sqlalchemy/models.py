@@ -18,7 +18,7 @@
 import hashlib
 from oslo.config import cfg
 from sqlalchemy import (Column, DateTime, String, Text, Integer, ForeignKey,
-                        Enum, Boolean, Unicode, UniqueConstraint, event)
+                        Enum, Boolean, Unicode, UniqueConstraint, Index, event)
 from sqlalchemy.orm import relationship, backref
 from designate.openstack.common import log as logging
 from designate.openstack.common import timeutils
@@ -34,6 +34,8 @@ CONF = cfg.CONF
 RESOURCE_STATUSES = ['ACTIVE', 'PENDING', 'DELETED']
 RECORD_TYPES = ['A', 'AAAA', 'CNAME', 'MX', 'SRV', 'TXT', 'SPF', 'NS', 'PTR',
                 'SSHFP']
+ZONE_IMPORT_STATUSES = ['PENDING', 'RUNNING', 'COMPLETE', 'ERROR']
+DOMAIN_SYNC_STATUSES = ['RUNNING', 'COMPLETE', 'ERROR']
 TSIG_ALGORITHMS = ['hmac-md5', 'hmac-sha1', 'hmac-sha224', 'hmac-sha256',
                    'hmac-sha384', 'hmac-sha512']
 
@@ -83,6 +85,9 @@ class Domain(SoftDeleteMixin, Base):
     __tablename__ = 'domains'
     __table_args__ = (
         UniqueConstraint('name', 'deleted', name='unique_domain_name'),
+        Index('domains_tenant_id_deleted', 'tenant_id', 'deleted'),
+        Index('domains_parent_domain_id_deleted', 'parent_domain_id',
+              'deleted'),
         {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8'}
     )
 
@@ -102,6 +107,11 @@ class Domain(SoftDeleteMixin, Base):
                     nullable=False, server_default='ACTIVE',
                     default='ACTIVE')
 
+    # Number of records in the domain, maintained by storage so quotas can
+    # be enforced without counting them
+    record_count = Column(Integer, default=0, nullable=False,
+                          server_default='0')
+
     recordsets = relationship('RecordSet',
                               backref=backref('domain', uselist=False),
                               cascade="all, delete-orphan",
@@ -115,6 +125,8 @@ class RecordSet(Base):
     __tablename__ = 'recordsets'
     __table_args__ = (
         UniqueConstraint('domain_id', 'name', 'type', name='unique_recordset'),
+        Index('recordsets_tenant_id', 'tenant_id'),
+        Index('recordsets_name_type', 'name', 'type'),
         {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8'}
     )
 
@@ -135,6 +147,16 @@ class RecordSet(Base):
 
 class Record(Base):
     __tablename__ = 'records'
+    __table_args__ = (
+        Index('records_domain_id_recordset_id', 'domain_id', 'recordset_id'),
+        Index('records_recordset_id', 'recordset_id'),
+        Index('records_tenant_id', 'tenant_id'),
+        Index('records_managed_resource_id', 'managed_resource_id',
+              'managed_tenant_id'),
+        Index('records_managed_resource_type', 'managed_resource_type',
+              'managed_tenant_id'),
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8'}
+    )
 
     tenant_id = Column(String(36), default=None, nullable=True)
     domain_id = Column(UUID, ForeignKey('domains.id', ondelete='CASCADE'),
@@ -195,3 +217,36 @@ class Blacklists(Base):
 
     pattern = Column(String(255), nullable=False, unique=True)
     description = Column(Unicode(160), nullable=True)
+
+
+class CacheVersion(Base):
+    __tablename__ = 'cache_versions'
+
+    name = Column(String(64), nullable=False, unique=True)
+
+
+class ZoneImport(Base):
+    __tablename__ = 'zone_imports'
+
+    tenant_id = Column(String(36), default=None, nullable=True)
+    status = Column(Enum(name='zone_import_statuses', *ZONE_IMPORT_STATUSES),
+                    nullable=False, server_default='PENDING',
+                    default='PENDING')
+    message = Column(Unicode(255), nullable=True)
+    domain_id = Column(UUID, nullable=True)
+    records_total = Column(Integer, default=0, nullable=False)
+    records_imported = Column(Integer, default=0, nullable=False)
+
+
+class DomainSync(Base):
+    __tablename__ = 'domain_syncs'
+
+    status = Column(Enum(name='domain_sync_statuses', *DOMAIN_SYNC_STATUSES),
+                    nullable=False, server_default='RUNNING',
+                    default='RUNNING')
+    message = Column(Unicode(255), nullable=True)
+    total = Column(Integer, default=0, nullable=False)
+    synced = Column(Integer, default=0, nullable=False)
+    # JSON list of the IDs of the domains which failed to sync
+    failed = Column(Text, nullable=True)
+    marker = Column(UUID, nullable=True)
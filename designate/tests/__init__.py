@@ -75,13 +75,10 @@ class ServiceFixture(fixtures.Fixture):
     def setUp(self):
         super(ServiceFixture, self).setUp()
         self.svc.start()
-        self.addCleanup(self.kill)
-
-    def kill(self):
-        try:
-            self.svc.kill()
-        except Exception:
-            pass
+        # Stopping the service closes its RPC connection, which removes its
+        # consumers, so later calls don't reach a service from an earlier
+        # test.
+        self.addCleanup(self.svc.stop)
 
 
 class PolicyFixture(fixtures.Fixture):
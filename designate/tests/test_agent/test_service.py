@@ -13,6 +13,8 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import mock
+from designate.agent import rpcapi as agent_rpcapi
 from designate.tests.test_agent import AgentTestCase
 
 
@@ -24,3 +26,34 @@ class AgentServiceTest(AgentTestCase):
     def test_stop(self):
         # NOTE: Start is already done by the fixture in start_service()
         self.service.stop()
+
+    def test_create_recordsets(self):
+        domain = {'id': '1', 'name': 'example.org.'}
+        recordset = {'id': '2', 'domain_id': '1', 'name': 'www.example.org.',
+                     'type': 'A'}
+
+        agent_api = agent_rpcapi.AgentAPI()
+
+        # Ensure the agent accepts the version create_recordsets is sent with
+        with mock.patch.object(self.service.manager,
+                               'create_recordset') as create_recordset:
+            agent_api.create_recordsets(self.admin_context, domain,
+                                        [recordset])
+
+        create_recordset.assert_called_once_with(mock.ANY, domain, recordset)
+
+    def test_create_records(self):
+        domain = {'id': '1', 'name': 'example.org.'}
+        recordset = {'id': '2', 'domain_id': '1', 'name': 'www.example.org.',
+                     'type': 'A'}
+        record = {'id': '3', 'recordset_id': '2', 'data': '192.0.2.1'}
+
+        agent_api = agent_rpcapi.AgentAPI()
+
+        with mock.patch.object(self.service.manager,
+                               'create_record') as create_record:
+            agent_api.create_records(self.admin_context, domain, recordset,
+                                     [record])
+
+        create_record.assert_called_once_with(mock.ANY, domain, recordset,
+                                              record)
@@ -24,11 +24,16 @@ LOG = logging.getLogger(__name__)
 
 
 class ApiV1Test(ApiTestCase):
+    # Extensions to enable, as named by their entry points
+    extensions = []
+
     def setUp(self):
         super(ApiV1Test, self).setUp()
 
         # Ensure the v1 API is enabled
         self.config(enable_api_v1=True, group='service:api')
+        self.config(enabled_extensions_v1=self.extensions,
+                    group='service:api')
 
         # Create the application
         self.app = api_v1.factory({})
@@ -0,0 +1,63 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from mock import patch
+from designate.openstack.common import log as logging
+from designate.tests.test_api.test_v1 import ApiV1Test
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ApiV1SyncTest(ApiV1Test):
+    extensions = ['sync']
+
+    def setUp(self):
+        super(ApiV1SyncTest, self).setUp()
+
+        # All Sync Checks should be performed as an admin, so..
+        # Override to policy to make everyone an admin.
+        self.policy({'admin': '@'})
+
+        self.domain = self.create_domain()
+
+    def test_sync_domains(self):
+        # Run the sync straight away, rather than in the background
+        with patch.object(self.central_service.tg, 'add_thread',
+                          side_effect=lambda f, *a: f(*a)):
+            response = self.post('domains/sync', data={}, status_code=202)
+
+        self.assertEqual('RUNNING', response.json['status'])
+        self.assertEqual(1, response.json['total'])
+
+        response = self.get('domains/sync')
+
+        self.assertEqual('COMPLETE', response.json['status'])
+        self.assertEqual(1, response.json['total'])
+        self.assertEqual(1, response.json['synced'])
+        self.assertEqual([], response.json['failed'])
+        self.assertEqual(self.domain['id'], response.json['marker'])
+
+    def test_sync_domains_in_progress(self):
+        # Leave the first sync running
+        with patch.object(self.central_service.tg, 'add_thread'):
+            self.post('domains/sync', data={}, status_code=202)
+            self.post('domains/sync', data={}, status_code=409)
+
+        response = self.get('domains/sync')
+
+        self.assertEqual('RUNNING', response.json['status'])
+        self.assertEqual(0, response.json['synced'])
+
+    def test_get_domain_sync_status_missing(self):
+        self.get('domains/sync', status_code=404)
@@ -13,9 +13,14 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import functools
+import urlparse
 from dns import zone as dnszone
 from mock import patch
+import testtools
 from designate import exceptions
+from designate import utils
+from designate.api.v2.controllers import zones
 from designate.central import service as central_service
 from designate.openstack.common.rpc import common as rpc_common
 from designate.tests.test_api.test_v2 import ApiV2TestCase
@@ -165,6 +170,27 @@ class ApiV2ZonesTest(ApiV2TestCase):
 
         self._assert_invalid_paging(data, '/zones', key='zones')
 
+    def test_get_zones_next_link(self):
+        data = [self.create_domain(name='x-%s.com.' % i)
+                for i in 'abcdefghij']
+
+        found = []
+        response = self.client.get('/zones/', {'limit': 3})
+
+        while True:
+            found.extend([z['id'] for z in response.json['zones']])
+
+            if 'next' not in response.json['links']:
+                break
+
+            # The next link carries an opaque keyset cursor as the marker
+            query = urlparse.urlparse(response.json['links']['next']).query
+            self.assertNotIn(found[-1], query)
+
+            response = self.client.get('/zones/?%s' % query)
+
+        self.assertEqual([d['id'] for d in data], found)
+
     @patch.object(central_service.Service, 'find_domains',
                   side_effect=rpc_common.Timeout())
     def test_get_zones_timeout(self, _):
@@ -334,32 +360,100 @@ class ApiV2ZonesTest(ApiV2TestCase):
                                url)
 
     # Zone import/export
+    def _import_zonefile(self, zonefile):
+        # Run the import straight away, rather than in the background
+        with patch.object(self.central_service.tg, 'add_thread',
+                          side_effect=lambda f, *a: f(*a)):
+            response = self.client.post('/zones', zonefile,
+                                        headers={'Content-type': 'text/dns'})
+
+        self.assertEqual(202, response.status_int)
+        self.assertIn('zone_import', response.json)
+        self.assertEqual(response.json['zone_import']['links']['self'],
+                         response.headers['Location'])
+
+        response = self.client.get('/zones/tasks/imports/%s' %
+                                   response.json['zone_import']['id'])
+
+        return response.json['zone_import']
+
+    def _assert_import_failed(self, zonefile, message):
+        # The zonefile is parsed in the background, so errors in it are
+        # reported by the zone import
+        zone_import = self._import_zonefile(zonefile)
+
+        self.assertEqual('ERROR', zone_import['status'])
+        self.assertIn(message, zone_import['message'])
+        self.assertIsNone(zone_import['zone_id'])
+
     def test_missing_origin(self):
         fixture = self.get_zonefile_fixture(variant='noorigin')
 
-        self._assert_exception('bad_request', 400, self.client.post, '/zones',
-                               fixture, headers={'Content-type': 'text/dns'})
+        self._assert_import_failed(fixture, '$ORIGIN')
 
     def test_missing_soa(self):
         fixture = self.get_zonefile_fixture(variant='nosoa')
 
-        self._assert_exception('bad_request', 400, self.client.post, '/zones',
-                               fixture, headers={'Content-type': 'text/dns'})
+        self._assert_import_failed(fixture, 'SOA')
 
     def test_malformed_zonefile(self):
         fixture = self.get_zonefile_fixture(variant='malformed')
 
-        self._assert_exception('bad_request', 400, self.client.post, '/zones',
-                               fixture, headers={'Content-type': 'text/dns'})
+        self._assert_import_failed(fixture, 'Malformed zonefile')
+
+    def test_import_zonefile(self):
+        zone_import = self._import_zonefile(self.get_zonefile_fixture())
+
+        self.assertEqual('COMPLETE', zone_import['status'])
+        self.assertIsNone(zone_import['message'])
+        self.assertIsNotNone(zone_import['zone_id'])
+        self.assertEqual(zone_import['records_total'],
+                         zone_import['records_imported'])
+
+        response = self.client.get('/zones/tasks/imports')
+
+        self.assertIn('zone_imports', response.json)
+        self.assertEqual(1, len(response.json['zone_imports']))
+
+    def test_import_zonefile_batched(self):
+        self.config(zone_import_batch_size=1, group='service:central')
+
+        store_zone_import_batch = self.central_service.\
+            _store_zone_import_batch
+
+        with patch.object(self.central_service, '_store_zone_import_batch',
+                          wraps=store_zone_import_batch) as mock:
+            zone_import = self._import_zonefile(self.get_zonefile_fixture())
+
+        self.assertEqual('COMPLETE', zone_import['status'])
+        self.assertEqual(zone_import['records_total'],
+                         zone_import['records_imported'])
+        self.assertTrue(mock.call_count > 1)
+
+    def test_import_zonefile_over_quota(self):
+        self.config(quota_domain_records=1)
+
+        zone_import = self._import_zonefile(self.get_zonefile_fixture())
+
+        self.assertEqual('ERROR', zone_import['status'])
+
+        # The records are checked against the quota before the zone is
+        # created, so nothing is left behind.
+        response = self.client.get('/zones')
+        self.assertEqual(0, len(response.json['zones']))
+
+    def test_get_zone_import_missing(self):
+        url = '/zones/tasks/imports/2fdadfb1-cf96-4259-ac6b-bb7b6d2ff980'
+
+        self._assert_exception('zone_import_not_found', 404, self.client.get,
+                               url)
 
     def test_import_export(self):
         # Since v2 doesn't support getting records, import and export the
         # fixture, making sure they're the same according to dnspython
-        post_response = self.client.post('/zones',
-                                         self.get_zonefile_fixture(),
-                                         headers={'Content-type': 'text/dns'})
-        get_response = self.client.get('/zones/%s' %
-                                       post_response.json['zone']['id'],
+        zone_import = self._import_zonefile(self.get_zonefile_fixture())
+
+        get_response = self.client.get('/zones/%s' % zone_import['zone_id'],
                                        headers={'Accept': 'text/dns'})
         exported_zonefile = get_response.body
         imported = dnszone.from_text(self.get_zonefile_fixture())
@@ -378,3 +472,50 @@ class ApiV2ZonesTest(ApiV2TestCase):
         imported.delete_rdataset(imported.origin, 'NS')
         exported.delete_rdataset(exported.origin, 'NS')
         self.assertEqual(imported, exported)
+
+    def test_import_export_paged(self):
+        # Export the zone with the records fetched a couple at a time
+        self.config(zonefile_export_page_size=2, group='service:api')
+
+        self.test_import_export()
+
+    def test_export_first_page_failure(self):
+        zone_import = self._import_zonefile(self.get_zonefile_fixture())
+        url = '/zones/%s' % zone_import['zone_id']
+
+        # The first page is fetched before the response is started, so the
+        # failure is still answered with an error
+        with patch.object(central_service.Service, 'get_domain_contents',
+                          side_effect=rpc_common.Timeout()):
+            self._assert_exception('timeout', 504, self.client.get, url,
+                                   headers={'Accept': 'text/dns'})
+
+    def test_export_later_page_failure(self):
+        self.config(zonefile_export_page_size=2, group='service:api')
+
+        zone_import = self._import_zonefile(self.get_zonefile_fixture())
+        url = '/zones/%s' % zone_import['zone_id']
+
+        get_domain_contents = self.central_service.get_domain_contents
+        render_template_chunks = functools.partial(
+            utils.render_template_chunks, chunk_size=1)
+        pages = []
+
+        def fail_after_first_page(*args, **kwargs):
+            if pages:
+                raise rpc_common.Timeout()
+
+            pages.append(args)
+            return get_domain_contents(*args, **kwargs)
+
+        # Send the first chunk before the second page is fetched
+        with patch.object(zones.utils, 'render_template_chunks',
+                          render_template_chunks):
+            with patch.object(self.central_service, 'get_domain_contents',
+                              side_effect=fail_after_first_page):
+                with patch.object(zones.LOG, 'exception') as log_exception:
+                    # The response was started already, it is cut short
+                    with testtools.ExpectedException(rpc_common.Timeout):
+                        self.client.get(url, headers={'Accept': 'text/dns'})
+
+        self.assertEqual(1, log_exception.call_count)
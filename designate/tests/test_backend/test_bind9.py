@@ -0,0 +1,415 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import os
+import re
+
+import fixtures
+from mock import call
+from mock import MagicMock
+
+from designate import exceptions
+from designate import tests
+from designate.tests.test_backend import BackendTestMixin
+from designate.tests.test_backend.test_rndc import RNDCFixture
+
+# impl_bind9 needs to register its options before being instanciated.
+# Import it and pretend to use it to avoid flake8 unused import errors.
+from designate.backend import impl_bind9
+impl_bind9
+
+# Matches the SOA serial line of bind9-zone-header.jinja2
+SERIAL_RE = re.compile(r'^\s*\d+ ; serial$', re.M)
+
+
+class Bind9BackendTestCase(tests.TestCase, BackendTestMixin):
+    def setUp(self):
+        super(Bind9BackendTestCase, self).setUp()
+        self.config(backend_driver='bind9', group='service:agent')
+        self.backend = self.get_backend_driver()
+        self.backend._sync_domain = MagicMock()
+        self.backend._sync_delete_domain = MagicMock()
+
+        self.domain = {'id': 'e8a1ec1a-7e39-4b8f-8bcb-6b2e3c1d9a20',
+                       'name': 'example.com.'}
+
+    def _start_flushing(self):
+        # Pretend the flush timer is running without spawning it, so the
+        # tests decide when the flush happens.
+        self.backend._flush_timer = MagicMock()
+
+    def _start(self, domains, rndc_side_effect=None):
+        self.config(zone_flush_interval=0, group='backend:bind9')
+        self.backend.central_service = MagicMock()
+        self.backend.central_service.find_domains.return_value = domains
+        self.backend._rndc = MagicMock(side_effect=rndc_side_effect)
+        self.backend.start()
+
+    def test_start_reloads_domains(self):
+        domains = [{'name': '%d.example.com.' % i} for i in range(40)]
+
+        self._start(domains)
+
+        self.assertEqual(40, self.backend._rndc.call_count)
+        self.backend._rndc.assert_has_calls(
+            [call('reload', d['name']) for d in domains], any_order=True)
+
+    def test_start_reload_failure_continues(self):
+        domains = [{'name': 'a.example.com.'}, {'name': 'b.example.com.'}]
+
+        self._start(domains, rndc_side_effect=[Exception(), None])
+
+        self.assertEqual(2, self.backend._rndc.call_count)
+
+    def test_start_global_reload(self):
+        self.config(startup_global_reload=True, group='backend:bind9')
+
+        self._start([{'name': 'a.example.com.'}])
+
+        self.backend._rndc.assert_called_once_with('reload')
+        self.assertFalse(self.backend.central_service.find_domains.called)
+
+    def test_changes_written_immediately_when_not_started(self):
+        self.backend.create_record(self.admin_context, self.domain, {}, {})
+        self.backend.update_record(self.admin_context, self.domain, {}, {})
+
+        self.assertEqual(2, self.backend._sync_domain.call_count)
+
+    def test_changes_coalesced(self):
+        self._start_flushing()
+
+        for _ in range(10):
+            self.backend.create_record(self.admin_context, self.domain, {},
+                                       {})
+
+        updated_domain = dict(self.domain, serial=2)
+        self.backend.delete_record(self.admin_context, updated_domain, {}, {})
+
+        self.assertFalse(self.backend._sync_domain.called)
+
+        self.backend._flush_dirty_domains()
+
+        # Read through RPC, off central's storage session
+        self.backend._sync_domain.assert_called_once_with(
+            updated_domain, central=impl_bind9.central_api)
+
+        # Nothing left to write out
+        self.backend._flush_dirty_domains()
+        self.assertEqual(1, self.backend._sync_domain.call_count)
+
+    def test_failed_flush_retried(self):
+        self._start_flushing()
+        self.backend._sync_domain.side_effect = [Exception(), None]
+
+        self.backend.update_domain(self.admin_context, self.domain)
+
+        self.backend._flush_dirty_domains()
+        self.assertIn(self.domain['id'], self.backend._dirty_domains)
+
+        self.backend._flush_dirty_domains()
+        self.assertEqual({}, self.backend._dirty_domains)
+        self.assertEqual(2, self.backend._sync_domain.call_count)
+
+    def test_failed_flush_deleted_domain_dropped(self):
+        self._start_flushing()
+        self.backend._sync_domain.side_effect = exceptions.DomainNotFound()
+
+        self.backend.update_domain(self.admin_context, self.domain)
+
+        self.backend._flush_dirty_domains()
+        self.assertEqual({}, self.backend._dirty_domains)
+
+    def test_failed_flush_retries_capped(self):
+        self.config(zone_flush_max_retries=2, group='backend:bind9')
+        self._start_flushing()
+        self.backend._sync_domain.side_effect = Exception()
+
+        self.backend.update_domain(self.admin_context, self.domain)
+
+        for _ in range(5):
+            self.backend._flush_dirty_domains()
+
+        self.assertEqual(3, self.backend._sync_domain.call_count)
+        self.assertEqual({}, self.backend._dirty_domains)
+        self.assertEqual({}, self.backend._flush_failures)
+
+    def test_sync_domain_forces_flush(self):
+        self._start_flushing()
+
+        self.backend.create_record(self.admin_context, self.domain, {}, {})
+        self.backend.sync_domain(self.admin_context, self.domain, [])
+
+        self.backend._sync_domain.assert_called_once_with(self.domain,
+                                                          force=True)
+        self.assertEqual({}, self.backend._dirty_domains)
+
+    def test_delete_domain_discards_pending_changes(self):
+        self._start_flushing()
+
+        self.backend.create_record(self.admin_context, self.domain, {}, {})
+        self.backend.delete_domain(self.admin_context, self.domain)
+        self.backend._flush_dirty_domains()
+
+        self.assertFalse(self.backend._sync_domain.called)
+        self.backend._sync_delete_domain.assert_called_once_with(self.domain)
+
+    def test_stop_flushes_pending_changes(self):
+        timer = MagicMock()
+        self.backend._flush_timer = timer
+
+        self.backend.update_domain(self.admin_context, self.domain)
+        self.backend.stop()
+
+        timer.stop.assert_called_once_with()
+        self.backend._sync_domain.assert_called_once_with(
+            self.domain, central=self.backend.central_service)
+
+    def test_rndc_native_client(self):
+        fixture = self.useFixture(RNDCFixture())
+        self.config(rndc_port=fixture.server.port,
+                    rndc_key_file=fixture.key_file,
+                    group='backend:bind9')
+
+        backend = self.get_backend_driver()
+        backend._rndc('reload', 'example.com.')
+
+        self.assertEqual(['reload example.com.'], fixture.server.commands)
+
+    def test_rndc_native_client_disabled(self):
+        fixture = self.useFixture(RNDCFixture())
+        self.config(rndc_key_file=fixture.key_file, rndc_native_client=False,
+                    group='backend:bind9')
+
+        backend = self.get_backend_driver()
+
+        self.assertIsNone(backend._rndc_client)
+
+    def test_rndc_native_client_bad_key_file(self):
+        key_file = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                'rndc.key')
+
+        with open(key_file, 'w') as fh:
+            fh.write('not a key')
+
+        self.config(rndc_key_file=key_file, group='backend:bind9')
+
+        backend = self.get_backend_driver()
+
+        self.assertIsNone(backend._rndc_client)
+
+    def _zone_domain(self, serial):
+        return dict(self.domain, email='admin@example.com', ttl=3600,
+                    serial=serial, refresh=3600, retry=600, expire=86400,
+                    minimum=3600)
+
+    def _get_syncing_backend(self):
+        state_path = self.useFixture(fixtures.TempDir()).path
+        nzf_path = self.useFixture(fixtures.TempDir()).path
+        open(os.path.join(nzf_path, 'view.nzf'), 'w').close()
+
+        self.config(state_path=state_path)
+        self.config(nzf_path=nzf_path, group='backend:bind9')
+
+        backend = self.get_backend_driver()
+        backend.central_service = MagicMock()
+        backend.central_service.find_servers.return_value = [
+            {'name': 'ns1.example.org.'}]
+        backend.central_service.get_domain_contents.return_value = [
+            {'name': 'www.example.com.', 'type': 'A', 'ttl': None,
+             'priority': None, 'data': '192.0.2.1'}]
+        backend._rndc = MagicMock()
+
+        self.zone_path = os.path.join(
+            state_path, 'bind9', 'example.com._%s.zone' % self.domain['id'])
+        self.records_path = os.path.join(
+            state_path, 'bind9', 'example.com._%s.records' % self.domain['id'])
+
+        return backend
+
+    def _zone_serial(self):
+        with open(self.zone_path) as fh:
+            match = SERIAL_RE.search(fh.read())
+
+        return int(match.group(0).split()[0])
+
+    def test_sync_domain_writes_zone(self):
+        backend = self._get_syncing_backend()
+
+        backend._sync_domain(self._zone_domain(serial=1))
+
+        with open(self.zone_path) as fh:
+            content = fh.read()
+            self.assertIn('IN NS ns1.example.org.', content)
+            self.assertIn('$INCLUDE %s' % self.records_path, content)
+
+        with open(self.records_path) as fh:
+            self.assertIn('192.0.2.1', fh.read())
+
+        backend._rndc.assert_called_once_with('reload', 'example.com.')
+
+    def test_sync_domain_unchanged_skipped(self):
+        backend = self._get_syncing_backend()
+
+        backend._sync_domain(self._zone_domain(serial=1))
+        backend._sync_domain(self._zone_domain(serial=1))
+
+        self.assertEqual(1, backend._rndc.call_count)
+        self.assertEqual(1, self._zone_serial())
+
+    def test_sync_domain_serial_changed_written(self):
+        backend = self._get_syncing_backend()
+
+        backend._sync_domain(self._zone_domain(serial=1))
+
+        with open(self.records_path) as fh:
+            records = fh.read()
+
+        # Only the serial moved
+        backend._sync_domain(self._zone_domain(serial=2))
+
+        self.assertEqual(2, backend._rndc.call_count)
+        self.assertEqual(2, self._zone_serial())
+
+        with open(self.records_path) as fh:
+            self.assertEqual(records, fh.read())
+
+    def test_sync_domain_changed_written(self):
+        backend = self._get_syncing_backend()
+
+        backend._sync_domain(self._zone_domain(serial=1))
+
+        backend.central_service.get_domain_contents.return_value = [
+            {'name': 'www.example.com.', 'type': 'A', 'ttl': None,
+             'priority': None, 'data': '192.0.2.2'}]
+        backend._sync_domain(self._zone_domain(serial=2))
+
+        self.assertEqual(2, backend._rndc.call_count)
+        self.assertEqual(2, self._zone_serial())
+
+        with open(self.records_path) as fh:
+            self.assertIn('192.0.2.2', fh.read())
+
+    def test_create_record_bumps_serial(self):
+        backend = self._get_syncing_backend()
+
+        backend._sync_domain(self._zone_domain(serial=1))
+
+        # Central hands the backend the domain as it was before the serial
+        # increment, and then updates the domain with the new serial.
+        backend.central_service.get_domain_contents.return_value.append(
+            {'name': 'mail.example.com.', 'type': 'A', 'ttl': None,
+             'priority': None, 'data': '192.0.2.2'})
+        backend.create_record(self.admin_context, self._zone_domain(serial=1),
+                              {}, {})
+        backend.update_domain(self.admin_context, self._zone_domain(serial=2))
+
+        self.assertEqual(2, self._zone_serial())
+        self.assertEqual(call('reload', 'example.com.'),
+                         backend._rndc.call_args)
+
+        with open(self.records_path) as fh:
+            self.assertIn('192.0.2.2', fh.read())
+
+    def test_sync_domain_forced(self):
+        backend = self._get_syncing_backend()
+
+        backend._sync_domain(self._zone_domain(serial=1))
+        backend._sync_domain(self._zone_domain(serial=1), force=True)
+
+        self.assertEqual(2, backend._rndc.call_count)
+
+    def test_server_change_rewrites_headers_only(self):
+        backend = self._get_syncing_backend()
+        domain = self._zone_domain(serial=1)
+
+        backend._sync_domain(domain)
+        backend.central_service.get_domain_contents.reset_mock()
+        backend._rndc.reset_mock()
+
+        backend.central_service.find_servers.return_value = [
+            {'name': 'ns1.example.org.'}, {'name': 'ns2.example.org.'}]
+        backend.central_service.find_domains.return_value = [domain]
+
+        backend.create_server(self.admin_context, {})
+
+        self.assertFalse(backend.central_service.get_domain_contents.called)
+        backend._rndc.assert_called_once_with('reload', 'example.com.')
+
+        with open(self.zone_path) as fh:
+            self.assertIn('IN NS ns2.example.org.', fh.read())
+
+        # Finished, so no checkpoint is left behind
+        self.assertIsNone(backend._load_checkpoint())
+
+    def test_server_change_in_background(self):
+        backend = self._get_syncing_backend()
+        domain = self._zone_domain(serial=1)
+
+        backend._sync_domain(domain)
+        backend._flush_timer = MagicMock()
+        backend._rndc.reset_mock()
+
+        # The background rewrite reads through RPC, off central's storage
+        # session
+        central_api = self.useFixture(fixtures.MonkeyPatch(
+            'designate.backend.impl_bind9.central_api', MagicMock())).new_value
+        central_api.find_servers.return_value = [
+            {'name': 'ns1.example.org.'}, {'name': 'ns2.example.org.'}]
+        central_api.find_domains.return_value = [domain]
+
+        # The server change returns before any zone is rewritten
+        backend.create_server(self.admin_context, {})
+        backend.update_server(self.admin_context, {})
+
+        self.assertFalse(backend._rndc.called)
+
+        backend._server_change_thread.wait()
+
+        self.assertFalse(backend.central_service.find_domains.called)
+
+        # Both changes are handled by the one rewrite, which saw the
+        # servers as they are after the second
+        backend._rndc.assert_called_once_with('reload', 'example.com.')
+        self.assertIsNone(backend._server_change_thread)
+
+        with open(self.zone_path) as fh:
+            self.assertIn('IN NS ns2.example.org.', fh.read())
+
+    def test_server_change_resumes_from_checkpoint(self):
+        self.config(server_sync_batch_size=1, group='backend:bind9')
+        backend = self._get_syncing_backend()
+
+        domains = [self._zone_domain(serial=1),
+                   dict(self._zone_domain(serial=1),
+                        id='0d4b9a6e-1a0c-4d05-9a3d-2c1f3b6f7c21',
+                        name='example.org.')]
+        for domain in domains:
+            backend._sync_domain(domain)
+
+        backend.central_service.find_servers.return_value = [
+            {'name': 'ns2.example.org.'}]
+        backend.central_service.find_domains.side_effect = [
+            domains[:1], exceptions.Backend('interrupted')]
+
+        self.assertRaises(exceptions.Backend, backend.update_server,
+                          self.admin_context, {})
+        self.assertEqual({'servers': ['ns2.example.org.'],
+                          'marker': domains[0]['id']},
+                         backend._load_checkpoint())
+
+        backend.central_service.find_domains.side_effect = [domains[1:], []]
+        backend.update_server(self.admin_context, {})
+
+        backend.central_service.find_domains.assert_called_with(
+            backend.admin_context, marker=domains[1]['id'], limit=1)
+        self.assertIsNone(backend._load_checkpoint())
@@ -116,6 +116,32 @@ class MultiBackendTestCase(tests.TestCase, BackendTestMixin):
                           call.master.delete_domain(context, domain),
                           call.slave.create_domain(context, domain)])
 
+    def test_delete_domain_recreates_records(self):
+        # The records are recreated on the slave a page at a time
+        self.config(iter_chunk_size=1, group='service:central')
+
+        context = self.get_admin_context()
+        central_service = self.backend.central_service
+
+        central_service.create_server(context, self.get_server_fixture())
+        domain = central_service.create_domain(
+            context, self.get_domain_fixture())
+        recordset = central_service.create_recordset(
+            context, domain['id'],
+            self.get_recordset_fixture(domain['name']))
+
+        for fixture in range(2):
+            central_service.create_record(
+                context, domain['id'], recordset['id'],
+                self.get_record_fixture('A', fixture=fixture))
+
+        self.backend.master.delete_domain = MagicMock(
+            side_effect=exceptions.Backend)
+        self.assertRaises(exceptions.Backend, self.backend.delete_domain,
+                          context, domain)
+
+        self.assertEqual(2, self.backend.slave.create_record.call_count)
+
     def test_create_server(self):
         context = self.get_context()
         server = self.get_server_fixture()
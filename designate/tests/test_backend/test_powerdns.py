@@ -16,7 +16,9 @@
 
 import os
 from mock import MagicMock
+from mock import patch
 
+from designate import exceptions
 from designate import tests
 from designate.tests import DatabaseFixture
 from designate.tests.test_backend import BackendTestMixin
@@ -133,3 +135,113 @@ class PowerDNSBackendTestCase(tests.TestCase, BackendTestMixin):
         self.backend.create_server(context, server)
         self.backend.create_domain(context, domain)
         self.backend.delete_domain(context, domain)
+
+    def test_servers_cache(self):
+        context = self.get_context()
+        server = self.get_server_fixture()
+        domain = self.get_domain_fixture()
+        self.backend.create_server(context, server)
+        self.backend.create_domain(context, domain)
+        self.backend.update_domain(context, domain)
+
+        self.assertEqual(
+            1, self.backend.central_service.find_servers.call_count)
+
+        status = self.backend.ping(context)
+        self.assertEqual({'hits': 1, 'misses': 1}, status['servers_cache'])
+
+    def test_servers_cache_invalidated_by_server_change(self):
+        context = self.get_context()
+        server = self.get_server_fixture()
+        domain = self.get_domain_fixture()
+        self.backend.create_server(context, server)
+        self.backend.create_domain(context, domain)
+        self.backend.update_server(context, server)
+        self.backend.update_domain(context, domain)
+
+        self.assertEqual(
+            2, self.backend.central_service.find_servers.call_count)
+
+    def test_servers_cache_expiry(self):
+        self.config(servers_cache_ttl=0, group='backend:powerdns')
+
+        context = self.get_context()
+        server = self.get_server_fixture()
+        domain = self.get_domain_fixture()
+        self.backend.create_server(context, server)
+        self.backend.create_domain(context, domain)
+        self.backend.update_domain(context, domain)
+
+        self.assertEqual(
+            2, self.backend.central_service.find_servers.call_count)
+
+    def test_create_records(self):
+        context = self.get_context()
+        server = self.get_server_fixture()
+        domain = self.get_domain_fixture()
+        self.backend.create_server(context, server)
+        self.backend.create_domain(context, domain)
+
+        recordset = {'id': utils.generate_uuid(), 'name': domain['name'],
+                     'type': 'A', 'ttl': None}
+        records = [{'id': utils.generate_uuid(),
+                    'recordset_id': recordset['id'],
+                    'data': '192.0.2.%d' % i,
+                    'priority': None} for i in range(3)]
+
+        self.backend.create_records(context, domain, recordset, records)
+
+        query = self.backend.session.query(impl_powerdns.models.Record)
+        created = query.filter_by(type='A').all()
+
+        self.assertEqual(set(r['data'] for r in records),
+                         set(r.content for r in created))
+        self.assertEqual([domain['ttl']] * 3, [r.ttl for r in created])
+
+    def test_domain_id_cache(self):
+        context = self.get_context()
+        server = self.get_server_fixture()
+        domain = self.get_domain_fixture()
+        self.backend.create_server(context, server)
+        self.backend.create_domain(context, domain)
+
+        with patch.object(self.backend, '_get_domain') as get_domain:
+            self.backend.update_domain(context, domain)
+
+            self.assertFalse(get_domain.called)
+
+        self.backend.delete_domain(context, domain)
+
+        self.assertNotIn(domain['id'], self.backend._domain_ids)
+
+    def test_domain_id_cache_expires(self):
+        self.config(domain_ids_cache_ttl=0, group='backend:powerdns')
+
+        context = self.get_context()
+        server = self.get_server_fixture()
+        domain = self.get_domain_fixture()
+        self.backend.create_server(context, server)
+        self.backend.create_domain(context, domain)
+
+        with patch.object(self.backend, '_get_domain',
+                          wraps=self.backend._get_domain) as get_domain:
+            self.backend.update_domain(context, domain)
+
+            self.assertTrue(get_domain.called)
+
+    def test_domain_id_cache_stale(self):
+        context = self.get_context()
+        server = self.get_server_fixture()
+        domain = self.get_domain_fixture()
+        self.backend.create_server(context, server)
+        self.backend.create_domain(context, domain)
+
+        # As if another process deleted and created the domain again
+        self.backend._domain_ids[domain['id']] = (-1, float('inf'))
+
+        self.assertRaises(exceptions.RecordNotFound,
+                          self.backend.update_domain, context, domain)
+
+        # The stale id is dropped, so the next change looks it up afresh
+        self.assertNotIn(domain['id'], self.backend._domain_ids)
+        self.backend.update_domain(context, domain)
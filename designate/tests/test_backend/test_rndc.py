@@ -0,0 +1,280 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import base64
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+import fixtures
+import testtools
+
+from designate import exceptions
+from designate import tests
+from designate.backend import rndc
+
+SECRET = 'c2VjcmV0LXNoYXJlZC13aXRoLW5hbWVk'
+
+KEY_FILE = '''
+key "rndc-key" {
+    algorithm %s;
+    secret "%s";
+};
+'''
+
+
+class RNDCServerStub(object):
+    """ Speaks just enough of the control channel protocol to test against """
+    nonce = '4242'
+    # Close connections after this many commands, like an idle timeout would
+    max_commands = None
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.secret = base64.b64decode(SECRET)
+        self.commands = []
+        self.connections = 0
+        self.disconnects = 0
+
+    def _recv(self, sock, length):
+        data = ''
+
+        while len(data) < length:
+            chunk = sock.recv(length - len(data))
+
+            if not chunk:
+                return None
+
+            data += chunk
+
+        return data
+
+    def _reply(self, sock, request, data):
+        now = str(int(time.time()))
+
+        body = rndc.serialize([
+            ('_ctrl', [('_ser', request['_ctrl']['_ser']), ('_tim', now),
+                       ('_exp', now), ('_rpl', '1'),
+                       ('_nonce', self.nonce)]),
+            ('_data', data),
+        ])
+        message = rndc.serialize([
+            ('_auth', [rndc.sign(self.algorithm, self.secret, body)])]) + body
+
+        sock.sendall(struct.pack('>II', len(message) + 4, 1) + message)
+
+    def handle(self, sock, address):
+        self.connections += 1
+        authenticated = False
+
+        while True:
+            header = self._recv(sock, 8)
+
+            if header is None:
+                break
+
+            length, _ = struct.unpack('>II', header)
+            auth, body = rndc.split_auth(self._recv(sock, length - 4))
+
+            label, expected = rndc.sign(self.algorithm, self.secret, body)
+
+            if auth.get(label) != expected:
+                # named drops connections which fail authentication
+                break
+
+            request = rndc.parse(body)
+            command = request['_data']['type']
+
+            if not authenticated:
+                authenticated = True
+                self._reply(sock, request, [('type', command)])
+                continue
+
+            if request['_ctrl'].get('_nonce') != self.nonce:
+                break
+
+            self.commands.append(command)
+
+            if command.startswith('drop'):
+                # Executed, but the connection goes before the reply does
+                break
+            elif command.startswith('fail'):
+                self._reply(sock, request, [('type', command),
+                                            ('result', '1'),
+                                            ('err', 'failure')])
+            else:
+                self._reply(sock, request, [('type', command),
+                                            ('result', '0'),
+                                            ('text', 'ok')])
+
+            if len(self.commands) == self.max_commands:
+                break
+
+        sock.close()
+        self.disconnects += 1
+
+    def _serve(self):
+        while not self.stopped:
+            try:
+                sock, address = self.listener.accept()
+            except socket.timeout:
+                continue
+
+            sock.settimeout(None)
+
+            thread = threading.Thread(target=self.handle, args=(sock, address))
+            thread.daemon = True
+            thread.start()
+
+    def start(self):
+        # NOTE: The client blocks on its sockets, so the stub runs in a
+        #       thread of its own rather than a greenthread, which would
+        #       never get to run while the client waits on it.
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen(5)
+        self.listener.settimeout(0.1)
+        self.port = self.listener.getsockname()[1]
+
+        self.stopped = False
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.stopped = True
+        self.thread.join()
+        self.listener.close()
+
+
+class RNDCFixture(fixtures.Fixture):
+    def __init__(self, algorithm='hmac-sha256'):
+        super(RNDCFixture, self).__init__()
+        self.algorithm = algorithm
+
+    def setUp(self):
+        super(RNDCFixture, self).setUp()
+        self.server = RNDCServerStub(self.algorithm)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+        fd, self.key_file = tempfile.mkstemp()
+        os.write(fd, KEY_FILE % (self.algorithm, SECRET))
+        os.close(fd)
+        self.addCleanup(os.remove, self.key_file)
+
+
+class RNDCClientTestCase(tests.TestCase):
+    def _get_client(self, algorithm='hmac-sha256', **kwargs):
+        self.fixture = self.useFixture(RNDCFixture(algorithm))
+        return rndc.RNDCClient('127.0.0.1', self.fixture.server.port,
+                               self.fixture.key_file, timeout=5, **kwargs)
+
+    def test_parse_key_file(self):
+        fixture = self.useFixture(RNDCFixture('hmac-md5'))
+
+        name, algorithm, secret = rndc.parse_key_file(fixture.key_file)
+
+        self.assertEqual('rndc-key', name)
+        self.assertEqual('hmac-md5', algorithm)
+        self.assertEqual(base64.b64decode(SECRET), secret)
+
+    def test_parse_key_file_unsupported_algorithm(self):
+        fixture = self.useFixture(RNDCFixture('hmac-gost'))
+
+        with testtools.ExpectedException(exceptions.ConfigurationError):
+            rndc.parse_key_file(fixture.key_file)
+
+    def test_serialize_parse(self):
+        data = rndc.serialize([('_data', [('type', 'reload'),
+                                          ('result', '0')])])
+
+        self.assertEqual({'_data': {'type': 'reload', 'result': '0'}},
+                         rndc.parse(data))
+
+    def test_call(self):
+        client = self._get_client()
+
+        self.assertEqual('ok', client.call('reload', 'example.com.'))
+        self.assertEqual(['reload example.com.'],
+                         self.fixture.server.commands)
+
+    def test_call_md5(self):
+        client = self._get_client('hmac-md5')
+
+        client.call('reload', 'example.com.')
+        self.assertEqual(['reload example.com.'],
+                         self.fixture.server.commands)
+
+    def test_call_reuses_connection(self):
+        client = self._get_client()
+
+        client.call('reload', 'example.com.')
+        client.call('addzone', 'example.org. { type master; };')
+        client.call('delzone', 'example.com.')
+
+        self.assertEqual(3, len(self.fixture.server.commands))
+        self.assertEqual(1, self.fixture.server.connections)
+
+    def test_call_reconnects(self):
+        client = self._get_client()
+
+        self.fixture.server.max_commands = 1
+
+        client.call('reload', 'example.com.')
+
+        # Give the server a chance to close the connection
+        for _ in range(100):
+            if self.fixture.server.disconnects:
+                break
+            time.sleep(0.01)
+
+        client.call('reload', 'example.org.')
+
+        self.assertEqual(['reload example.com.', 'reload example.org.'],
+                         self.fixture.server.commands)
+        self.assertEqual(2, self.fixture.server.connections)
+
+    def test_call_lost_reply_not_retried(self):
+        client = self._get_client()
+
+        client.call('reload', 'example.com.')
+
+        with testtools.ExpectedException(exceptions.RNDCError):
+            client.call('drop')
+
+        # The command reached named, so it must not be sent again
+        self.assertEqual(['reload example.com.', 'drop'],
+                         self.fixture.server.commands)
+
+    def test_call_failure(self):
+        client = self._get_client()
+
+        with testtools.ExpectedException(exceptions.RNDCError):
+            client.call('fail')
+
+        # A failed command leaves the connection usable
+        client.call('reload', 'example.com.')
+        self.assertEqual(1, self.fixture.server.connections)
+
+    def test_call_bad_secret(self):
+        client = self._get_client()
+        client.secret = 'wrong'
+
+        with testtools.ExpectedException(exceptions.RNDCError):
+            client.call('reload', 'example.com.')
+
+        self.assertEqual([], self.fixture.server.commands)
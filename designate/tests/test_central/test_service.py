@@ -15,9 +15,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import random
+import eventlet
+import mock
 import testtools
+from oslo.config import cfg
 from designate.openstack.common import log as logging
+from designate.openstack.common import timeutils
 from designate import exceptions
+from designate.central import service
 from designate.tests.test_central import CentralTestCase
 
 LOG = logging.getLogger(__name__)
@@ -46,6 +51,43 @@ class CentralServiceTest(CentralTestCase):
         with testtools.ExpectedException(exceptions.InvalidDomainName):
             self.central_service._is_valid_domain_name(context, 'example.tld.')
 
+    def test_is_valid_domain_name_tlds(self):
+        context = self.get_context()
+
+        # Without any TLDs, any TLD is accepted
+        self.central_service._is_valid_domain_name(context, 'example.org.')
+
+        tld = self.create_tld(name='com')
+
+        # A newly created TLD is picked up straight away
+        self.central_service._is_valid_domain_name(context, 'example.com.')
+
+        with testtools.ExpectedException(exceptions.InvalidDomainName):
+            self.central_service._is_valid_domain_name(context,
+                                                       'example.org.')
+
+        tld_two = self.create_tld(name='co.uk')
+
+        with testtools.ExpectedException(exceptions.InvalidDomainName):
+            self.central_service._is_valid_domain_name(context, 'co.uk.')
+
+        # TLDs may have more than one label
+        self.central_service._is_valid_domain_name(context, 'example.co.uk.')
+
+        with testtools.ExpectedException(exceptions.InvalidDomainName):
+            self.central_service._is_valid_domain_name(context, 'example.uk.')
+
+        # Deleting the last TLD switches validation off again
+        self.central_service.delete_tld(self.admin_context, tld['id'])
+
+        with testtools.ExpectedException(exceptions.InvalidDomainName):
+            self.central_service._is_valid_domain_name(context,
+                                                       'example.com.')
+
+        self.central_service.delete_tld(self.admin_context, tld_two['id'])
+
+        self.central_service._is_valid_domain_name(context, 'example.org.')
+
     def test_is_valid_recordset_name(self):
         self.config(max_recordset_name_len=18,
                     group='service:central')
@@ -103,6 +145,59 @@ class CentralServiceTest(CentralTestCase):
             context, 'blacklisted.org.')
         self.assertTrue(result)
 
+    def test_is_blacklisted_domain_name_cached(self):
+        blacklist = self.create_blacklist(pattern='example.org.')
+
+        context = self.get_context()
+
+        self.assertTrue(self.central_service._is_blacklisted_domain_name(
+            context, 'example.org.'))
+
+        matcher = self.central_service._blacklist_matcher
+
+        # Without changes to the blacklists, the compiled matcher is reused
+        self.assertTrue(self.central_service._is_blacklisted_domain_name(
+            context, 'www.example.org.'))
+        self.assertIs(matcher, self.central_service._blacklist_matcher)
+
+        # Changing a blacklist invalidates it
+        self.central_service.update_blacklist(
+            self.admin_context, blacklist['id'], {'pattern': 'example.net.'})
+
+        self.assertFalse(self.central_service._is_blacklisted_domain_name(
+            context, 'example.org.'))
+        self.assertTrue(self.central_service._is_blacklisted_domain_name(
+            context, 'example.net.'))
+        self.assertIsNot(matcher, self.central_service._blacklist_matcher)
+
+        # As does deleting one
+        self.central_service.delete_blacklist(
+            self.admin_context, blacklist['id'])
+
+        self.assertFalse(self.central_service._is_blacklisted_domain_name(
+            context, 'example.net.'))
+
+    def test_blacklist_matcher(self):
+        matcher = service.BlacklistMatcher([
+            'example.org.',
+            '^blacklisted.org.$',
+            '(www|mail).example.com.$',
+            '(?i)^CASE.example.com.$',
+        ])
+
+        # Only the patterns without groups or flags are combined
+        self.assertEqual(3, len(matcher.regexes))
+
+        self.assertTrue(matcher.match('www.example.org.'))
+        self.assertTrue(matcher.match('blacklisted.org.'))
+        self.assertFalse(matcher.match('www.blacklisted.org.'))
+        self.assertTrue(matcher.match('mail.example.com.'))
+        self.assertFalse(matcher.match('ftp.example.com.'))
+        self.assertTrue(matcher.match('case.example.com.'))
+        self.assertFalse(matcher.match('example.com.'))
+
+        self.assertFalse(service.BlacklistMatcher([]).match('example.org.'))
+
     def test_is_subdomain(self):
         context = self.get_context()
 
@@ -123,6 +218,13 @@ class CentralServiceTest(CentralTestCase):
                                                     'www.example.org.')
         self.assertTrue(result)
 
+        # The closest parent domain is returned
+        sub_domain = self.create_domain(name='sub.example.org.')
+
+        result = self.central_service._is_subdomain(
+            context, 'a.b.c.www.sub.example.org.')
+        self.assertEqual(sub_domain['id'], result['id'])
+
     def test_is_valid_recordset_placement_subdomain(self):
         context = self.get_context()
 
@@ -681,6 +783,20 @@ class CentralServiceTest(CentralTestCase):
 
         self.assertTrue(len(servers) > 0)
 
+    def test_get_domain_contents(self):
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain)
+        record = self.create_record(domain, recordset)
+
+        contents = self.central_service.get_domain_contents(
+            self.admin_context, domain['id'])
+
+        self.assertEqual(1, len(contents))
+        self.assertEqual(record['id'], contents[0]['id'])
+        self.assertEqual(record['data'], contents[0]['data'])
+        self.assertEqual(recordset['name'], contents[0]['name'])
+        self.assertEqual(recordset['type'], contents[0]['type'])
+
     def test_find_domain(self):
         # Create a domain
         domain_name = '%d.example.com.' % random.randint(10, 1000)
@@ -844,6 +960,197 @@ class CentralServiceTest(CentralTestCase):
         # Ensure the serial was incremented
         self.assertTrue(domain['serial'] > expected_domain['serial'])
 
+    # Zone Import Tests
+    def _get_zonefile(self, name, records):
+        zonefile = ['$ORIGIN %s' % name,
+                    '%s 3600 IN SOA ns1.example.org. nsadmin.example.org. '
+                    '1 7200 3600 2419200 10800' % name]
+        zonefile.extend(records)
+
+        return '\n'.join(zonefile) + '\n'
+
+    def _create_zone_import(self, zonefile):
+        # Run the import straight away, rather than in the background
+        with mock.patch.object(self.central_service.tg, 'add_thread',
+                               side_effect=lambda f, *a: f(*a)):
+            zone_import = self.central_service.create_zone_import(
+                self.admin_context, zonefile)
+
+        return self.central_service.get_zone_import(
+            self.admin_context, zone_import['id'])
+
+    def test_create_zone_import(self):
+        self.config(zone_import_batch_size=1, group='service:central')
+        self.create_server()
+
+        values = self.get_domain_fixture()
+        zonefile = self._get_zonefile(values['name'], [
+            'www.%s 600 IN A 192.0.2.1' % values['name'],
+            'www.%s 600 IN A 192.0.2.2' % values['name'],
+            'mail.%s 600 IN A 192.0.2.3' % values['name'],
+        ])
+
+        with mock.patch.object(self.central_service.backend,
+                               'create_domain') as create_domain:
+            zone_import = self._create_zone_import(zonefile)
+
+        self.assertEqual('COMPLETE', zone_import['status'])
+        self.assertEqual(3, zone_import['records_total'])
+        self.assertEqual(3, zone_import['records_imported'])
+
+        domain = self.central_service.get_domain(
+            self.admin_context, zone_import['domain_id'])
+        self.assertEqual(values['name'], domain['name'])
+        self.assertEqual('ACTIVE', domain['status'])
+
+        # The backend only learns of the domain once it's complete
+        self.assertEqual(1, create_domain.call_count)
+        self.assertEqual('ACTIVE', create_domain.call_args[0][1]['status'])
+
+        records = self.central_service.find_records(
+            self.admin_context, {'domain_id': domain['id']})
+        self.assertEqual(3, len(records))
+
+    def test_create_zone_import_malformed(self):
+        zone_import = self._create_zone_import('$ORIGIN example.com.\n'
+                                               'example.com. IN SOA (\n')
+
+        self.assertEqual('ERROR', zone_import['status'])
+        self.assertEqual('Malformed zonefile.', zone_import['message'])
+        self.assertIsNone(zone_import['domain_id'])
+
+    def test_create_zone_import_invalid(self):
+        self.create_server()
+
+        values = self.get_domain_fixture()
+        zonefile = self._get_zonefile(values['name'], [
+            'www.%s 600 IN A 192.0.2.1' % values['name'],
+            # A CNAME conflicting with the recordset above
+            'www.%s 600 IN CNAME %s' % (values['name'], values['name']),
+        ])
+
+        zone_import = self._create_zone_import(zonefile)
+
+        self.assertEqual('ERROR', zone_import['status'])
+        self.assertIsNotNone(zone_import['message'])
+
+        # The zone is checked before anything is stored
+        domains = self.central_service.find_domains(
+            self.admin_context, {'name': values['name']})
+        self.assertEqual(0, len(domains))
+
+    def test_create_zone_import_failure(self):
+        self.config(zone_import_batch_size=1, group='service:central')
+        self.create_server()
+
+        values = self.get_domain_fixture()
+        zonefile = self._get_zonefile(values['name'], [
+            'www.%s 600 IN A 192.0.2.1' % values['name'],
+            'mail.%s 600 IN A 192.0.2.2' % values['name'],
+        ])
+
+        # Fail the second batch, after the first one was stored
+        store_zone_import_batch = self.central_service.\
+            _store_zone_import_batch
+        calls = []
+
+        def store_then_fail(*args):
+            if calls:
+                raise exceptions.Base('Failed')
+
+            calls.append(args)
+            return store_zone_import_batch(*args)
+
+        with mock.patch.object(self.central_service,
+                               '_store_zone_import_batch',
+                               side_effect=store_then_fail):
+            zone_import = self._create_zone_import(zonefile)
+
+        self.assertEqual('ERROR', zone_import['status'])
+        self.assertEqual('Failed', zone_import['message'])
+        self.assertEqual(0, zone_import['records_imported'])
+        self.assertIsNone(zone_import['domain_id'])
+
+        # Nothing of the zone is left behind
+        domains = self.central_service.find_domains(
+            self.admin_context, {'name': values['name']})
+        self.assertEqual(0, len(domains))
+
+    def test_create_zone_import_backend_failure(self):
+        self.create_server()
+
+        values = self.get_domain_fixture()
+        zonefile = self._get_zonefile(values['name'], [
+            'www.%s 600 IN A 192.0.2.1' % values['name'],
+        ])
+
+        with mock.patch.object(self.central_service.backend,
+                               'create_records',
+                               side_effect=exceptions.Backend()):
+            with mock.patch.object(self.central_service.backend,
+                                   'delete_domain') as delete_domain:
+                zone_import = self._create_zone_import(zonefile)
+
+        self.assertEqual('ERROR', zone_import['status'])
+
+        # The domain is removed from the backend and storage again
+        self.assertEqual(1, delete_domain.call_count)
+
+        domains = self.central_service.find_domains(
+            self.admin_context, {'name': values['name']})
+        self.assertEqual(0, len(domains))
+
+    def test_create_zone_import_failure_message(self):
+        self.create_server()
+
+        values = self.get_domain_fixture()
+        zonefile = self._get_zonefile(values['name'], [])
+
+        # A byte string message, which isn't ASCII
+        with mock.patch.object(self.central_service.backend,
+                               'create_domain',
+                               side_effect=exceptions.Backend('\xc3\xa9chec')):
+            zone_import = self._create_zone_import(zonefile)
+
+        self.assertEqual('ERROR', zone_import['status'])
+        self.assertEqual(u'\xe9chec', zone_import['message'])
+
+    def test_create_zone_import_over_quota(self):
+        self.config(quota_domain_records=1)
+        self.create_server()
+
+        values = self.get_domain_fixture()
+        zonefile = self._get_zonefile(values['name'], [
+            'www.%s 600 IN A 192.0.2.1' % values['name'],
+            'www.%s 600 IN A 192.0.2.2' % values['name'],
+        ])
+
+        zone_import = self._create_zone_import(zonefile)
+
+        self.assertEqual('ERROR', zone_import['status'])
+
+        # Nothing of the zone is left behind
+        domains = self.central_service.find_domains(
+            self.admin_context, {'name': values['name']})
+        self.assertEqual(0, len(domains))
+
+    def test_fail_abandoned_zone_imports(self):
+        self.config(zone_import_timeout=0, group='service:central')
+
+        # Never run the import, as if central went away meanwhile
+        with mock.patch.object(self.central_service.tg, 'add_thread'):
+            zone_import = self.central_service.create_zone_import(
+                self.admin_context, self._get_zonefile('example.com.', []))
+
+        self.central_service._fail_abandoned_zone_imports()
+
+        zone_import = self.central_service.get_zone_import(
+            self.admin_context, zone_import['id'])
+
+        self.assertEqual('ERROR', zone_import['status'])
+        self.assertEqual('The import stopped making progress',
+                         zone_import['message'])
+
     # RecordSet Tests
     def test_create_recordset(self):
         domain = self.create_domain()
@@ -862,6 +1169,83 @@ class CentralServiceTest(CentralTestCase):
         self.assertEqual(recordset['name'], values['name'])
         self.assertEqual(recordset['type'], values['type'])
 
+    def test_create_recordsets_bulk(self):
+        domain = self.create_domain()
+
+        values_list = [
+            dict(name='www.%s' % domain['name'], type='A'),
+            dict(name='www.%s' % domain['name'], type='AAAA'),
+            dict(name='mail.%s' % domain['name'], type='A'),
+        ]
+
+        recordsets = self.central_service.create_recordsets_bulk(
+            self.admin_context, domain['id'], values_list)
+
+        # Ensure a recordset was created for each item, in order
+        self.assertEqual(3, len(recordsets))
+
+        for values, recordset in zip(values_list, recordsets):
+            self.assertIsNotNone(recordset['id'])
+            self.assertEqual(values['name'], recordset['name'])
+            self.assertEqual(values['type'], recordset['type'])
+
+    def test_create_recordsets_bulk_single_backend_call(self):
+        domain = self.create_domain()
+
+        values_list = [
+            dict(name='www.%s' % domain['name'], type='A'),
+            dict(name='mail.%s' % domain['name'], type='A'),
+        ]
+
+        with mock.patch.object(self.central_service.backend,
+                               'create_recordsets') as create_recordsets:
+            recordsets = self.central_service.create_recordsets_bulk(
+                self.admin_context, domain['id'], values_list)
+
+        self.assertEqual(1, create_recordsets.call_count)
+        self.assertEqual(recordsets, create_recordsets.call_args[0][2])
+
+    def test_create_recordsets_bulk_backend_failure(self):
+        domain = self.create_domain()
+
+        values_list = [
+            dict(name='www.%s' % domain['name'], type='A'),
+            dict(name='mail.%s' % domain['name'], type='A'),
+        ]
+
+        with mock.patch.object(self.central_service.backend,
+                               'create_recordsets',
+                               side_effect=exceptions.Backend()):
+            with testtools.ExpectedException(exceptions.Backend):
+                self.central_service.create_recordsets_bulk(
+                    self.admin_context, domain['id'], values_list)
+
+        # Ensure none of the recordsets were created
+        recordsets = self.central_service.find_recordsets(
+            self.admin_context, {'domain_id': domain['id'], 'type': 'A'})
+
+        self.assertEqual(0, len(recordsets))
+
+    def test_create_recordsets_bulk_invalid(self):
+        domain = self.create_domain()
+
+        values_list = [
+            dict(name='www.%s' % domain['name'], type='A'),
+            dict(name='www.%s' % domain['name'], type='CNAME'),
+        ]
+
+        with testtools.ExpectedException(
+                exceptions.InvalidRecordSetLocation):
+            self.central_service.create_recordsets_bulk(
+                self.admin_context, domain['id'], values_list)
+
+        # Ensure none of the recordsets were created
+        recordsets = self.central_service.find_recordsets(
+            self.admin_context, {'domain_id': domain['id'],
+                                 'name': 'www.%s' % domain['name']})
+
+        self.assertEqual(0, len(recordsets))
+
     # def test_create_recordset_over_quota(self):
     #     self.config(quota_domain_recordsets=1)
 
@@ -1172,6 +1556,85 @@ class CentralServiceTest(CentralTestCase):
 
         self.assertEqual(domain['serial'], updated_domain['serial'])
 
+    def test_create_records_bulk(self):
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain, type='A')
+
+        values_list = [dict(data='192.0.2.%d' % i) for i in range(3)]
+
+        with mock.patch.object(self.central_service.backend,
+                               'update_domain') as update_domain:
+            records = self.central_service.create_records_bulk(
+                self.admin_context, domain['id'], recordset['id'],
+                values_list)
+
+        # Ensure a record was created for each item, in order
+        self.assertEqual(3, len(records))
+
+        for values, record in zip(values_list, records):
+            self.assertIsNotNone(record['id'])
+            self.assertEqual(values['data'], record['data'])
+
+        # The serial is incremented only once
+        self.assertEqual(1, update_domain.call_count)
+
+    def test_create_records_bulk_over_quota(self):
+        self.config(quota_domain_records=3)
+
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain)
+
+        self.create_record(domain, recordset)
+
+        values_list = [dict(data='192.0.2.%d' % i) for i in range(3)]
+
+        with testtools.ExpectedException(exceptions.OverQuota):
+            self.central_service.create_records_bulk(
+                self.admin_context, domain['id'], recordset['id'],
+                values_list)
+
+        records = self.central_service.find_records(
+            self.admin_context, {'recordset_id': recordset['id']})
+
+        self.assertEqual(1, len(records))
+
+    def test_create_records_coalesces_serial_increments(self):
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain, type='A')
+
+        with mock.patch.object(self.central_service.backend,
+                               'update_domain') as update_domain:
+            with self.central_service._serial_unit_of_work():
+                for index in range(3):
+                    self.central_service.create_record(
+                        self.admin_context, domain['id'], recordset['id'],
+                        values={'data': '192.0.2.%d' % index})
+
+                # Nothing is applied until the unit of work ends
+                self.assertFalse(update_domain.called)
+
+        # The serial is incremented, and the backend updated, only once
+        self.assertEqual(1, update_domain.call_count)
+
+        updated_domain = self.central_service.get_domain(
+            self.admin_context, domain['id'])
+
+        self.assertTrue(updated_domain['serial'] > domain['serial'])
+
+    def test_serial_increment_failure_keeps_original_exception(self):
+        domain = self.create_domain()
+        recordset = self.create_recordset(domain, type='A')
+
+        with mock.patch.object(self.central_service.backend, 'update_domain',
+                               side_effect=exceptions.Backend()):
+            with testtools.ExpectedException(exceptions.BadRequest):
+                with self.central_service._serial_unit_of_work():
+                    self.central_service.create_record(
+                        self.admin_context, domain['id'], recordset['id'],
+                        values={'data': '192.0.2.1'})
+
+                    raise exceptions.BadRequest()
+
     def test_get_record(self):
         domain = self.create_domain()
         recordset = self.create_recordset(domain)
@@ -1581,6 +2044,32 @@ class CentralServiceTest(CentralTestCase):
         self.assertEqual(fip_ptr['address'], fips[0]['address'])
         self.assertEqual(fip_ptr['description'], fips[0]['description'])
 
+    def test_list_floatingips_with_record_single_query(self):
+        self.create_server()
+
+        context = self.get_context(tenant='a')
+
+        fixture = self.get_ptr_fixture()
+
+        fip = self.network_api.fake.allocate_floatingip(context.tenant_id)
+
+        fip_ptr = self.central_service.update_floatingip(
+            context, fip['region'], fip['id'], fixture)
+
+        # The TTL comes along with the record, rather than being looked up
+        # from its recordset or domain
+        storage_api = self.central_service.storage_api
+
+        with mock.patch.object(storage_api, 'get_recordset') as get_rs:
+            with mock.patch.object(storage_api, 'get_domain') as get_domain:
+                fips = self.central_service.list_floatingips(context)
+
+        self.assertFalse(get_rs.called)
+        self.assertFalse(get_domain.called)
+
+        self.assertEqual(fip_ptr['ttl'], fips[0]['ttl'])
+        self.assertEqual(fip_ptr['ptrdname'], fips[0]['ptrdname'])
+
     def test_list_floatingips_deallocated_and_invalidate(self):
         self.create_server()
 
@@ -1623,6 +2112,34 @@ class CentralServiceTest(CentralTestCase):
         with testtools.ExpectedException(exceptions.RecordNotFound):
             self.central_service.find_record(elevated_a, criterion)
 
+    def test_list_floatingips_invalidate_coalesces_serial_increments(self):
+        self.create_server()
+
+        context_a = self.get_context(tenant='a')
+        context_b = self.get_context(tenant='b')
+
+        fixture = self.get_ptr_fixture()
+
+        # Two FIPs with records in the same reverse zone, both of which are
+        # then given to tenant b
+        fips = [self.network_api.fake.allocate_floatingip(context_a.tenant_id)
+                for _ in range(2)]
+
+        for fip in fips:
+            self.central_service.update_floatingip(
+                context_a, fip['region'], fip['id'], fixture)
+            self.network_api.fake.deallocate_floatingip(fip['id'])
+            self.network_api.fake.allocate_floatingip(
+                context_b.tenant_id, fip['id'])
+
+        with mock.patch.object(self.central_service.backend,
+                               'update_domain') as update_domain:
+            self.central_service.list_floatingips(context_b)
+
+        # Both records are deleted, but the serial is incremented, and the
+        # backend updated, only once
+        self.assertEqual(1, update_domain.call_count)
+
     def test_set_floatingip(self):
         self.create_server()
 
@@ -1718,6 +2235,130 @@ class CentralServiceTest(CentralTestCase):
         self.central_service.get_floatingip(
             context, fip['region'], fip['id'])
 
+    # Sync Tests
+    def _sync_domains(self, marker=None):
+        # Run the sync straight away, rather than in the background
+        with mock.patch.object(self.central_service.tg, 'add_thread',
+                               side_effect=lambda f, *a: f(*a)):
+            self.central_service.sync_domains(self.admin_context, marker)
+
+        return self.central_service.get_domain_sync_status(
+            self.admin_context)
+
+    def test_sync_domains(self):
+        domains = [self.create_domain(fixture=i) for i in range(3)]
+
+        with mock.patch.object(self.central_service.backend,
+                               'sync_domain') as sync_domain:
+            status = self._sync_domains()
+
+        self.assertEqual('COMPLETE', status['status'])
+        self.assertEqual(3, status['total'])
+        self.assertEqual(3, status['synced'])
+        self.assertEqual([], status['failed'])
+        self.assertEqual(domains[-1]['id'], status['marker'])
+        self.assertEqual(3, sync_domain.call_count)
+
+    def test_sync_domains_failure(self):
+        domains = [self.create_domain(fixture=i) for i in range(3)]
+
+        def sync_domain(context, domain, records):
+            if domain['id'] == domains[1]['id']:
+                raise exceptions.Backend('Sync failed')
+
+        with mock.patch.object(self.central_service.backend, 'sync_domain',
+                               side_effect=sync_domain):
+            status = self._sync_domains()
+
+        # A failed domain doesn't stop the others being synchronised
+        self.assertEqual('COMPLETE', status['status'])
+        self.assertEqual(2, status['synced'])
+        self.assertEqual([domains[1]['id']], status['failed'])
+
+    def test_sync_domains_resume(self):
+        domains = [self.create_domain(fixture=i) for i in range(3)]
+
+        with mock.patch.object(self.central_service.backend,
+                               'sync_domain') as sync_domain:
+            status = self._sync_domains(marker=domains[0]['id'])
+
+        self.assertEqual('COMPLETE', status['status'])
+        self.assertEqual(2, status['synced'])
+        self.assertEqual(sorted(d['id'] for d in domains[1:]),
+                         sorted(c[0][1]['id']
+                                for c in sync_domain.call_args_list))
+
+    def _count_concurrent_syncs(self):
+        for i in range(3):
+            self.create_domain(fixture=i)
+
+        syncs = {'running': 0, 'max': 0}
+
+        def sync_domain(context, domain, records):
+            syncs['running'] += 1
+            syncs['max'] = max(syncs['max'], syncs['running'])
+            eventlet.sleep(0.01)
+            syncs['running'] -= 1
+
+        with mock.patch.object(self.central_service.backend, 'sync_domain',
+                               side_effect=sync_domain):
+            status = self._sync_domains()
+
+        self.assertEqual('COMPLETE', status['status'])
+        self.assertEqual(3, status['synced'])
+
+        return syncs['max']
+
+    def test_sync_domains_concurrent(self):
+        self.config(sync_concurrency=3, group='service:central')
+
+        self.assertEqual(3, self._count_concurrent_syncs())
+
+    def test_sync_domains_serialised(self):
+        # Backends which can't sync several domains at once get one at a
+        # time, whatever sync_concurrency is set to
+        self.config(sync_concurrency=3, group='service:central')
+        self.central_service.backend.concurrent_syncs = False
+
+        self.assertEqual(1, self._count_concurrent_syncs())
+
+    def test_sync_domains_in_progress(self):
+        self.create_domain()
+
+        # Leave the sync pending
+        with mock.patch.object(self.central_service.tg, 'add_thread'):
+            self.central_service.sync_domains(self.admin_context)
+
+        with testtools.ExpectedException(exceptions.DomainSyncInProgress):
+            self.central_service.sync_domains(self.admin_context)
+
+    def test_sync_domains_abandoned(self):
+        self.create_domain()
+
+        timeutils.set_time_override()
+        self.addCleanup(timeutils.clear_time_override)
+
+        # Leave the sync pending, as if its worker went away
+        with mock.patch.object(self.central_service.tg, 'add_thread'):
+            self.central_service.sync_domains(self.admin_context)
+
+        timeutils.advance_time_seconds(
+            2 * cfg.CONF['service:central'].sync_timeout + 1)
+
+        status = self.central_service.get_domain_sync_status(
+            self.admin_context)
+        self.assertEqual('ERROR', status['status'])
+
+        # A sync which stopped making progress doesn't block a new one
+        with mock.patch.object(self.central_service.backend, 'sync_domain'):
+            status = self._sync_domains()
+
+        self.assertEqual('COMPLETE', status['status'])
+
+    def test_get_domain_sync_status_missing(self):
+        with testtools.ExpectedException(exceptions.NotFound):
+            self.central_service.get_domain_sync_status(self.admin_context)
+
     # Blacklist Tests
     def test_create_blacklist(self):
         values = self.get_blacklist_fixture(fixture=0)
@@ -15,6 +15,7 @@
 # under the License.
 from designate import exceptions
 from designate.network_api import get_network_api
+from designate.network_api import neutron
 from designate.tests import TestCase
 
 from neutronclient.v2_0 import client as clientv20
@@ -51,3 +52,71 @@ class NeutronAPITest(TestCase):
         with testtools.ExpectedException(
                 exceptions.NeutronCommunicationFailure):
             self.api.list_floatingips(context)
+
+    @patch.object(clientv20.Client, 'list_floatingips',
+                  return_value={'floatingips': []})
+    def test_clients_reused(self, _):
+        context = self.get_context(tenant='a', auth_token='test')
+
+        with patch.object(neutron, 'get_client',
+                          wraps=neutron.get_client) as get_client:
+            self.api.list_floatingips(context)
+
+            # A later request with the same token reuses the client
+            self.api.list_floatingips(context)
+            self.assertEqual(1, get_client.call_count)
+
+            # Clients are never shared between tokens
+            context = self.get_context(tenant='b', auth_token='other')
+            self.api.list_floatingips(context)
+            self.assertEqual(2, get_client.call_count)
+
+    @patch.object(clientv20.Client, 'list_floatingips', return_value={
+        'floatingips': [{'id': 'fip', 'floating_ip_address': '192.0.2.1'}]})
+    def test_cache(self, list_floatingips):
+        context = self.get_context(tenant='a', auth_token='test')
+
+        fips = self.api.list_floatingips(context, cached=True)
+        self.assertEqual(fips, self.api.list_floatingips(context,
+                                                         cached=True))
+        self.assertEqual(1, list_floatingips.call_count)
+
+        # Floating ips are fetched again after a change
+        self.api.invalidate_floatingips(floatingip_id='fip')
+        self.assertEqual(fips, self.api.list_floatingips(context,
+                                                         cached=True))
+        self.assertEqual(2, list_floatingips.call_count)
+
+    @patch.object(clientv20.Client, 'list_floatingips',
+                  return_value={'floatingips': []})
+    def test_cache_bypassed(self, list_floatingips):
+        context = self.get_context(tenant='a', auth_token='test')
+
+        self.api.list_floatingips(context, cached=True)
+
+        # Unless asked for, the current floating ips are always fetched
+        self.api.list_floatingips(context)
+        self.assertEqual(2, list_floatingips.call_count)
+
+    @patch.object(clientv20.Client, 'list_floatingips',
+                  return_value={'floatingips': []})
+    def test_cache_disabled(self, list_floatingips):
+        self.config(cache_ttl=0, group='network_api:neutron')
+        context = self.get_context(tenant='a', auth_token='test')
+
+        self.api.list_floatingips(context, cached=True)
+        self.api.list_floatingips(context, cached=True)
+
+        self.assertEqual(2, list_floatingips.call_count)
+
+    @patch.object(clientv20.Client, 'list_floatingips',
+                  return_value={'floatingips': []})
+    def test_metrics(self, _):
+        context = self.get_context(tenant='a', auth_token='test')
+
+        self.api.list_floatingips(context)
+
+        metrics = self.api.get_metrics()
+        self.assertEqual(['RegionOne'], metrics.keys())
+        self.assertEqual(1, metrics['RegionOne']['calls'])
+        self.assertEqual(0, metrics['RegionOne']['failures'])
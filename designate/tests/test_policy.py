@@ -0,0 +1,140 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import mock
+import testtools
+
+from designate.openstack.common import policy as common_policy
+from designate.tests import TestCase
+from designate import exceptions
+from designate import policy
+
+
+class PolicyTestCase(TestCase):
+    def setUp(self):
+        super(PolicyTestCase, self).setUp()
+
+        self.policy({
+            'owner': 'tenant_id:%(tenant_id)s',
+            'admin': 'role:admin',
+            'admin_or_owner': 'rule:admin or rule:owner',
+            'remote': 'http://localhost/check',
+            'role_of_target': 'role:%(role)s',
+        })
+
+        self.context = self.get_context(tenant='12345', roles=['member'])
+
+        patcher = mock.patch.object(common_policy, 'check',
+                                    wraps=common_policy.check)
+        self.check = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_check(self):
+        self.assertTrue(policy.check('admin_or_owner', self.context,
+                                     {'tenant_id': '12345'}))
+
+        with testtools.ExpectedException(exceptions.Forbidden):
+            policy.check('admin_or_owner', self.context,
+                         {'tenant_id': '54321'})
+
+        self.assertFalse(policy.check('admin_or_owner', self.context,
+                                      {'tenant_id': '54321'}, exc=None))
+
+    def test_check_cached(self):
+        for _ in range(3):
+            policy.check('admin_or_owner', self.context,
+                         {'tenant_id': '12345', 'domain_id': '1'})
+
+        # Target fields the rule does not reference share a decision
+        policy.check('admin_or_owner', self.context,
+                     {'tenant_id': '12345', 'domain_id': '2'})
+
+        self.assertEqual(1, self.check.call_count)
+
+    def test_check_cached_per_credentials(self):
+        target = {'tenant_id': '12345'}
+
+        policy.check('admin', self.get_context(roles=['admin']), target)
+
+        with testtools.ExpectedException(exceptions.Forbidden):
+            policy.check('admin', self.context, target)
+
+        self.assertEqual(2, self.check.call_count)
+
+    def test_check_cached_without_context_dict(self):
+        target = {'tenant_id': '12345'}
+
+        with mock.patch.object(self.context, 'to_dict',
+                               wraps=self.context.to_dict) as to_dict:
+            for _ in range(3):
+                policy.check('admin_or_owner', self.context, target)
+
+        # Only built for the decision which wasn't cached yet
+        self.assertEqual(1, to_dict.call_count)
+
+    def test_check_cached_per_role_target_field(self):
+        policy.check('role_of_target', self.context, {'role': 'member'},
+                     exc=None)
+        policy.check('role_of_target', self.context, {'role': 'admin'},
+                     exc=None)
+
+        self.assertEqual(2, self.check.call_count)
+
+    def test_check_uncacheable(self):
+        with mock.patch.object(common_policy.HttpCheck, '__call__',
+                               return_value=True):
+            policy.check('remote', self.context)
+            policy.check('remote', self.context)
+
+        self.assertEqual(2, self.check.call_count)
+
+    def test_check_rules_changed(self):
+        target = {'tenant_id': '12345'}
+
+        policy.check('owner', self.context, target)
+
+        self.policy({'owner': '!'})
+
+        with testtools.ExpectedException(exceptions.Forbidden):
+            policy.check('owner', self.context, target)
+
+    def test_check_cache_disabled(self):
+        self.config(policy_cache_size=0)
+        policy._flush_cache()
+
+        policy.check('owner', self.context, {'tenant_id': '12345'})
+        policy.check('owner', self.context, {'tenant_id': '12345'})
+
+        self.assertEqual(2, self.check.call_count)
+
+    def test_init_policy_flushes_cache(self):
+        policy.check('owner', self.context, {'tenant_id': '12345'})
+        policy.init_policy()
+        policy.check('owner', self.context, {'tenant_id': '12345'})
+
+        self.assertEqual(2, self.check.call_count)
+
+    def test_audit_sampled(self):
+        self.config(policy_audit_sample_rate=2)
+
+        with mock.patch.object(policy.LOG, 'audit') as audit:
+            for _ in range(4):
+                policy.check('owner', self.context, {'tenant_id': '12345'})
+
+            self.assertEqual(2, audit.call_count)
+
+            # Failures are always logged
+            policy.check('owner', self.context, {'tenant_id': '54321'},
+                         exc=None)
+
+            self.assertEqual(3, audit.call_count)
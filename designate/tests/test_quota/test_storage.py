@@ -13,6 +13,8 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import mock
+
 from designate import quota
 from designate import tests
 from designate.openstack.common import log as logging
@@ -91,3 +93,37 @@ class StorageQuotaTest(tests.TestCase):
 
         quotas = self.quota.storage_api.find_quotas(context, criterion)
         self.assertEqual(0, len(quotas))
+
+    def test_get_quotas_cached(self):
+        context = self.get_admin_context()
+        context.all_tenants = True
+
+        self.quota.set_quota(context, 'tenant_id', 'domains', 1500)
+
+        with mock.patch.object(self.quota.storage_api, 'find_quotas',
+                               wraps=self.quota.storage_api.find_quotas) \
+                as find_quotas:
+            self.quota.get_quotas(context, 'tenant_id')
+            quotas = self.quota.get_quotas(context, 'tenant_id')
+
+            self.assertEqual(1500, quotas['domains'])
+            self.assertEqual(1, find_quotas.call_count)
+
+            # Changing a quota invalidates the cache
+            self.quota.set_quota(context, 'tenant_id', 'domains', 1234)
+            quotas = self.quota.get_quotas(context, 'tenant_id')
+
+            self.assertEqual(1234, quotas['domains'])
+
+    def test_get_quotas_cache_bounded(self):
+        self.config(quota_cache_size=2)
+        self.quota = quota.get_quota()
+
+        context = self.get_admin_context()
+        context.all_tenants = True
+
+        for tenant_id in ('tenant_a', 'tenant_b', 'tenant_c'):
+            self.quota.get_quotas(context, tenant_id)
+
+        # Only the most recently used tenants are kept
+        self.assertEqual(2, len(self.quota._quotas))
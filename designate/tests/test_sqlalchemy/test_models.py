@@ -0,0 +1,82 @@
+# Copyright 2014 Hewlett-Packard Development Company, L.P.
+#
+# Author: Kiall Mac Innes <kiall@hp.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import time
+
+from sqlalchemy.orm import object_mapper
+
+from designate.openstack.common import log as logging
+from designate.storage.impl_sqlalchemy import models
+from designate.tests import TestCase
+from designate import utils
+
+LOG = logging.getLogger(__name__)
+
+
+class ModelsTestCase(TestCase):
+    def _get_record(self, **values):
+        values.setdefault('id', utils.generate_uuid())
+        values.setdefault('domain_id', utils.generate_uuid())
+        values.setdefault('recordset_id', utils.generate_uuid())
+        values.setdefault('data', '192.0.2.1')
+
+        return models.Record(**values)
+
+    def test_dict(self):
+        record = self._get_record(data='192.0.2.2', priority=10)
+
+        values = dict(record)
+
+        self.assertEqual(set(object_mapper(record).columns.keys()),
+                         set(values.keys()))
+        self.assertEqual(record.id, values['id'])
+        self.assertEqual('192.0.2.2', values['data'])
+        self.assertEqual(10, values['priority'])
+
+    def test_dict_column_names_per_class(self):
+        record = self._get_record()
+        domain = models.Domain(name='example.com.', email='info@example.com')
+
+        self.assertIn('data', dict(record))
+        self.assertNotIn('data', dict(domain))
+        self.assertIn('email', dict(domain))
+
+    def test_dict_reflects_changes(self):
+        record = self._get_record()
+        dict(record)
+
+        record['data'] = '192.0.2.3'
+
+        self.assertEqual('192.0.2.3', dict(record)['data'])
+
+    def test_dict_benchmark(self):
+        # A micro-benchmark of the conversion storage performs on every row
+        # it returns, against resolving the mapper's columns for each row.
+        records = [self._get_record() for _ in range(5000)]
+
+        start = time.time()
+        generic = [dict((c, getattr(r, c))
+                        for c in dict(object_mapper(r).columns).keys())
+                   for r in records]
+        generic_time = time.time() - start
+
+        start = time.time()
+        fast = [dict(r) for r in records]
+        fast_time = time.time() - start
+
+        LOG.info('Converted %d records to dicts in %.3fs (%.3fs resolving '
+                 'columns per row)', len(records), fast_time, generic_time)
+
+        self.assertEqual(generic, fast)
@@ -17,6 +17,7 @@ import testtools
 import uuid
 from designate.openstack.common import log as logging
 from designate import exceptions
+from designate import utils
 from designate.storage.base import Storage as StorageBase
 
 LOG = logging.getLogger(__name__)
@@ -642,6 +643,37 @@ class StorageTestCase(object):
 
         self._ensure_paging(created, self.storage.find_domains)
 
+    def test_find_domains_paging_cursor(self):
+        created = [self.create_domain(values={'name': 'x%s.org.' % i})[1]
+                   for i in xrange(10, 20)]
+
+        found = self.storage.find_domains(
+            self.admin_context, limit=4, sort_key='name', sort_dir='desc')
+        results = list(found)
+
+        while len(found) == 4:
+            cursor = utils.encode_cursor(
+                'name', 'desc', [found[-1]['name'], found[-1]['id']])
+
+            found = self.storage.find_domains(
+                self.admin_context, limit=4, sort_key='name',
+                sort_dir='desc', marker=cursor)
+            results.extend(found)
+
+        expected = sorted(created, key=lambda d: d['name'], reverse=True)
+        self.assertEqual([d['id'] for d in expected],
+                         [d['id'] for d in results])
+
+    def test_find_domains_paging_cursor_sort_mismatch(self):
+        _, domain = self.create_domain()
+        cursor = utils.encode_cursor('name', 'asc',
+                                     [domain['name'], domain['id']])
+
+        with testtools.ExpectedException(exceptions.InvalidMarker):
+            self.storage.find_domains(self.admin_context, limit=5,
+                                      sort_key='name', sort_dir='desc',
+                                      marker=cursor)
+
     def test_find_domains_criterion(self):
         _, domain_one = self.create_domain(0)
         _, domain_two = self.create_domain(1)
@@ -711,6 +743,9 @@ class StorageTestCase(object):
         self.assertEqual(actual['email'], expected['email'])
         self.assertIn('status', actual)
 
+        # The record count is internal, and not part of the domain
+        self.assertNotIn('record_count', actual)
+
     def test_get_domain_missing(self):
         with testtools.ExpectedException(exceptions.DomainNotFound):
             uuid = 'caf771fc-6b05-4891-bee1-c2a48621f57b'
@@ -760,6 +795,30 @@ class StorageTestCase(object):
         with testtools.ExpectedException(exceptions.DomainNotFound):
             self.storage.find_domain(self.admin_context, criterion)
 
+    def test_find_closest_domain(self):
+        _, parent = self.create_domain(values={'name': 'example.org.'})
+        _, child = self.create_domain(values={'name': 'sub.example.org.'})
+
+        names = ['www.sub.example.org.', 'sub.example.org.', 'example.org.',
+                 'org.']
+
+        result = self.storage.find_closest_domain(self.admin_context, names)
+        self.assertEqual(child['id'], result['id'])
+
+        result = self.storage.find_closest_domain(self.admin_context,
+                                                  names[2:])
+        self.assertEqual(parent['id'], result['id'])
+
+    def test_find_closest_domain_missing(self):
+        self.create_domain(values={'name': 'example.org.'})
+
+        with testtools.ExpectedException(exceptions.DomainNotFound):
+            self.storage.find_closest_domain(self.admin_context,
+                                             ['example.net.', 'net.'])
+
+        with testtools.ExpectedException(exceptions.DomainNotFound):
+            self.storage.find_closest_domain(self.admin_context, [])
+
     def test_update_domain(self):
         # Create a domain
         fixture, domain = self.create_domain()
@@ -841,6 +900,20 @@ class StorageTestCase(object):
             # Attempt to create the second/duplicate recordset
             self.create_recordset(domain)
 
+    def test_iter_recordsets(self):
+        _, domain = self.create_domain()
+
+        criterion = {'domain_id': domain['id']}
+
+        created = [self.create_recordset(domain, fixture=i)[1]
+                   for i in range(2)]
+
+        actual = self.storage.iter_recordsets(self.admin_context, criterion,
+                                              chunk_size=1)
+
+        self.assertEqual(sorted(r['id'] for r in created),
+                         sorted(r['id'] for r in actual))
+
     def test_find_recordsets(self):
         _, domain = self.create_domain()
 
@@ -1080,6 +1153,27 @@ class StorageTestCase(object):
 
         self._ensure_paging(created, self.storage.find_records)
 
+    def test_iter_records(self):
+        _, domain = self.create_domain()
+        _, recordset = self.create_recordset(domain)
+
+        criterion = {'recordset_id': recordset['id']}
+
+        actual = self.storage.iter_records(self.admin_context, criterion)
+        self.assertEqual([], list(actual))
+
+        created = [self.create_record(
+            domain, recordset,
+            values={'data': '192.0.0.%s' % i})[1]
+            for i in xrange(10, 15)]
+
+        # Fetch the records a couple at a time
+        actual = self.storage.iter_records(self.admin_context, criterion,
+                                           chunk_size=2)
+
+        self.assertEqual(sorted(r['id'] for r in created),
+                         sorted(r['id'] for r in actual))
+
     def test_find_records_criterion(self):
         _, domain = self.create_domain()
         _, recordset = self.create_recordset(domain, type='A')
@@ -1282,6 +1376,279 @@ class StorageTestCase(object):
         records = self.storage.count_records(self.admin_context)
         self.assertEqual(records, 1)
 
+    def test_count_domain_records(self):
+        _, domain = self.create_domain()
+        _, recordset_one = self.create_recordset(domain, fixture=0)
+        _, recordset_two = self.create_recordset(domain, fixture=1)
+
+        count = self.storage.count_domain_records(self.admin_context,
+                                                  domain['id'])
+        self.assertEqual(0, count)
+
+        _, record = self.create_record(domain, recordset_one, fixture=0)
+        self.create_record(domain, recordset_two, fixture=0)
+        self.create_record(domain, recordset_two, fixture=1)
+
+        count = self.storage.count_domain_records(self.admin_context,
+                                                  domain['id'])
+        self.assertEqual(3, count)
+
+        # Deleting a record, or a recordset along with its records, keeps
+        # the count up to date
+        self.storage.delete_record(self.admin_context, record['id'])
+        self.storage.delete_recordset(self.admin_context, recordset_two['id'])
+
+        count = self.storage.count_domain_records(self.admin_context,
+                                                  domain['id'])
+        self.assertEqual(0, count)
+
+        records = self.storage.find_records(
+            self.admin_context, {'recordset_id': recordset_two['id']})
+        self.assertEqual(0, len(records))
+
+    def test_count_domain_records_missing(self):
+        with testtools.ExpectedException(exceptions.DomainNotFound):
+            self.storage.count_domain_records(
+                self.admin_context, '2fdadfb1-cf96-4259-ac6b-bb7b6d2ff980')
+
+    def test_get_domain_contents(self):
+        _, domain = self.create_domain()
+        _, recordset = self.create_recordset(domain)
+        _, record_one = self.create_record(domain, recordset)
+        _, record_two = self.create_record(domain, recordset, fixture=1)
+
+        contents = self.storage.get_domain_contents(self.admin_context,
+                                                    domain['id'])
+
+        self.assertEqual(2, len(contents))
+        self.assertEqual(set([record_one['id'], record_two['id']]),
+                         set([c['id'] for c in contents]))
+
+        for content in contents:
+            self.assertEqual(recordset['id'], content['recordset_id'])
+            self.assertEqual(recordset['name'], content['name'])
+            self.assertEqual(recordset['type'], content['type'])
+
+        self.assertEqual(set([record_one['data'], record_two['data']]),
+                         set([c['data'] for c in contents]))
+
+    def test_get_domain_contents_paging(self):
+        _, domain = self.create_domain()
+        _, recordset = self.create_recordset(domain)
+
+        expected = [self.create_record(domain, recordset,
+                                       values={'data': '192.0.2.%d' % i})[1]
+                    for i in range(5)]
+
+        contents = self.storage.get_domain_contents(self.admin_context,
+                                                    domain['id'])
+
+        # Walk through the pages, ensuring every record is seen exactly once
+        # and in the same order as when fetched at once.
+        paged = self.storage.get_domain_contents(self.admin_context,
+                                                 domain['id'], limit=2)
+        self.assertEqual(2, len(paged))
+
+        while True:
+            page = self.storage.get_domain_contents(
+                self.admin_context, domain['id'], marker=paged[-1]['id'],
+                limit=2)
+
+            if not page:
+                break
+
+            paged.extend(page)
+
+        self.assertEqual(len(expected), len(paged))
+        self.assertEqual([c['id'] for c in contents],
+                         [c['id'] for c in paged])
+
+    def test_get_domain_contents_marker_not_found(self):
+        _, domain = self.create_domain()
+
+        with testtools.ExpectedException(exceptions.MarkerNotFound):
+            self.storage.get_domain_contents(
+                self.admin_context, domain['id'],
+                marker='caf771fc-6b05-4891-bee1-c2a48621f57b', limit=2)
+
+    def test_get_domain_contents_empty(self):
+        _, domain = self.create_domain()
+
+        contents = self.storage.get_domain_contents(self.admin_context,
+                                                    domain['id'])
+
+        self.assertEqual([], contents)
+
+    def test_find_floatingip_records(self):
+        _, domain = self.create_domain(values={'ttl': 3600})
+        _, recordset_one = self.create_recordset(domain, fixture=0,
+                                                 values={'ttl': 300})
+        _, recordset_two = self.create_recordset(domain, fixture=1)
+
+        managed = {
+            'managed': True,
+            'managed_resource_type': 'ptr:floatingip',
+        }
+
+        _, record_one = self.create_record(domain, recordset_one, values=dict(
+            managed, data='srv1.example.com.', managed_extra='192.0.2.1'))
+        _, record_two = self.create_record(domain, recordset_two, values=dict(
+            managed, data='srv2.example.com.', managed_extra='192.0.2.2'))
+        # Not a floating IP's record
+        self.create_record(domain, recordset_two, values={
+            'data': 'srv3.example.com.', 'managed_extra': '192.0.2.3'})
+
+        records = self.storage.find_floatingip_records(
+            self.admin_context, ['192.0.2.1', '192.0.2.2', '192.0.2.3'])
+        records = dict((r['id'], r) for r in records)
+
+        self.assertEqual(set([record_one['id'], record_two['id']]),
+                         set(records.keys()))
+
+        # The recordset's TTL is used, falling back to the domain's
+        self.assertEqual(300, records[record_one['id']]['ttl'])
+        self.assertEqual(3600, records[record_two['id']]['ttl'])
+
+        records = self.storage.find_floatingip_records(
+            self.admin_context, ['192.0.2.2'])
+
+        self.assertEqual([record_two['id']], [r['id'] for r in records])
+
+    def test_create_zone_import(self):
+        values = {'tenant_id': self.admin_context.tenant_id,
+                  'records_total': 10}
+
+        zone_import = self.storage.create_zone_import(self.admin_context,
+                                                      values)
+
+        self.assertIsNotNone(zone_import['id'])
+        self.assertEqual('PENDING', zone_import['status'])
+        self.assertEqual(10, zone_import['records_total'])
+        self.assertEqual(0, zone_import['records_imported'])
+        self.assertIsNone(zone_import['domain_id'])
+
+    def test_update_zone_import(self):
+        zone_import = self.storage.create_zone_import(
+            self.admin_context, {'tenant_id': self.admin_context.tenant_id})
+
+        _, domain = self.create_domain()
+
+        self.storage.update_zone_import(
+            self.admin_context, zone_import['id'],
+            {'status': 'COMPLETE', 'domain_id': domain['id']})
+
+        zone_import = self.storage.get_zone_import(self.admin_context,
+                                                   zone_import['id'])
+
+        self.assertEqual('COMPLETE', zone_import['status'])
+        self.assertEqual(domain['id'], zone_import['domain_id'])
+
+    def test_find_zone_imports(self):
+        for status in ('COMPLETE', 'ERROR', 'COMPLETE'):
+            self.storage.create_zone_import(
+                self.admin_context,
+                {'tenant_id': self.admin_context.tenant_id, 'status': status})
+
+        zone_imports = self.storage.find_zone_imports(self.admin_context)
+        self.assertEqual(3, len(zone_imports))
+
+        zone_imports = self.storage.find_zone_imports(
+            self.admin_context, {'status': 'ERROR'})
+        self.assertEqual(1, len(zone_imports))
+
+    def test_get_zone_import_missing(self):
+        with testtools.ExpectedException(exceptions.ZoneImportNotFound):
+            uuid = 'caf771fc-6b05-4891-bee1-c2a48621f57b'
+            self.storage.get_zone_import(self.admin_context, uuid)
+
+    def test_create_domain_sync(self):
+        domain_sync = self.storage.create_domain_sync(
+            self.admin_context, {'total': 10, 'failed': []})
+
+        self.assertIsNotNone(domain_sync['id'])
+        self.assertEqual('RUNNING', domain_sync['status'])
+        self.assertEqual(10, domain_sync['total'])
+        self.assertEqual(0, domain_sync['synced'])
+        self.assertEqual([], domain_sync['failed'])
+        self.assertIsNone(domain_sync['marker'])
+
+    def test_update_domain_sync(self):
+        domain_sync = self.storage.create_domain_sync(self.admin_context,
+                                                      {'total': 2})
+
+        _, domain = self.create_domain()
+        failed = ['caf771fc-6b05-4891-bee1-c2a48621f57b']
+
+        self.storage.update_domain_sync(
+            self.admin_context, domain_sync['id'],
+            {'synced': 1, 'failed': failed, 'marker': domain['id']})
+
+        domain_sync = self.storage.find_domain_syncs(
+            self.admin_context, {'id': domain_sync['id']})[0]
+
+        self.assertEqual(1, domain_sync['synced'])
+        self.assertEqual(failed, domain_sync['failed'])
+        self.assertEqual(domain['id'], domain_sync['marker'])
+
+    def test_update_domain_sync_missing(self):
+        with testtools.ExpectedException(exceptions.DomainSyncNotFound):
+            uuid = 'caf771fc-6b05-4891-bee1-c2a48621f57b'
+            self.storage.update_domain_sync(self.admin_context, uuid,
+                                            {'status': 'ERROR'})
+
+    def test_find_domain_syncs(self):
+        for status in ('COMPLETE', 'ERROR', 'RUNNING'):
+            self.storage.create_domain_sync(self.admin_context,
+                                            {'status': status})
+
+        domain_syncs = self.storage.find_domain_syncs(self.admin_context)
+        self.assertEqual(3, len(domain_syncs))
+
+        domain_syncs = self.storage.find_domain_syncs(
+            self.admin_context, {'status': 'RUNNING'})
+        self.assertEqual(1, len(domain_syncs))
+
+    def test_get_cache_version(self):
+        version = self.storage.get_cache_version(self.admin_context,
+                                                 'blacklists')
+        self.assertEqual(0, version)
+
+        # Every change to the blacklists should bump the version
+        fixture = self.get_blacklist_fixture()
+        blacklist = self.storage.create_blacklist(self.admin_context, fixture)
+
+        version = self.storage.get_cache_version(self.admin_context,
+                                                 'blacklists')
+        self.assertEqual(1, version)
+
+        self.storage.update_blacklist(self.admin_context, blacklist['id'],
+                                      {'description': 'updated'})
+
+        version = self.storage.get_cache_version(self.admin_context,
+                                                 'blacklists')
+        self.assertEqual(2, version)
+
+        self.storage.delete_blacklist(self.admin_context, blacklist['id'])
+
+        version = self.storage.get_cache_version(self.admin_context,
+                                                 'blacklists')
+        self.assertEqual(3, version)
+
+        # Other versions are unaffected
+        version = self.storage.get_cache_version(self.admin_context, 'tlds')
+        self.assertEqual(0, version)
+
+    def test_get_cache_version_tlds(self):
+        fixture = self.get_tld_fixture()
+        tld = self.storage.create_tld(self.admin_context, fixture)
+
+        self.storage.update_tld(self.admin_context, tld['id'],
+                                {'name': 'net'})
+        self.storage.delete_tld(self.admin_context, tld['id'])
+
+        version = self.storage.get_cache_version(self.admin_context, 'tlds')
+        self.assertEqual(3, version)
+
     def test_ping(self):
         pong = self.storage.ping(self.admin_context)
 
@@ -495,6 +495,17 @@ class StorageAPITest(TestCase):
         self._assert_called_with('find_domain', context, criterion)
         self.assertEqual(domain, result)
 
+    def test_find_closest_domain(self):
+        context = mock.sentinel.context
+        names = mock.sentinel.names
+        domain = mock.sentinel.domain
+
+        self._set_side_effect('find_closest_domain', [domain])
+
+        result = self.storage_api.find_closest_domain(context, names)
+        self._assert_called_with('find_closest_domain', context, names)
+        self.assertEqual(domain, result)
+
     def test_update_domain(self):
         context = mock.sentinel.context
         values = mock.sentinel.values
@@ -570,6 +581,22 @@ class StorageAPITest(TestCase):
         self._assert_called_with('rollback')
         self._assert_called_with('create_recordset', context, 123, values)
 
+    def test_create_recordsets(self):
+        context = mock.sentinel.context
+        values = [mock.sentinel.values_one, mock.sentinel.values_two]
+        recordsets = [mock.sentinel.recordset_one, mock.sentinel.recordset_two]
+
+        self._set_side_effect('create_recordset', recordsets)
+
+        with self.storage_api.create_recordsets(context, 123, values) as q:
+            self.assertEqual(recordsets, q)
+
+        self._assert_call_count('begin', 1)
+        self._assert_call_count('commit', 1)
+        self._assert_has_calls('create_recordset', [
+            mock.call(context, 123, values[0]),
+            mock.call(context, 123, values[1])])
+
     def test_get_recordset(self):
         context = mock.sentinel.context
         recordset_id = mock.sentinel.recordset_id
@@ -581,6 +608,21 @@ class StorageAPITest(TestCase):
         self._assert_called_with('get_recordset', context, recordset_id)
         self.assertEqual(recordset, result)
 
+    def test_iter_recordsets(self):
+        context = mock.sentinel.context
+        criterion = mock.sentinel.criterion
+        chunk_size = mock.sentinel.chunk_size
+        recordsets = mock.sentinel.recordsets
+
+        self._set_side_effect('iter_recordsets', [recordsets])
+
+        result = self.storage_api.iter_recordsets(context, criterion,
+                                                  chunk_size)
+        self._assert_called_with('iter_recordsets', context, criterion,
+                                 chunk_size)
+
+        self.assertEqual(recordsets, result)
+
     def test_find_recordsets(self):
         context = mock.sentinel.context
         criterion = mock.sentinel.criterion
@@ -686,6 +728,37 @@ class StorageAPITest(TestCase):
         self._assert_called_with('rollback')
         self._assert_called_with('create_record', context, 123, 321, values)
 
+    def test_create_records(self):
+        context = mock.sentinel.context
+        values = [mock.sentinel.values_one, mock.sentinel.values_two]
+        records = [mock.sentinel.record_one, mock.sentinel.record_two]
+
+        self._set_side_effect('create_record', records)
+
+        with self.storage_api.create_records(context, 123, 321, values) as q:
+            self.assertEqual(records, q)
+
+        self._assert_call_count('begin', 1)
+        self._assert_call_count('commit', 1)
+        self._assert_has_calls('create_record', [
+            mock.call(context, 123, 321, values[0]),
+            mock.call(context, 123, 321, values[1])])
+
+    def test_create_records_failure(self):
+        context = mock.sentinel.context
+        values = [mock.sentinel.values_one, mock.sentinel.values_two]
+
+        self._set_side_effect('create_record',
+                              [{'id': 12345}, SentinelException()])
+
+        with testtools.ExpectedException(SentinelException):
+            with self.storage_api.create_records(context, 123, 321, values):
+                pass
+
+        self._assert_called_with('begin')
+        self._assert_called_with('rollback')
+        self._assert_call_count('commit', 0)
+
     def test_get_record(self):
         context = mock.sentinel.context
         record_id = mock.sentinel.record_id
@@ -717,6 +790,180 @@ class StorageAPITest(TestCase):
 
         self.assertEqual([record], result)
 
+    def test_iter_records(self):
+        context = mock.sentinel.context
+        criterion = mock.sentinel.criterion
+        chunk_size = mock.sentinel.chunk_size
+        records = mock.sentinel.records
+
+        self._set_side_effect('iter_records', [records])
+
+        result = self.storage_api.iter_records(context, criterion, chunk_size)
+        self._assert_called_with('iter_records', context, criterion,
+                                 chunk_size)
+
+        self.assertEqual(records, result)
+
+    def test_count_domain_records(self):
+        context = mock.sentinel.context
+        domain_id = mock.sentinel.domain_id
+
+        self._set_side_effect('count_domain_records', [5])
+
+        result = self.storage_api.count_domain_records(context, domain_id)
+        self._assert_called_with('count_domain_records', context, domain_id)
+
+        self.assertEqual(5, result)
+
+    def test_get_domain_contents(self):
+        context = mock.sentinel.context
+        domain_id = mock.sentinel.domain_id
+        content = mock.sentinel.content
+
+        self._set_side_effect('get_domain_contents', [[content]])
+
+        result = self.storage_api.get_domain_contents(context, domain_id)
+        self._assert_called_with('get_domain_contents', context, domain_id,
+                                 None, None)
+
+        self.assertEqual([content], result)
+
+    def test_find_floatingip_records(self):
+        context = mock.sentinel.context
+        addresses = mock.sentinel.addresses
+        record = mock.sentinel.record
+
+        self._set_side_effect('find_floatingip_records', [[record]])
+
+        result = self.storage_api.find_floatingip_records(context, addresses)
+        self._assert_called_with('find_floatingip_records', context,
+                                 addresses)
+
+        self.assertEqual([record], result)
+
+    # Zone Import Tests
+    def test_create_zone_import(self):
+        context = mock.sentinel.context
+        values = mock.sentinel.values
+        zone_import = mock.sentinel.zone_import
+
+        self._set_side_effect('create_zone_import', [zone_import])
+
+        with self.storage_api.create_zone_import(context, values) as q:
+            self.assertEqual(zone_import, q)
+
+        self._assert_called_with('create_zone_import', context, values)
+
+    def test_get_zone_import(self):
+        context = mock.sentinel.context
+        zone_import_id = mock.sentinel.zone_import_id
+        zone_import = mock.sentinel.zone_import
+
+        self._set_side_effect('get_zone_import', [zone_import])
+
+        result = self.storage_api.get_zone_import(context, zone_import_id)
+        self._assert_called_with('get_zone_import', context, zone_import_id)
+
+        self.assertEqual(zone_import, result)
+
+    def test_find_zone_imports(self):
+        context = mock.sentinel.context
+        criterion = mock.sentinel.criterion
+        marker = mock.sentinel.marker
+        limit = mock.sentinel.limit
+        sort_key = mock.sentinel.sort_key
+        sort_dir = mock.sentinel.sort_dir
+        zone_import = mock.sentinel.zone_import
+
+        self._set_side_effect('find_zone_imports', [[zone_import]])
+
+        result = self.storage_api.find_zone_imports(
+            context, criterion, marker, limit, sort_key, sort_dir)
+        self._assert_called_with(
+            'find_zone_imports', context, criterion, marker, limit,
+            sort_key, sort_dir)
+
+        self.assertEqual([zone_import], result)
+
+    def test_update_zone_import(self):
+        context = mock.sentinel.context
+        values = mock.sentinel.values
+
+        with self.storage_api.update_zone_import(context, 123, values):
+            pass
+
+        self._assert_called_with('update_zone_import', context, 123, values)
+
+    def test_create_domain_sync(self):
+        context = mock.sentinel.context
+        values = mock.sentinel.values
+        domain_sync = mock.sentinel.domain_sync
+
+        self._set_side_effect('create_domain_sync', [domain_sync])
+
+        with self.storage_api.create_domain_sync(context, values) as q:
+            self.assertEqual(domain_sync, q)
+
+        self._assert_called_with('create_domain_sync', context, values)
+
+    def test_find_domain_syncs(self):
+        context = mock.sentinel.context
+        criterion = mock.sentinel.criterion
+        marker = mock.sentinel.marker
+        limit = mock.sentinel.limit
+        sort_key = mock.sentinel.sort_key
+        sort_dir = mock.sentinel.sort_dir
+        domain_sync = mock.sentinel.domain_sync
+
+        self._set_side_effect('find_domain_syncs', [[domain_sync]])
+
+        result = self.storage_api.find_domain_syncs(
+            context, criterion, marker, limit, sort_key, sort_dir)
+        self._assert_called_with(
+            'find_domain_syncs', context, criterion, marker, limit,
+            sort_key, sort_dir)
+
+        self.assertEqual([domain_sync], result)
+
+    def test_update_domain_sync(self):
+        context = mock.sentinel.context
+        values = mock.sentinel.values
+
+        with self.storage_api.update_domain_sync(context, 123, values):
+            pass
+
+        self._assert_called_with('update_domain_sync', context, 123, values)
+
+    def test_transaction(self):
+        context = mock.sentinel.context
+
+        with self.storage_api.transaction():
+            with self.storage_api.create_domain(context, {}):
+                pass
+
+        self._assert_call_count('begin', 2)
+        self._assert_call_count('commit', 2)
+
+    def test_transaction_failure(self):
+        with testtools.ExpectedException(SentinelException):
+            with self.storage_api.transaction():
+                raise SentinelException('Something Went Wrong')
+
+        self._assert_called_with('begin')
+        self._assert_called_with('rollback')
+        self._assert_call_count('commit', 0)
+
+    def test_get_cache_version(self):
+        context = mock.sentinel.context
+        name = mock.sentinel.name
+
+        self._set_side_effect('get_cache_version', [1])
+
+        result = self.storage_api.get_cache_version(context, name)
+        self._assert_called_with('get_cache_version', context, name)
+
+        self.assertEqual(1, result)
+
     def test_find_record(self):
         context = mock.sentinel.context
         criterion = mock.sentinel.criterion
@@ -13,8 +13,11 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import mock
+
 from designate.openstack.common import log as logging
 from designate import storage
+from designate.storage.impl_sqlalchemy import models
 from designate.tests import TestCase
 from designate.tests.test_storage import StorageTestCase
 
@@ -31,3 +34,42 @@ class SqlalchemyStorageTest(StorageTestCase, TestCase):
         )
 
         self.storage = storage.get_storage()
+
+    def test_get_cache_version_missing_row(self):
+        # The migrations create the rows, but they are created as needed
+        # when missing
+        self.storage.session.query(models.CacheVersion).delete()
+
+        # Within a transaction, as storage is always called through the
+        # StorageAPI
+        self.storage.begin()
+        self.storage.create_tld(self.admin_context, self.get_tld_fixture())
+        self.storage.commit()
+
+        version = self.storage.get_cache_version(self.admin_context, 'tlds')
+        self.assertEqual(1, version)
+
+    def test_get_cache_version_racing_insert(self):
+        self.storage.create_tld(self.admin_context, self.get_tld_fixture())
+
+        # The row exists, but another process created it between the UPDATE
+        # finding no row and the INSERT
+        update_cache_version = self.storage._update_cache_version
+        results = [0]
+
+        def racing_update_cache_version(name):
+            if results:
+                return results.pop()
+
+            return update_cache_version(name)
+
+        with mock.patch.object(self.storage, '_update_cache_version',
+                               side_effect=racing_update_cache_version):
+            self.storage.begin()
+            self.storage.create_tld(self.admin_context,
+                                    self.get_tld_fixture(1))
+            self.storage.commit()
+
+        version = self.storage.get_cache_version(self.admin_context, 'tlds')
+        self.assertEqual(2, version)
+        self.assertEqual(2, len(self.storage.find_tlds(self.admin_context)))
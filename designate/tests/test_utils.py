@@ -13,7 +13,9 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import datetime
 import os
+import shutil
 import tempfile
 import testtools
 from jinja2 import Template
@@ -65,6 +67,28 @@ class TestUtils(TestCase):
 
         self.assertEqual('Hello World', result)
 
+    def test_render_template_chunks(self):
+        template = Template("{% for name in names %}Hello {{name}}\n"
+                            "{% endfor %}")
+
+        consumed = []
+
+        def names():
+            for name in ('World', 'Moon', 'Mars'):
+                consumed.append(name)
+                yield name
+
+        chunks = utils.render_template_chunks(template, chunk_size=10,
+                                              names=names())
+
+        # Nothing is rendered until the first chunk is asked for, and then
+        # only as much as needed to fill it.
+        self.assertEqual([], consumed)
+        self.assertEqual('Hello World\n', next(chunks))
+        self.assertEqual(['World'], consumed)
+
+        self.assertEqual(['Hello Moon\n', 'Hello Mars\n'], list(chunks))
+
     def test_render_template_to_file(self):
         output_path = tempfile.mktemp()
 
@@ -80,3 +104,64 @@ class TestUtils(TestCase):
                 self.assertEqual('Hello World', fh.read())
         finally:
             os.unlink(output_path)
+
+    def test_write_file_atomically(self):
+        output_folder = tempfile.mkdtemp()
+        output_path = os.path.join(output_folder, 'example.zone')
+
+        try:
+            utils.write_file_atomically(output_path, 'first')
+            utils.write_file_atomically(output_path, 'second')
+
+            with open(output_path, 'r') as fh:
+                self.assertEqual('second', fh.read())
+
+            # No temporary files are left behind
+            self.assertEqual(['example.zone'], os.listdir(output_folder))
+        finally:
+            shutil.rmtree(output_folder)
+
+    def test_chunks(self):
+        self.assertEqual([[1, 2], [3, 4], [5]],
+                         list(utils.chunks(iter(range(1, 6)), 2)))
+        self.assertEqual([], list(utils.chunks([], 2)))
+
+    def test_encode_decode_cursor(self):
+        created_at = datetime.datetime(2014, 2, 3, 4, 5, 6, 7)
+        cursor = utils.encode_cursor('created_at', 'desc',
+                                     [created_at, 'some-id'])
+
+        sort_key, sort_dir, values = utils.decode_cursor(cursor)
+
+        self.assertEqual('created_at', sort_key)
+        self.assertEqual('desc', sort_dir)
+        self.assertEqual(['2014-02-03T04:05:06.000007', 'some-id'], values)
+
+    def test_decode_cursor_invalid(self):
+        with testtools.ExpectedException(exceptions.InvalidMarker):
+            utils.decode_cursor('invalid_marker')
+
+
+class LRUCacheTestCase(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = utils.LRUCache(2)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+
+    def test_clear(self):
+        cache = utils.LRUCache(2)
+
+        cache.set('a', 1)
+        cache.clear()
+        cache.set('b', 2)
+
+        self.assertEqual(1, len(cache))
+        self.assertIsNone(cache.get('a'))
@@ -13,12 +13,15 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import base64
 import copy
+import datetime
 import json
 import functools
 import inspect
 import os
 import pkg_resources
+import tempfile
 import uuid
 
 from jinja2 import Template
@@ -105,19 +108,65 @@ def render_template(template, **template_context):
     return template.render(**template_context)
 
 
+def render_template_chunks(template, chunk_size=65536, **template_context):
+    """
+    Render a template incrementally, yielding the output in UTF-8 encoded
+    chunks of around chunk_size bytes. Iterables in the template context are
+    only consumed as far as the output has been rendered.
+    """
+    if not isinstance(template, Template):
+        template = load_template(template)
+
+    buffered = []
+    buffered_size = 0
+
+    for output in template.generate(**template_context):
+        output = output.encode('utf-8')
+
+        buffered.append(output)
+        buffered_size += len(output)
+
+        if buffered_size >= chunk_size:
+            yield ''.join(buffered)
+
+            buffered = []
+            buffered_size = 0
+
+    if buffered:
+        yield ''.join(buffered)
+
+
 def render_template_to_file(template_name, output_path, makedirs=True,
                             **template_context):
+    # Render the template
+    content = render_template(template_name, **template_context)
+
+    write_file_atomically(output_path, content, makedirs=makedirs)
+
+
+def write_file_atomically(output_path, content, makedirs=True, mode=0o644):
+    """
+    Write content to output_path via a temporary file in the same folder,
+    renamed into place, so readers never see a partially written file.
+    """
     output_folder = os.path.dirname(output_path)
 
     # Create the output folder tree if necessary
     if makedirs and not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    # Render the template
-    content = render_template(template_name, **template_context)
+    fd, temp_path = tempfile.mkstemp(
+        dir=output_folder, prefix='.%s.' % os.path.basename(output_path))
+
+    try:
+        with os.fdopen(fd, 'w') as output_fh:
+            output_fh.write(content)
 
-    with open(output_path, 'w') as output_fh:
-        output_fh.write(content)
+        os.chmod(temp_path, mode)
+        os.rename(temp_path, output_path)
+    except Exception:
+        os.unlink(temp_path)
+        raise
 
 
 def execute(*cmd, **kw):
@@ -236,6 +285,77 @@ def deep_dict_merge(a, b):
     return result
 
 
+def chunks(iterable, size):
+    """ Split an iterable into lists of at most size items """
+    chunk = []
+
+    for item in iterable:
+        chunk.append(item)
+
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+class LRUCache(object):
+    """ A bounded mapping, discarding the least recently used entry first """
+
+    def __init__(self, size):
+        self.size = size
+        self._data = {}
+
+        # A circular doubly linked list of [prev, next, key, value] links,
+        # most recently used at the head's prev end.
+        self._head = []
+        self._head[:] = [self._head, self._head, None, None]
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        link = self._data.get(key)
+
+        if link is None:
+            return default
+
+        self._unlink(link)
+        self._append(link)
+
+        return link[3]
+
+    def set(self, key, value):
+        if self.size <= 0:
+            return
+
+        link = self._data.get(key)
+
+        if link is not None:
+            self._unlink(link)
+        elif len(self._data) >= self.size:
+            oldest = self._head[1]
+            self._unlink(oldest)
+            del self._data[oldest[2]]
+
+        link = [None, None, key, value]
+        self._append(link)
+        self._data[key] = link
+
+    def clear(self):
+        self._data.clear()
+        self._head[:] = [self._head, self._head, None, None]
+
+    def _append(self, link):
+        last = self._head[0]
+        link[0], link[1] = last, self._head
+        last[1] = self._head[0] = link
+
+    def _unlink(self, link):
+        link[0][1], link[1][0] = link[1], link[0]
+
+
 def generate_uuid():
     return str(uuid.uuid4())
 
@@ -253,6 +373,36 @@ def is_uuid_like(val):
         return False
 
 
+def encode_cursor(sort_key, sort_dir, values):
+    """
+    Build an opaque keyset pagination cursor.
+
+    :param sort_key: The key the collection is sorted by.
+    :param sort_dir: The direction the collection is sorted in.
+    :param values: The (sort_key, id) values of the last item on the page.
+    """
+    values = [timeutils.strtime(v) if isinstance(v, datetime.datetime) else v
+              for v in values]
+
+    payload = json.dumps({'k': sort_key, 'd': sort_dir, 'v': values})
+
+    return base64.urlsafe_b64encode(payload)
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor built by encode_cursor.
+
+    :returns: A (sort_key, sort_dir, values) tuple
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(str(cursor)))
+
+        return payload['k'], payload['d'], list(payload['v'])
+    except (TypeError, ValueError, KeyError):
+        raise exceptions.InvalidMarker('Invalid cursor %s' % cursor)
+
+
 def validate_uuid(*check):
     """
     A wrapper to ensure that API controller methods arguments are valid UUID's.